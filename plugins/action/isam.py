@@ -22,6 +22,9 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
+from ansible.module_utils._text import to_text
+from ansible.module_utils.connection import Connection, ConnectionError
+from ansible.module_utils.parsing.convert_bool import boolean
 from ansible.utils.display import Display
 from ansible_collections.ansible.netcommon.plugins.action.network import (
     ActionModule as ActionNetworkModule,
@@ -48,9 +51,22 @@ class ActionModule(ActionNetworkModule):
             }
 
         result = super(ActionModule, self).run(task_vars=task_vars)
+        if boolean(self._templar.template((task_vars or {}).get("ansible_isam_command_trace", False)), strict=False):
+            self._add_command_trace(result, warnings)
         if warnings:
             if "warnings" in result:
                 result["warnings"].extend(warnings)
             else:
                 result["warnings"] = warnings
-        return result
\ No newline at end of file
+        return result
+
+    def _add_command_trace(self, result, warnings):
+        """Adds the records of the commands the task sent, see the
+        `command_trace` option of the cliconf plugin"""
+        socket_path = getattr(self._connection, "socket_path", None)
+        if not socket_path:
+            return
+        try:
+            result["command_trace"] = Connection(socket_path).get_command_trace()
+        except ConnectionError as exc:
+            warnings.append("unable to read the command trace: %s" % to_text(exc, errors="surrogate_then_replace"))
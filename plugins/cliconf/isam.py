@@ -18,8 +18,11 @@
 #
 
 from __future__ import absolute_import, division, print_function
+import itertools
 import re
-from xml.etree import ElementTree as ET
+import signal
+import socket
+import time
 
 
 __metaclass__ = type
@@ -33,23 +36,226 @@ description:
   device to be supported by the cli_command plugin. Notably this does not do
   anything for cli_config support.
 version_added: 0.0.0
+options:
+  edit_config_batch_size:
+    description:
+    - Number of candidate lines C(edit_config) pushes to the device in a single
+      write. The session runs in C(environment mode batch), so every line is
+      still executed on its own and errors are reported for the line that
+      caused them. Unlike line by line pushes, the lines following a failed
+      one in the same batch are executed as well.
+    - The default of 1 sends one line and waits for its prompt before sending
+      the next.
+    type: int
+    default: 1
+    vars:
+    - name: ansible_isam_edit_config_batch_size
+  config_cache_dir:
+    description:
+    - Directory to keep compressed snapshots of the configuration retrieved by
+      C(get_config) and C(get) in, one per host and C(info configure) command.
+    - Snapshots are only used together with I(config_cache_probe).
+    type: path
+    vars:
+    - name: ansible_isam_config_cache_dir
+  config_cache_probe:
+    description:
+    - Show command whose output changes whenever the device configuration
+      does, e.g. one reporting a configuration change counter or the time of
+      the last change.
+    - It is run before the configuration is retrieved and a cached snapshot is
+      returned instead as long as the probe output is the same as when the
+      snapshot was taken.
+    type: str
+    vars:
+    - name: ansible_isam_config_cache_probe
+  config_run_cache:
+    description:
+    - Keep the output of every C(info configure) command for the lifetime of
+      the persistent connection, so the resource modules and C(isam_facts)
+      tasks of a playbook run against the same host read each subtree once.
+    - An C(edit_config) drops the outputs of the subtrees its lines touch,
+      any other command sent through C(get) that is neither C(show) nor
+      C(info) drops all of them.
+    type: bool
+    default: true
+    vars:
+    - name: ansible_isam_config_run_cache
+  command_inactivity_timeout:
+    description:
+    - Seconds a streamed response, such as the configuration read by
+      C(get_config), may stall before the command fails. While data keeps
+      coming in the request is not failed by C(ansible_command_timeout), so
+      a large C(info configure flat) runs as long as it needs.
+    - A stalled session is closed, so the rest of its response is not read
+      by the next command. network_cli logs in again for the next command.
+    - Defaults to C(ansible_command_timeout).
+    type: int
+    vars:
+    - name: ansible_isam_command_inactivity_timeout
+  command_history_dir:
+    description:
+    - Directory to keep the duration and size of every streamed command in,
+      one file per host. Timeouts report what earlier runs took, see also
+      C(get_command_history).
+    - Without it the history is only kept for the lifetime of the
+      persistent connection.
+    type: path
+    vars:
+    - name: ansible_isam_command_history_dir
+  command_trace:
+    description:
+    - Record for every command the time the write took, the time to the
+      first byte of the response, the total duration, the bytes and lines
+      received and the time spent matching the prompt.
+    - The isam action plugin adds the records of a task to its result under
+      C(command_trace).
+    type: bool
+    default: false
+    vars:
+    - name: ansible_isam_command_trace
+  command_trace_dir:
+    description:
+    - Directory to append the command records to, one JSON object per line
+      in C(<host>.jsonl). Records are written whether or not
+      I(command_trace) is set.
+    type: path
+    vars:
+    - name: ansible_isam_command_trace_dir
+  session_pool_size:
+    description:
+    - Number of CLI sessions the read-only commands of a single request, such
+      as the C(info configure) subtrees of several resources, are spread over
+      so the device generates their output at the same time. The session of
+      the connection counts as one, the others are opened when first needed
+      and kept for the lifetime of the persistent connection.
+    - The device limits the CLI sessions per user and in total. Once it
+      refuses a session, the sessions already open are used.
+    - The default of 1 runs every command on the session of the connection.
+    type: int
+    default: 1
+    vars:
+    - name: ansible_isam_session_pool_size
+  session_commands:
+    description:
+    - Additional commands every new CLI session runs after
+      C(environment mode batch) and C(environment inhibit-alarms), e.g.
+      C(environment terminal-timeout timeout:360).
+    - All of them are sent in the same write as the default commands, a
+      failing command fails the connection.
+    type: list
+    elements: str
+    vars:
+    - name: ansible_isam_session_commands
 """
 #import debugpy
 import json
 
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import to_list
+from ansible.errors import AnsibleConnectionFailure
+from ansible.module_utils._text import to_bytes, to_text
 from ansible.plugins.cliconf import CliconfBase
-from ansible_collections.isam.isam.plugins.cliconf.utils.utils import  getFirstXMLElementText, getXMLElements, removeAlarms, removeCtrlChars
+from ansible_collections.isam.isam.plugins.cliconf.utils.utils import iterXMLInstances, scrubOutput
+from ansible_collections.isam.isam.plugins.cliconf.utils.snapshot_cache import ConfigSnapshotCache
+from ansible_collections.isam.isam.plugins.cliconf.utils.command_history import CommandHistory, describe_expected
+from ansible_collections.isam.isam.plugins.cliconf.utils.command_trace import CommandTrace
+from ansible_collections.isam.isam.plugins.cliconf.utils.session_pool import CliSessionPool
+from ansible_collections.isam.isam.plugins.cliconf.utils.ont_optics import optics_commands, parse_ont_optics
+from ansible_collections.isam.isam.plugins.cliconf.utils.parse_output_to_dict import parse_show_output
+from ansible_collections.isam.isam.plugins.cliconf.utils.flat_diff import (
+    compile_ignore_lines,
+    drop_ignored_lines,
+    flat_difference,
+    is_flat_config,
+)
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.config import (
     NetworkConfig,
     dumps,
 )
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.isam import (
+    HIERARCHICAL_RESOURCES,
+    RESOURCE_SUBTREES,
+)
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.utils.utils import iter_chunk_lines
+
+# Fields of the commands device info is read from. The model and serial
+# number are those of the shelf, not of a board in it.
+_DEVICE_INFO_PATTERNS = (
+    ("show software-mngt version etsi detail", (
+        ("network_os_version", re.compile(r"isam-release\s*:\s*(\S+)")),
+    )),
+    ("show equipment shelf 1/1 detail", (
+        ("network_os_model", re.compile(r"actual-type\s*:\s*(\S+)")),
+        ("network_os_serial", re.compile(r"serial-no\s*:\s*(\S+)")),
+    )),
+)
+
+# The host name is taken from the prompt the commands above left, as the
+# terminal plugin matches it: the name in front of the `>`, behind an
+# optional prefix such as `typ:`
+_PROMPT_HOSTNAME_RE = re.compile(r"([\w-]+)>[^\r\n>]*$")
+
+# The LT slots listed by `show equipment slot`
+_LT_SLOT_RE = re.compile(r"^lt:(\d+/\d+/\d+)\s")
+
+# Output modifiers of `info configure`, not part of the subtree
+_INFO_MODIFIERS = frozenset(["flat", "detail", "xml"])
+
+# a partial line longer than this can not be a prompt, see _read_until_prompt
+_MAX_PROMPT_LENGTH = 1024
+
+
+def _xml_command(command):
+    """Appends the `xml` output modifier unless `command` already ends with it"""
+    if command.split()[-1:] == ["xml"]:
+        return command
+    return "%s xml" % command
+
+
+def _extend_command_timeout(seconds):
+    """Makes sure the running request has at least `seconds` left
+
+    ansible-connection fails a request that takes longer than
+    `persistent_command_timeout` with an alarm. As long as a response keeps
+    coming in, the alarm is pushed back instead, so a long transfer is only
+    stopped once it stalls. Outside of ansible-connection no alarm is set and
+    none is started.
+    """
+    remaining = signal.alarm(0)
+    if remaining:
+        signal.alarm(max(remaining, int(seconds)))
+
+
+def _config_subtree(command):
+    """Returns the subtree tokens an `info configure` command reads"""
+    tokens = command.split()[2:]
+    while tokens and tokens[-1] in _INFO_MODIFIERS:
+        tokens.pop()
+    return tuple(tokens)
 
 
 class Cliconf(CliconfBase):
+    # Number of bytes requested per read while streaming a response
+    _stream_chunk_size = 65536
+
+    def __init__(self, *args, **kwargs):
+        super(Cliconf, self).__init__(*args, **kwargs)
+        # device info and capabilities are kept for the lifetime of the
+        # persistent connection, see invalidate_device_info()
+        self._device_info = None
+        self._capabilities = None
+        # `info configure` output of this run keyed by (host, command)
+        self._run_config_cache = {}
+        # additional CLI sessions, see _send_read_only()
+        self._session_pool = None
+        # durations and sizes of the streamed commands, see get_command_history()
+        self._command_history = None
+        # per command timings, see get_command_trace()
+        self._command_trace = None
+
     # These two methods will need to be implemented to support cli_config,
     # which is going to be fairly specific to your device.
-    def get_config(self, source='running', flags=None, format=None):
+    def get_config(self, source='running', flags=None, format=None, resources=None):
         """Retrieves the specified configuration from the device
 
         This method will retrieve the configuration specified by source and
@@ -59,28 +265,512 @@ class Cliconf(CliconfBase):
         :param source: The configuration source to return from the device.
             This argument accepts either `running` or `startup` as valid values.
 
-        :param flags: For devices that support configuration filtering, this
-            keyword argument is used to filter the returned configuration.
-            The use of this keyword argument is device dependent adn will be
-            silently ignored on devices that do not support it.
+        :param flags: The configuration subtree(s) to retrieve, e.g. `bridge`
+            or `interface port`. Each subtree is fetched with its own
+            `info configure <subtree> flat` command, see `plan_config_fetch`.
 
         :param format: For devices that support fetching different configuration
             format, this keyword argument is used to specify the format in which
             configuration is to be retrieved.
 
+        :param resources: The resource modules the configuration is needed for,
+            e.g. `bridges` or `vlans`. Only the subtrees they read are fetched.
+
         :return: The device configuration as specified by the source argument.
         """
-        if source not in ("running"):
+        if source not in ("running",):
             raise ValueError(
-                "fetching configuration from {source} is not supported" % source,
+                "fetching configuration from %s is not supported" % source,
             )
-        if not flags:
-            flags = []
-        cmd = "info configure flat"
-        cmd += " ".join(to_list(flags))
-        return self.send_command(cmd)
+        commands = self.plan_config_fetch(resources=resources, flags=flags)
+        return "\n".join(self._get_run_cached_many(commands, self._fetch_config))
+
+    def _fetch_config(self, commands):
+        """Returns the output of every `info configure` command
+
+        With the snapshot cache configured the probe is run once and only
+        the commands without a snapshot for its output are sent.
+        """
+        cache = self._get_config_cache()
+        if not cache:
+            return self._send_read_only(commands)
+
+        host = self._connection.get_option("host")
+        digest = cache.digest(self.send_command(self.get_option("config_cache_probe")))
+        texts = [cache.get(host, cmd, digest) for cmd in commands]
+        missing = [cmd for cmd, text in zip(commands, texts) if text is None]
+        fetched = dict(zip(missing, self._send_read_only(missing)))
+        for cmd in missing:
+            cache.put(host, cmd, digest, fetched[cmd])
+        return [fetched[cmd] if text is None else text for cmd, text in zip(commands, texts)]
+
+    def _send_read_only(self, commands):
+        """Sends read-only commands, side by side on the session pool if enabled
+
+        :return: The output of every command without alarms and control
+            characters, in the order of `commands`.
+        """
+        size = self.get_option("session_pool_size") or 1
+        if size < 2 or len(commands) < 2:
+            return [self._send_streamed(cmd) for cmd in commands]
+        if self._session_pool is None:
+            self._session_pool = CliSessionPool(self._open_cli_session, size)
+        return self._session_pool.map(
+            self._send_on_session,
+            commands,
+            primary=self._connection._ssh_shell,
+            reset_primary=lambda shell: self._reset_session(shell, True),
+        )
+
+    def _send_on_session(self, shell, command):
+        return self._send_streamed(command, shell=shell)
+
+    def _send_streamed(self, command, shell=None):
+        """Streams the output of `command`, see _stream_command()"""
+        return "\n".join(self._stream_command(command, shell=shell)).strip()
+
+    def _open_cli_session(self):
+        """Opens another CLI session on the ssh connection of the plugin
+
+        The session is set up by the terminal plugin like the one of the
+        connection, see TerminalModule.setup_session().
+        """
+        connection = self._connection
+        shell = connection.ssh_type_conn.ssh.invoke_shell()
+        if connection.ssh_type == "paramiko":
+            shell.settimeout(connection.get_option("persistent_command_timeout"))
+        try:
+            # the login banner ends with the first prompt
+            for chunk in self._read_until_prompt([], shell=shell):
+                pass
+            connection._terminal.setup_session(shell)
+        except Exception:
+            shell.close()
+            raise
+        return shell
 
-    def edit_config(self, candidate=None, commit=True, replace=None, diff=False, comment=None):
+    def _send_scrubbed(self, command):
+        """Sends `command` and returns its output without alarms and control characters"""
+        return scrubOutput(self.send_command(command))
+
+    def _get_run_cached_many(self, commands, fetch):
+        """Returns the output of every command, `info configure` outputs from
+        the run cache. The others are read with a single `fetch(missing)` call"""
+        use_cache = self.get_option("config_run_cache")
+        host = self._connection.get_option("host")
+        cached = [use_cache and cmd.split()[:2] == ["info", "configure"] for cmd in commands]
+        texts = [self._run_config_cache.get((host, cmd)) if cache else None for cmd, cache in zip(commands, cached)]
+        missing = [cmd for cmd, text in zip(commands, texts) if text is None]
+        if not missing:
+            return texts
+        fetched = dict(zip(missing, fetch(missing)))
+        for cmd, cache, text in zip(commands, cached, texts):
+            if cache and text is None:
+                self._run_config_cache[(host, cmd)] = fetched[cmd]
+        return [fetched[cmd] if text is None else text for cmd, text in zip(commands, texts)]
+
+    def _put_run_cached(self, command, text):
+        if self.get_option("config_run_cache"):
+            self._run_config_cache[(self._connection.get_option("host"), command)] = text
+
+    def invalidate_config_cache(self, commands=None):
+        """Drops the run cached `info configure` outputs the commands touch
+
+        :param commands: Configuration lines, e.g. `configure bridge port ...`.
+            A line not starting with `configure` may change anything, as may
+            omitting the lines, which drops every cached output.
+        """
+        if commands is None:
+            self._run_config_cache.clear()
+            return
+        paths = []
+        for line in to_list(commands):
+            tokens = str(line).split()
+            if not tokens or tokens[0].startswith("#") or tokens[0] in ("exit", "echo"):
+                continue
+            if tokens[0] != "configure":
+                self._run_config_cache.clear()
+                return
+            paths.append(tuple(tokens[1:]))
+        for key in list(self._run_config_cache):
+            subtree = _config_subtree(key[1])
+            if any(path[:len(subtree)] == subtree or subtree[:len(path)] == path for path in paths):
+                del self._run_config_cache[key]
+
+    def _get_command_history(self):
+        if self._command_history is None:
+            self._command_history = CommandHistory(
+                self._connection.get_option("host"),
+                self.get_option("command_history_dir"),
+            )
+        return self._command_history
+
+    def _get_command_trace(self):
+        if self._command_trace is None:
+            self._command_trace = CommandTrace(
+                self._connection.get_option("host"),
+                self.get_option("command_trace_dir"),
+                keep=bool(self.get_option("command_trace")),
+            )
+        return self._command_trace
+
+    def get_command_trace(self):
+        """Returns the records of the commands sent since the last call
+
+        Commands are only recorded with the `command_trace` option set, see
+        CommandTrace for the fields of a record.
+
+        :return: A list holding a dict per command
+        """
+        return self._get_command_trace().drain()
+
+    def send_command(self, command=None, prompt=None, answer=None, sendonly=False, newline=True,
+                     prompt_retry_check=False, check_all=False):
+        """Executes a command over the device connection, see CliconfBase
+
+        Commands read through network_cli are traced with their duration and
+        the size of the response only, the other timings are not exposed.
+        """
+        trace = self._get_command_trace()
+        if sendonly or not trace:
+            return super(Cliconf, self).send_command(
+                command, prompt, answer, sendonly, newline, prompt_retry_check, check_all,
+            )
+        started = time.time()
+        response = None
+        try:
+            response = super(Cliconf, self).send_command(
+                command, prompt, answer, sendonly, newline, prompt_retry_check, check_all,
+            )
+            return response
+        finally:
+            received = to_bytes(response or b"", errors="surrogate_then_replace")
+            trace.add(
+                to_text(command, errors="surrogate_then_replace"),
+                started,
+                time.time() - started,
+                received=len(received),
+                lines=received.count(b"\n") + 1 if received else 0,
+                failed=response is None,
+            )
+
+    def get_command_history(self, command=None):
+        """Returns how long the streamed commands took and how much they returned
+
+        :param command: only return the history of this command
+        :return: Per command the number of runs, the `seconds` and `bytes`
+            expected of the next run and those of the last one.
+        """
+        history = self._get_command_history().as_dict()
+        if command is not None:
+            return history.get(CommandHistory.key(command))
+        return history
+
+    def _get_config_cache(self):
+        """Returns the snapshot cache if it is configured, else None"""
+        directory = self.get_option("config_cache_dir")
+        if directory and self.get_option("config_cache_probe"):
+            return ConfigSnapshotCache(directory)
+        return None
+
+    def iter_config(self, source='running', flags=None, resources=None):
+        """Streams the specified configuration from the device line by line
+
+        Unlike `get_config` the response is never held as a whole. Lines are
+        yielded as soon as they are read off the channel, so a parser consuming
+        this generator starts working while the device is still sending and
+        memory use stays bounded by the longest line instead of the size of the
+        configuration. As a generator cannot cross the persistent connection
+        boundary this is meant for callers running inside the cliconf plugin.
+
+        :param source: The configuration source, only `running` is supported.
+
+        :param flags: The configuration subtree(s) to retrieve, see `get_config`.
+
+        :param resources: The resource modules to retrieve the configuration for.
+
+        :return: A generator yielding the configuration lines.
+        """
+        if source not in ("running",):
+            raise ValueError(
+                "fetching configuration from %s is not supported" % source,
+            )
+        commands = self.plan_config_fetch(resources=resources, flags=flags)
+        return itertools.chain.from_iterable(self._stream_command(cmd) for cmd in commands)
+
+    def plan_config_fetch(self, resources=None, flags=None):
+        """Works out the `info configure` commands needed to cover a request
+
+        Every resource is mapped to the subtree it reads and the subtrees given
+        in `flags` are added to those. A subtree nested below another requested
+        subtree of the same format is dropped, as the parent output already
+        contains it. Subtrees are fetched flat, except for the resources in
+        `HIERARCHICAL_RESOURCES` whose parsers need the indented output. The
+        complete `info configure flat` dump is only planned when it is really
+        needed: nothing narrower was requested, or one of the resources has no
+        known subtree.
+
+        :param resources: List of resource names, e.g. `bridges` or `vlans`.
+
+        :param flags: List of additional subtrees, e.g. `bridge` or `interface port`.
+
+        :return: The list of commands to send, in request order.
+        """
+        full_dump = False
+        subtrees = []
+        for resource in to_list(resources):
+            subtree = RESOURCE_SUBTREES.get(resource)
+            if subtree is None:
+                full_dump = True
+                continue
+            subtrees.append((tuple(subtree.split()), resource not in HIERARCHICAL_RESOURCES))
+        for flag in to_list(flags):
+            subtrees.append((tuple(str(flag).split()), True))
+        if full_dump or not subtrees:
+            subtrees.insert(0, ((), True))
+
+        subtrees = list(dict.fromkeys(subtrees))
+        planned = []
+        for subtree, flat in subtrees:
+            for parent, parent_flat in subtrees:
+                if (
+                    parent_flat == flat
+                    and len(parent) < len(subtree)
+                    and subtree[:len(parent)] == parent
+                ):
+                    break
+            else:
+                planned.append(self._get_config_command(subtree, flat))
+        return planned
+
+    def _get_config_command(self, flags=None, flat=True):
+        """Builds the `info configure ... [flat]` command for the given flags"""
+        cmd = ["info", "configure"]
+        cmd.extend(to_list(flags))
+        if flat:
+            cmd.append("flat")
+        return " ".join(cmd)
+
+    def _stream_command(self, command, shell=None):
+        """Sends `command` and yields the response line by line
+
+        The echoed command is dropped and reading stops at the CLI prompt,
+        which is not part of the yielded output. Errors reported by the device
+        are raised once the prompt has been reached, mirroring how network_cli
+        drains the buffer before failing. `shell` is a CLI session of the
+        session pool, by default the one of the connection is used.
+        """
+        stderr_re = self._get_terminal_text_re("terminal_stderr_re")
+        errored_response = None
+        lines = iter_chunk_lines(self._read_until_prompt([command], shell=shell))
+        for line in lines:
+            if not line.strip().endswith(command):
+                yield line
+            break
+        for line in lines:
+            if errored_response is None and any(regex.search(line) for regex in stderr_re):
+                errored_response = line
+            yield line
+        if errored_response is not None:
+            raise AnsibleConnectionFailure(errored_response)
+
+    def _send_batch(self, commands, shell=None):
+        """Sends `commands` in a single write and splits the output per command
+
+        Every command is echoed after the prompt of the one before, which is
+        where the output is cut. The output of each command is checked against
+        `terminal_stderr_re` on its own, so a failure is reported for the line
+        that caused it. `shell` is the CLI session to use, see _stream_command.
+
+        :return: A list holding a (response, failed) tuple per command.
+        """
+        stdout_re = self._get_terminal_text_re("terminal_stdout_re")
+        stderr_re = self._get_terminal_text_re("terminal_stderr_re")
+        responses = [[] for command in commands]
+        failed = [False] * len(commands)
+        index = -1
+        for line in iter_chunk_lines(self._read_until_prompt(commands, shell=shell)):
+            if index + 1 < len(commands) and (
+                index < 0 or any(regex.match(line) for regex in stdout_re)
+            ):
+                index += 1
+                continue
+            responses[index].append(line)
+            if not failed[index] and any(regex.search(line) for regex in stderr_re):
+                failed[index] = True
+        return [("\n".join(response).strip(), error) for response, error in zip(responses, failed)]
+
+    def _get_terminal_text_re(self, option):
+        """Returns the terminal regexes of `option` compiled for text lines"""
+        return [
+            re.compile(to_text(regex.pattern), regex.flags)
+            for regex in self._connection._get_terminal_std_re(option)
+        ]
+
+    def _read_until_prompt(self, commands, shell=None):
+        """Sends `commands` in one write and reads the output off the channel
+
+        The output is yielded in chunks that end on a line boundary. The
+        partial last line is held back and is the only part checked against
+        `terminal_stdout_re`, so prompt detection costs the same for the first
+        and the last chunk. The first command is echoed on the first line and
+        every further one on a line led by the prompt; reading stops at the
+        prompt following the last echo. A partial line longer than any prompt
+        is passed on without waiting for its end, so a response on a single
+        line is not copied over and over either. Alarm lines and control
+        characters are scrubbed from every chunk. Without commands only the
+        pending output up to the next prompt is read, e.g. the login banner.
+
+        A session left before the prompt, e.g. after the inactivity timeout,
+        still has the rest of the response pending and is reset, see
+        _reset_session().
+        """
+        connection = self._connection
+        stdout_re = connection._get_terminal_std_re("terminal_stdout_re")
+        timeout = connection.get_option("persistent_command_timeout")
+        inactivity = self.get_option("command_inactivity_timeout") or timeout
+        libssh = connection.ssh_type == "libssh"
+
+        started = time.time()
+        own = shell is None
+        if shell is None:
+            if commands:
+                self.send_command("\r".join(commands), sendonly=True)
+            shell = connection._ssh_shell
+        elif commands:
+            shell.sendall(to_bytes("\r".join(commands), errors="surrogate_or_strict") + b"\r")
+        sent = time.time()
+        awaited = commands[-1] if commands else "the prompt"
+        history = self._get_command_history() if len(commands) == 1 else None
+        trace = self._get_command_trace() if commands else None
+
+        echoes = 0
+        received = 0
+        lines_received = 0
+        first_byte = None
+        prompt_match = 0.0
+        failed = False
+        at_prompt = False
+        tail = b""
+        # whether the held back bytes continue a line that was passed on
+        continued = False
+        last_read = last_armed = sent
+        if not libssh:
+            # every read waits at most for the inactivity timeout
+            shell.settimeout(inactivity)
+        try:
+            while True:
+                try:
+                    if libssh:
+                        data = shell.read_bulk_response()
+                    else:
+                        data = shell.recv(self._stream_chunk_size)
+                except socket.timeout:
+                    data = None
+                if data is None or (not data and libssh and time.time() - last_read > inactivity):
+                    raise AnsibleConnectionFailure(
+                        "no data received for %s seconds while streaming the response to: %s"
+                        " (%d bytes in %.0f seconds, %s)"
+                        % (
+                            inactivity,
+                            awaited,
+                            received,
+                            time.time() - started,
+                            describe_expected(history.expected(awaited) if history else None),
+                        ),
+                    )
+                if not data:
+                    if not libssh:
+                        # paramiko returns no data once the channel is closed
+                        break
+                    continue
+                last_read = time.time()
+                if first_byte is None:
+                    first_byte = last_read - sent
+                received += len(data)
+                if last_read - last_armed >= 1:
+                    # the transfer makes progress, keep the request alive
+                    _extend_command_timeout(inactivity)
+                    last_armed = last_read
+
+                data = connection._strip(data)
+                lines_received += data.count(b"\n")
+                data = tail + data
+                cut = data.rfind(b"\n") + 1
+                if len(data) - cut > _MAX_PROMPT_LENGTH:
+                    cut = len(data)
+                tail = data[cut:]
+                if cut:
+                    complete = scrubOutput(data[:cut])
+                    if echoes < len(commands):
+                        matching = time.time()
+                        lines = complete.splitlines()
+                        for line in lines[1:] if continued else lines:
+                            if echoes == 0 or any(regex.match(line) for regex in stdout_re):
+                                echoes += 1
+                        prompt_match += time.time() - matching
+                    continued = data[cut - 1:cut] != b"\n"
+                    yield to_text(complete, errors="surrogate_then_replace")
+
+                # the prompt also precedes every echoed command, so it can only
+                # terminate the response once the last echo line is complete. It
+                # has to start the held back line, as xml tags such as
+                # `runtime-data>` match the prompt pattern anywhere in a line
+                if echoes >= len(commands) and tail and not continued:
+                    matching = time.time()
+                    prompted = any(regex.match(tail.lstrip()) for regex in stdout_re)
+                    prompt_match += time.time() - matching
+                    if prompted:
+                        at_prompt = True
+                        break
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if not libssh:
+                shell.settimeout(timeout)
+            if not at_prompt:
+                self._reset_session(shell, own)
+            if trace:
+                trace.add(
+                    commands[0],
+                    started,
+                    time.time() - started,
+                    received=received,
+                    lines=lines_received,
+                    send=sent - started,
+                    first_byte=first_byte,
+                    prompt_match=prompt_match,
+                    batch=len(commands),
+                    failed=failed,
+                )
+        if history is not None:
+            history.record(awaited, time.time() - started, received)
+
+    def _reset_session(self, shell, own):
+        """Drops a CLI session whose response was not read up to the prompt
+
+        The rest of the response would be read as the response of the next
+        command. A session of the pool is closed. The session of the
+        connection (`own`) is closed with the connection, which network_cli
+        opens again for the next command, and the pool sessions on its ssh
+        transport with it. While the pool runs commands on the session of the
+        connection, the pool resets it once all of its sessions are done.
+        """
+        if not own and shell is self._connection._ssh_shell:
+            return
+        if not own:
+            try:
+                shell.close()
+            except Exception:
+                pass
+            return
+        if self._session_pool is not None:
+            self._session_pool.close()
+            self._session_pool = None
+        self._connection.close()
+
+    def edit_config(self, candidate=None, commit=True, replace=None, diff=False, comment=None, batch_size=None):
         """Loads the candidate configuration into the network device
 
         This method will load the specified candidate config into the device
@@ -99,6 +789,8 @@ class Cliconf(CliconfBase):
                         the file in this case should be present on the remote host in the mentioned path as a
                         prerequisite.
         :param comment: Commit comment provided it is supported by remote host
+        :param batch_size: Number of lines sent in a single write, defaults to the
+                           `edit_config_batch_size` option.
         :return: Returns a json string with contains configuration applied on remote host, the returned
                  response on executing configuration commands and platform relevant data.
                {
@@ -120,14 +812,37 @@ class Cliconf(CliconfBase):
         result = []
         request = []
 
+        if batch_size is None:
+            batch_size = self.get_option("edit_config_batch_size")
+
+        cache = self._get_config_cache()
+        if commit and cache:
+            cache.invalidate(self._connection.get_option("host"))
+        if commit:
+            self.invalidate_config_cache(to_list(candidate))
+
         if commit:
-            for line in to_list(candidate):
+            lines = to_list(candidate)
+            for line in lines:
                 if not isinstance(line, str):
                     raise ValueError("candidate configuration is not a string")
-                # if not line.endswith('\n'):
-                #     line += '\n'
-                result.append(self.send_command(line))
-                request.append(line)
+            if batch_size > 1:
+                errors = []
+                for start in range(0, len(lines), batch_size):
+                    batch = lines[start:start + batch_size]
+                    for line, (response, failed) in zip(batch, self._send_batch(batch)):
+                        result.append(response)
+                        request.append(line)
+                        if failed:
+                            errors.append("%s: %s" % (line, response))
+                if errors:
+                    raise AnsibleConnectionFailure("\n".join(errors))
+            else:
+                for line in lines:
+                    # if not line.endswith('\n'):
+                    #     line += '\n'
+                    result.append(self.send_command(line))
+                    request.append(line)
         resp["request"] = request
         resp["response"] = result
         return resp
@@ -192,13 +907,29 @@ class Cliconf(CliconfBase):
                 % (diff_replace, ", ".join(option_values["diff_replace"])),
             )
 
+        # the ignored lines are dropped from candidate and running alike, so
+        # a line the device updates on its own is neither compared nor sent
+        ignore_lines = compile_ignore_lines(diff_ignore_lines)
+
+        if running and diff_match != "none" and not path and is_flat_config(candidate) and is_flat_config(running):
+            # flat lines have no parents, compare them as plain commands
+            # instead of building the NetworkConfig trees
+            updates = flat_difference(
+                candidate,
+                running,
+                match=diff_match,
+                ignore_lines=ignore_lines,
+            )
+            diff["config_diff"] = "\n".join(updates)
+            return diff
+
         # prepare candidate configuration
         candidate_obj = NetworkConfig(indent=2)
-        candidate_obj.load(candidate)
+        candidate_obj.load(drop_ignored_lines(candidate, ignore_lines))
 
         if running and diff_match != "none" and diff_replace != "config":
             # running configuration
-            running_obj = NetworkConfig(indent=2, contents=running, ignore_lines=diff_ignore_lines)
+            running_obj = NetworkConfig(indent=2, contents=drop_ignored_lines(running, ignore_lines))
             configdiffobjs = candidate_obj.difference(
                 running_obj,
                 path=path,
@@ -225,12 +956,25 @@ class Cliconf(CliconfBase):
         :param newline: bool to indicate if newline should be added at end of answer or not
         :param output: For devices that support fetching command output in different
                        format, this keyword argument is used to specify the output in which
-                        response is to be retrieved.
+                        response is to be retrieved. With `xml` the ISAM `xml` modifier is
+                        appended, see get_xml_records() for the response parsed into records.
         :param check_all: Bool value to indicate if all the values in prompt sequence should be matched or any one of
                           given prompt.
         :return: The output from the device after executing the command
-        """ 
-        return self.send_command(
+        """
+        if output == "xml" and command:
+            command = _xml_command(command)
+
+        verb = command.split()[0] if command and command.strip() else ""
+        if verb not in ("show", "info"):
+            # anything but a show or info command may change the configuration
+            self.invalidate_config_cache()
+        elif command.split()[:2] == ["info", "configure"] and not sendonly and not prompt:
+            # the same path as get_config(), so the run cache and the
+            # snapshot cache serve every reader of the configuration
+            return self._get_run_cached_many([" ".join(command.split())], self._fetch_config)[0]
+
+        response = self.send_command(
             command=command,
             prompt=prompt,
             answer=answer,
@@ -238,11 +982,126 @@ class Cliconf(CliconfBase):
             newline=newline,
             check_all=check_all,
         )
+        return scrubOutput(response) if response else response
+
+    def get_xml_records(self, command):
+        """Executes a show command with the `xml` modifier and parses the response
+
+        The response is streamed into the parser line by line, so memory is
+        bounded by a single instance however large the table is.
+
+        :param command: the show command, the `xml` modifier may be left out
+        :return: A list holding a dict per instance of the response, keyed by
+            the name of its fields.
+        """
+        if not command or not command.strip():
+            raise ValueError("'command' value is required for get_xml_records")
+        lines = self._stream_command(_xml_command(command))
+        return list(iterXMLInstances(line + "\n" for line in lines))
+
+    def get_many(self, commands):
+        """Executes independent read-only commands on the remote device
+
+        With `session_pool_size` above 1 the commands are spread over
+        several CLI sessions, so the device works on them at the same time.
+        `info configure` outputs are read from and kept in the run cache as
+        with `get`.
+
+        :param commands: `show` and `info` commands
+        :return: The output of every command, in the order of `commands`
+        """
+        commands = [" ".join(str(command).split()) for command in to_list(commands)]
+        for command in commands:
+            if command.split()[:1] not in (["show"], ["info"]):
+                raise ValueError("only show and info commands can be run side by side, got: %s" % command)
+        return self._get_run_cached_many(commands, self._send_read_only)
+
+    def get_ont_optics(self, ont_idx=None, split_by_lt=False, batch_size=16, output="xml"):
+        """Collects the optical levels of the ONTs
+
+        The `show equipment ont optics` commands are sent `batch_size` at a
+        time in a single write each, so the round trips grow with the number
+        of batches rather than the number of commands. With `split_by_lt`
+        every LT is queried on its own, which bounds the size of a single
+        response on an OLT with thousands of ONTs.
+
+        :param ont_idx: ONT, PON or LT indexes to query, all ONTs if omitted
+        :param split_by_lt: query every LT of `ont_idx`, or of the OLT, separately
+        :param batch_size: Number of commands sent in a single write
+        :param output: `xml` or `text`, the output requested from the device
+        :return: A list holding a typed record per ONT
+        """
+        if output not in ("xml", "text"):
+            raise ValueError("output must be xml or text, got %s" % output)
+        targets = to_list(ont_idx)
+        if split_by_lt:
+            lts = self._get_lt_slots()
+            if targets:
+                lts = [lt for lt in lts if any((lt + "/").startswith(target + "/") for target in targets)]
+                # targets below the LT level are queried as given
+                lts.extend(target for target in targets if target.count("/") > 2)
+            targets = lts
+
+        xml = output == "xml"
+        commands = optics_commands(targets, xml=xml)
+        records = []
+        for start in range(0, len(commands), max(1, batch_size)):
+            batch = commands[start:start + max(1, batch_size)]
+            for command, (response, failed) in zip(batch, self._send_batch(batch)):
+                if failed:
+                    raise AnsibleConnectionFailure("%s: %s" % (command, response))
+                records.extend(parse_ont_optics(response, xml=xml))
+        return records
+
+    def get_bridge_port_fdb(self, port=None, vlan_id=None, mac=None):
+        """Reads the MAC addresses learned on the bridge ports
+
+        :param port: Only read the FDB of this bridge port
+        :param vlan_id: Only return entries of this VLAN
+        :param mac: Only return entries of this MAC address
+        :return: A list holding a {port, vlan_id, mac, status} dict per entry,
+                 MAC addresses in lower case
+        """
+        command = "show vlan bridge-port-fdb"
+        if port:
+            command = "%s %s" % (command, port)
+        entries = []
+        for row in parse_show_output(command, self._send_scrubbed(command)):
+            entry = {
+                "port": row["port"],
+                "vlan_id": int(row["vlan_id"]),
+                "mac": row["mac"].lower(),
+                "status": row["status"],
+            }
+            if vlan_id is not None and entry["vlan_id"] != int(vlan_id):
+                continue
+            if mac is not None and entry["mac"] != mac.lower():
+                continue
+            entries.append(entry)
+        return entries
+
+    def _get_lt_slots(self):
+        """Returns the indexes of the LT slots, e.g. `1/1/5`"""
+        slots = []
+        for line in self.send_command("show equipment slot").splitlines():
+            match = _LT_SLOT_RE.match(line)
+            if match:
+                slots.append(match.group(1))
+        return slots
 
     def get_isam_rpc(self):
         return ['get_config',
+                'get_command_history',
+                'get_command_trace',
+                'get_many',
+                'get_xml_records',
+                'plan_config_fetch',
+                'get_ont_optics',
+                'get_bridge_port_fdb',
                 'edit_config',
                 'get_capabilities',
+                'invalidate_device_info',
+                'invalidate_config_cache',
                 'get',
             ]
 
@@ -253,30 +1112,42 @@ class Cliconf(CliconfBase):
             'network_os_version': <str>,
             'network_os_model': <str>,
             'network_os_hostname': <str>,
-            'network_os_image': <str>,
+            'network_os_serial': <str>,
             'network_os_platform': <str>,
-        },"""
+        },
+        The show commands are only run once per persistent connection."""
+        if self._device_info is not None:
+            return self._device_info
+
         device_info = dict()
         device_info['network_os'] = 'isam'
         device_info['network_os_platform'] = 'Nokia 7330'
 
-        # sys_info_text = self.get("info configure system detail")
-        # pattern = r"serial-no\s*:\s*(\S+)"
-        # match = re.search(pattern, sys_info_text)
+        for command, patterns in _DEVICE_INFO_PATTERNS:
+            text = self.get(command)
+            for key, pattern in patterns:
+                match = pattern.search(text)
+                if match:
+                    device_info[key] = match.group(1)
 
-        show_software_mngt_text = self.get("show software-mngt version etsi detail")
-        pattern = r"isam-release\s*:\s*(\S+)"
-        match = re.search(pattern, show_software_mngt_text)
-        software= match.group(1)
+        prompt = self._connection.get_prompt()
+        if prompt:
+            match = _PROMPT_HOSTNAME_RE.search(to_text(prompt, errors="surrogate_or_strict").strip())
+            if match:
+                device_info['network_os_hostname'] = match.group(1)
 
-        serial_number_text = self.get("show equipment slot nt-a detail")
-        pattern = r"serial-no\s*:\s*(\S+)"
-        match = re.search(pattern, serial_number_text)
-        serial_number = match.group(1)
+        self._device_info = device_info
+        return device_info
 
-        device_info['network_os_version'] = software
+    def invalidate_device_info(self):
+        """Drops the cached device info and capabilities
 
-        return super().get_device_info()
+        Has to be called once the device changed in a way that affects them,
+        e.g. after a software upgrade, for the next get_capabilities call to
+        query the device again.
+        """
+        self._device_info = None
+        self._capabilities = None
 
     def get_device_operations(self):
         return {
@@ -288,7 +1159,7 @@ class Cliconf(CliconfBase):
             "supports_commit_comment": False,
             "supports_multiline_delimiter": False,
             "supports_diff_match": True,
-            "supports_diff_ignore_lines": False,
+            "supports_diff_ignore_lines": True,
             "supports_generate_diff": True,
             "supports_replace": True,
         }
@@ -298,7 +1169,7 @@ class Cliconf(CliconfBase):
             "format": ["text"],
             "diff_match": ["line", "strict", "exact", "none"],
             "diff_replace": ["line", "block"],
-            "output": [],
+            "output": ["xml"],
         }
 
     def get_capabilities(self):
@@ -341,6 +1212,8 @@ class Cliconf(CliconfBase):
             }
         :return: capability as json string
         """
+        if self._capabilities is not None:
+            return self._capabilities
 
         result = {
             'rpc': self.get_isam_rpc(),
@@ -352,4 +1225,5 @@ class Cliconf(CliconfBase):
             'diff_replace': [],
             'output': ["flat", "hierarchical","xml"],
         }
-        return json.dumps(result)
+        self._capabilities = json.dumps(result)
+        return self._capabilities
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from ansible.module_utils._text import to_bytes
+
+
+class CommandHistory(object):
+    """How long the commands sent to a host took and how much they returned
+
+    Every command keeps its number of runs, the duration and size of the
+    last run and moving averages of both, which follow the device as its
+    configuration grows. With a directory the history of the host is kept
+    in `<directory>/<sha1 of host>.json` across runs, else only for the
+    lifetime of the persistent connection.
+    """
+
+    # weight of the latest run in the moving averages
+    WEIGHT = 0.3
+
+    def __init__(self, host, directory=None):
+        self._path = None
+        if directory:
+            name = hashlib.sha1(to_bytes(host)).hexdigest() + ".json"
+            self._path = os.path.join(os.path.expanduser(directory), name)
+        self._lock = threading.Lock()
+        self._commands = self._load()
+
+    @staticmethod
+    def key(command):
+        return " ".join(command.split())
+
+    def expected(self, command):
+        """Returns the {seconds, bytes} a run of `command` is expected to take
+        and return, None if it never ran"""
+        entry = self._commands.get(self.key(command))
+        if entry is None:
+            return None
+        return {"seconds": entry["seconds"], "bytes": entry["bytes"]}
+
+    def record(self, command, seconds, size):
+        """Adds a completed run of `command` and saves the history"""
+        key = self.key(command)
+        with self._lock:
+            entry = self._commands.get(key)
+            if entry is None:
+                entry = self._commands[key] = {"runs": 0, "seconds": seconds, "bytes": size}
+            entry["runs"] += 1
+            entry["last_seconds"] = seconds
+            entry["last_bytes"] = size
+            entry["seconds"] += (seconds - entry["seconds"]) * self.WEIGHT
+            entry["bytes"] += (size - entry["bytes"]) * self.WEIGHT
+            if self._path:
+                self._save()
+
+    def as_dict(self):
+        """Returns the history keyed by command"""
+        with self._lock:
+            return dict((command, dict(entry)) for command, entry in self._commands.items())
+
+    def _load(self):
+        if not self._path:
+            return {}
+        try:
+            with open(self._path) as history_file:
+                return json.load(history_file)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _save(self):
+        directory = os.path.dirname(self._path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as tmp_file:
+                json.dump(self._commands, tmp_file, indent=1, sort_keys=True)
+            os.rename(tmp_path, self._path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+
+def describe_expected(expected):
+    """Describes an expected run as returned by CommandHistory.expected()"""
+    if not expected:
+        return "no earlier run on record"
+    return "earlier runs took %.0f seconds for %d bytes" % (expected["seconds"], expected["bytes"])
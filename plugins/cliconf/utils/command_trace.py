@@ -0,0 +1,72 @@
+import json
+import os
+import re
+import threading
+
+# characters not kept in the name of a trace file
+_UNSAFE_CHARS = re.compile(r"[^\w.-]")
+
+
+class CommandTrace(object):
+    """Timings of the commands the cliconf plugin sends to a host
+
+    Every record holds the command, when it was sent and, in seconds, how
+    long the write took (`send`), the first byte of the response took to
+    arrive (`first_byte`), the whole response took (`duration`) and how much
+    of that went into matching the prompt (`prompt_match`), plus the bytes
+    and lines received. Timings network_cli does not expose for the commands
+    it reads itself are None.
+
+    With `keep` the records are held until drain() hands them out, e.g. to
+    the action plugin adding them to the module result. With a directory
+    every record is also appended to `<directory>/<host>.jsonl`.
+    """
+
+    def __init__(self, host, directory=None, keep=False):
+        self._host = host
+        self._keep = keep
+        self._path = None
+        if directory:
+            directory = os.path.expanduser(directory)
+            self._path = os.path.join(directory, _UNSAFE_CHARS.sub("_", host) + ".jsonl")
+        self._records = []
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return self._keep or self._path is not None
+
+    __nonzero__ = __bool__
+
+    def add(self, command, started, duration, received=0, lines=0, send=None, first_byte=None,
+            prompt_match=None, batch=1, failed=False):
+        """Adds the record of a command sent at `started` (seconds since the epoch)"""
+        record = {
+            "host": self._host,
+            "command": command,
+            "batch": batch,
+            "started": started,
+            "send": send,
+            "first_byte": first_byte,
+            "duration": duration,
+            "prompt_match": prompt_match,
+            "bytes": received,
+            "lines": lines,
+            "failed": failed,
+        }
+        with self._lock:
+            if self._keep:
+                self._records.append(record)
+            if self._path:
+                directory = os.path.dirname(self._path)
+                if not os.path.isdir(directory):
+                    os.makedirs(directory)
+                with open(self._path, "a") as trace_file:
+                    trace_file.write(json.dumps(record, sort_keys=True) + "\n")
+        return record
+
+    def drain(self):
+        """Returns the records kept since the last call and forgets them"""
+        with self._lock:
+            records, self._records = self._records, []
+        return records
+
@@ -0,0 +1,108 @@
+import re
+
+from ansible.module_utils._text import to_text
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.config import (
+    DEFAULT_COMMENT_TOKENS,
+    DEFAULT_IGNORE_LINES_RE,
+)
+
+# characters NetworkConfig strips from every line
+_ENTRY_CHARS = re.compile(r"[{};]")
+
+# compiled diff_ignore_lines, keyed by the pattern given
+_IGNORE_PATTERNS = {}
+
+
+def is_flat_config(text):
+    """Whether `text` is in the flat format, i.e. no line is indented
+
+    Flat configuration (`info configure flat`) has one complete command per
+    line, so its lines can be compared without rebuilding the hierarchy.
+    """
+    for line in text.splitlines():
+        if line[:1].isspace() and line.strip():
+            return False
+    return True
+
+
+def compile_ignore_lines(patterns):
+    """Returns the compiled patterns of `diff_ignore_lines`
+
+    Every pattern is compiled once for the lifetime of the plugin.
+    """
+    compiled = []
+    for pattern in patterns or []:
+        if not isinstance(pattern, str):
+            compiled.append(pattern)
+            continue
+        regex = _IGNORE_PATTERNS.get(pattern)
+        if regex is None:
+            regex = _IGNORE_PATTERNS[pattern] = re.compile(pattern)
+        compiled.append(regex)
+    return compiled
+
+
+def drop_ignored_lines(text, ignore_lines):
+    """Returns `text` without the lines matching one of the `ignore_lines` regexes
+
+    Lines are matched without their indentation, as NetworkConfig does.
+    Passing the patterns to NetworkConfig instead would add them to
+    DEFAULT_IGNORE_LINES_RE for every later diff of the process.
+    """
+    if not text or not ignore_lines:
+        return text
+    return "\n".join(
+        line
+        for line in to_text(text, errors="surrogate_or_strict").split("\n")
+        if not any(regex.match(_ENTRY_CHARS.sub("", line).strip()) for regex in ignore_lines)
+    )
+
+
+def iter_commands(text, ignore_lines=None):
+    """Yields the normalized commands of a flat configuration
+
+    Blanks are collapsed, so the command is the key lines are compared by.
+    Comments and lines matching one of the `ignore_lines` regexes are
+    skipped as NetworkConfig does.
+    """
+    ignore = list(DEFAULT_IGNORE_LINES_RE) + (ignore_lines or [])
+    for line in to_text(text, errors="surrogate_or_strict").split("\n"):
+        command = " ".join(_ENTRY_CHARS.sub("", line).split())
+        if not command or command.startswith(tuple(DEFAULT_COMMENT_TOKENS)):
+            continue
+        if any(regex.match(command) for regex in ignore):
+            continue
+        yield command
+
+
+def flat_difference(candidate, running, match="line", ignore_lines=None):
+    """The candidate commands missing from the running flat configuration
+
+    With `line` a command is missing unless the running configuration has
+    it anywhere, which is a lookup in a set of the running commands. With
+    `exact` all candidate commands are returned unless both configurations
+    hold the same commands in the same order, and `strict` compares the
+    commands position by position.
+
+    :param candidate: the candidate configuration text
+    :param running: the running configuration text
+    :param match: 'line', 'strict' or 'exact'
+    :param ignore_lines: compiled regexes of lines not to compare
+    :rtype: list
+    :returns: the commands to send, in candidate order
+    """
+    commands = list(iter_commands(candidate, ignore_lines))
+
+    if match == "line":
+        running_commands = set(iter_commands(running, ignore_lines))
+        return [command for command in commands if command not in running_commands]
+
+    running_commands = list(iter_commands(running, ignore_lines))
+    if match == "exact":
+        return [] if commands == running_commands else commands
+
+    updates = []
+    for index, command in enumerate(commands):
+        if index >= len(running_commands) or running_commands[index] != command:
+            updates.append(command)
+    return updates
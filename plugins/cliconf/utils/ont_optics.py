@@ -0,0 +1,66 @@
+from ansible_collections.isam.isam.plugins.cliconf.utils.parse_output_to_dict import parse_show_output
+from ansible_collections.isam.isam.plugins.cliconf.utils.utils import iterXMLInstances
+
+OPTICS_COMMAND = "show equipment ont optics"
+
+# column of `show equipment ont optics`: key of the typed record
+OPTICS_FIELDS = (
+    ("rx_signal_level", "rx_power"),
+    ("tx_signal_level", "tx_power"),
+    ("olt_rx_sig_level", "olt_rx_power"),
+    ("ont_temperature", "temperature"),
+    ("laser_bias_curr", "bias_current"),
+    ("ont_voltage", "voltage"),
+)
+
+
+def optics_commands(targets, xml=True):
+    """Returns the `show equipment ont optics` command of every target
+
+    :param targets: ONT, PON or LT indexes, None queries all ONTs
+    :param xml: request the xml output
+    """
+    commands = []
+    for target in targets or [None]:
+        command = [OPTICS_COMMAND]
+        if target:
+            command.append(target)
+        if xml:
+            command.append("xml")
+        commands.append(" ".join(command))
+    return commands
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        # unknown, invalid or not measured
+        return None
+
+
+def to_optics_record(row):
+    """Converts a row of the optics table into a typed record
+
+    Column names may use dashes as in the xml output or underscores as in
+    the text templates. Values the ONT did not report are None.
+    """
+    row = dict((name.replace("-", "_"), value) for name, value in row.items() if name)
+    record = {"ont_idx": row.get("ont_idx")}
+    for column, key in OPTICS_FIELDS:
+        record[key] = _to_float(row.get(column))
+    return record
+
+
+def parse_ont_optics(response, xml=True):
+    """Parses the response of a `show equipment ont optics` command
+
+    :param response: the device output
+    :param xml: whether the xml output was requested
+    :returns: a list holding a typed record per ONT
+    """
+    if xml:
+        rows = iterXMLInstances(response)
+    else:
+        rows = parse_show_output(OPTICS_COMMAND, response)
+    return [to_optics_record(row) for row in rows if row.get("ont-idx") or row.get("ont_idx")]
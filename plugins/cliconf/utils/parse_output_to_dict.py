@@ -1,46 +1,133 @@
-import os
-import textfsm
-
-
-def parse_with_textfsm(template, command_output):
-    """
-    :param template: TextFSM template to parse command
-    :param command_output: Command output from a node
-    :return: List of dicts. Dict per FSM row.
-    """
-    with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), template), "r") as template_file:
-        fsm = textfsm.TextFSM(template_file)
-        fsm_results = fsm.ParseText(command_output)
-    output_list = []
-    # print fsm.header
-    for index, line in enumerate(fsm_results, 1):
-        # print line
-        textfsm_dict = {}
-        for number, value in enumerate(line):
-            textfsm_dict[fsm.header[number]] = value
-        output_list.append(textfsm_dict)
-    return output_list
-
-
-def parse_with_textfsm_by_first_value(template, command_output):
-    """
-    :param template: TextFSM template to parse command
-    :param command_output: Command output from a node
-    :return: Dict per first(top) textFSM template value
-    """
-    with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), template), "r") as template_file:
-        fsm = textfsm.TextFSM(template_file)
-        fsm_results = fsm.ParseText(command_output)
-    textfsm_dict = {}
-    # print fsm.header
-    for line in fsm_results:
-        # print line
-        textfsm_dict[line[0]] = {}
-        for number, value in enumerate(line):
-            if value != line[0]:
-                textfsm_dict[line[0]].update({fsm.header[number]: value})
-    return textfsm_dict
-
-
-if __name__ == '__main__':
-    pass
+import copy
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import textfsm
+
+    HAS_TEXTFSM = True
+except ImportError:
+    HAS_TEXTFSM = False
+
+
+class TextFSMRegistry(object):
+    """Parsed TextFSM templates shared by all parsers of the process
+
+    Every template file is read and compiled once. Callers borrow an FSM
+    cloned from the compiled template, which goes back to a per template
+    pool after it has been reset, so parsing the output of many hosts reuses
+    the same few FSMs instead of compiling the template over and over.
+    """
+
+    def __init__(self, directory=None):
+        self._directory = directory or os.path.dirname(os.path.realpath(__file__))
+        self._templates = {}
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def _template(self, template):
+        path = os.path.join(self._directory, template)
+        fsm = self._templates.get(path)
+        if fsm is None:
+            if not HAS_TEXTFSM:
+                raise ValueError("textfsm is required to parse %s, install it with `pip install textfsm`" % template)
+            with open(path, "r") as template_file:
+                fsm = textfsm.TextFSM(template_file)
+            with self._lock:
+                fsm = self._templates.setdefault(path, fsm)
+        return path, fsm
+
+    @contextmanager
+    def fsm(self, template):
+        """Borrows a reset FSM of `template` for the duration of the block
+
+        :param template: the template file, relative to the registry directory
+        """
+        path, prototype = self._template(template)
+        with self._lock:
+            pool = self._pools.setdefault(path, [])
+            fsm = pool.pop() if pool else None
+        if fsm is None:
+            fsm = copy.deepcopy(prototype)
+        try:
+            yield fsm
+        finally:
+            fsm.Reset()
+            with self._lock:
+                pool.append(fsm)
+
+
+REGISTRY = TextFSMRegistry()
+
+# The ISAM show commands with a template, see parse_show_output()
+SHOW_TEMPLATES = {
+    "show equipment ont optics": "textfsm_templates/nokia_isam_show_equipment_ont_optics.tpl",
+    "show equipment ont status": "textfsm_templates/nokia_isam_show_equipment_ont_status.tpl",
+    "show vlan bridge-port-fdb": "textfsm_templates/nokia_isam_show_vlan_bridge_port_fdb.tpl",
+    "show dhcp-relay session": "textfsm_templates/nokia_isam_show_dhcp_relay_session.tpl",
+    "show equipment diagnostics sfp": "textfsm_templates/nokia_isam_show_equipment_diagnostics_sfp.tpl",
+    "show equipment transceiver-inventory": "textfsm_templates/nokia_isam_show_equipment_transceiver_inventory.tpl",
+    "show interface port": "textfsm_templates/nokia_isam_show_interface_port.tpl",
+}
+
+
+def parse_with_textfsm(template, command_output):
+    """
+    :param template: TextFSM template to parse command
+    :param command_output: Command output from a node
+    :return: List of dicts. Dict per FSM row.
+    """
+    with REGISTRY.fsm(template) as fsm:
+        header = fsm.header
+        return [dict(zip(header, row)) for row in fsm.ParseText(command_output)]
+
+
+def parse_with_textfsm_by_first_value(template, command_output):
+    """
+    :param template: TextFSM template to parse command
+    :param command_output: Command output from a node
+    :return: Dict per first(top) textFSM template value
+    """
+    with REGISTRY.fsm(template) as fsm:
+        header = fsm.header
+        textfsm_dict = {}
+        for row in fsm.ParseText(command_output):
+            key = row[0]
+            textfsm_dict[key] = dict((name, value) for name, value in zip(header, row) if value != key)
+    return textfsm_dict
+
+
+def get_show_template(command):
+    """
+    :param command: The show command, with or without its arguments
+    :return: The template of the longest matching command or None
+    """
+    tokens = command.split()
+    for end in range(len(tokens), 0, -1):
+        template = SHOW_TEMPLATES.get(" ".join(tokens[:end]))
+        if template:
+            return template
+    return None
+
+
+def parse_show_output(command, command_output):
+    """
+    :param command: The show command the output was returned for, e.g.
+        `show equipment ont optics 1/1/5/1/1`
+    :param command_output: Command output from a node
+    :return: List of dicts. Dict per table row, quoted values are unquoted.
+    """
+    template = get_show_template(command)
+    if template is None:
+        raise ValueError("no TextFSM template for command: %s" % command)
+    rows = parse_with_textfsm(template, command_output)
+    for row in rows:
+        for name, value in row.items():
+            if len(value) > 1 and value[0] == value[-1] == '"':
+                row[name] = value[1:-1]
+    return rows
+
+
+if __name__ == '__main__':
+    pass
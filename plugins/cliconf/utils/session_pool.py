@@ -0,0 +1,114 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class CliSessionPool(object):
+    """Additional CLI sessions of one device for commands run side by side
+
+    A CLI session runs one command at a time, so independent read-only
+    commands are spread over several sessions and the device works on all of
+    them at once. Sessions are opened on first use with `open_session()` and
+    kept for later calls. The device limits the number of CLI sessions, once
+    it refuses a session the pool does not try to grow beyond the sessions
+    it already has.
+    """
+
+    def __init__(self, open_session, size):
+        self._open_session = open_session
+        self._size = size
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def map(self, execute, commands, primary=None, reset_primary=None):
+        """Runs `execute(session, command)` for every command
+
+        Every session takes the next command as soon as it is done with the
+        one before. A session that fails is closed, the commands not run yet
+        are taken by the remaining ones.
+
+        :param execute: called with a session and a command, returns its output
+        :param commands: the commands to run
+        :param primary: a session of the caller to use as well, it counts
+            against the pool size but is never closed
+        :param reset_primary: called with `primary` once all sessions are
+            done if a command failed on it, the primary may be out of sync
+            like the sessions that are closed
+        :return: The results of `execute` in the order of `commands`.
+        """
+        commands = list(commands)
+        if not commands:
+            return []
+        slots = [primary] if primary is not None else []
+        wanted = max(min(self._size, len(commands)) - len(slots), 0)
+        slots.extend(self._sessions[:wanted])
+        slots.extend([None] * (wanted - min(wanted, len(self._sessions))))
+
+        pending = iter(enumerate(commands))
+        results = [None] * len(commands)
+        errors = {}
+        primary_failed = []
+
+        def work(session):
+            if session is None:
+                session = self._open()
+                if session is None:
+                    return
+            while True:
+                with self._lock:
+                    item = next(pending, None)
+                if item is None:
+                    return
+                index, command = item
+                try:
+                    results[index] = execute(session, command)
+                except Exception as exc:
+                    errors[index] = exc
+                    if session is primary:
+                        primary_failed.append(index)
+                    else:
+                        self._discard(session)
+                    return
+
+        executor = ThreadPoolExecutor(max_workers=len(slots))
+        try:
+            list(executor.map(work, slots))
+        finally:
+            executor.shutdown(wait=True)
+
+        if primary_failed and reset_primary is not None:
+            reset_primary(primary)
+        if errors:
+            raise errors[min(errors)]
+        unrun = next(pending, None)
+        if unrun is not None:
+            raise ValueError("no CLI session left to run: %s" % unrun[1])
+        return results
+
+    def _open(self):
+        try:
+            session = self._open_session()
+        except Exception:
+            # most likely the device has no session left, stay at this size
+            with self._lock:
+                self._size = min(self._size, len(self._sessions) + 1)
+            return None
+        with self._lock:
+            self._sessions.append(session)
+        return session
+
+    def _discard(self, session):
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        try:
+            session.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """Closes all sessions of the pool"""
+        for session in list(self._sessions):
+            self._discard(session)
@@ -0,0 +1,65 @@
+import gzip
+import hashlib
+import os
+import tempfile
+
+from ansible.module_utils._text import to_bytes, to_text
+
+
+class ConfigSnapshotCache(object):
+    """Compressed on-disk copies of retrieved configuration
+
+    Every snapshot is stored per host and `info configure` command together
+    with the digest of a cheap device side probe, e.g. the output of a show
+    command reporting a configuration change counter. A snapshot is only
+    served while the probe still returns the same output, so any change on
+    the device invalidates it without having to pull the configuration.
+    """
+
+    def __init__(self, directory):
+        self._directory = os.path.expanduser(directory)
+
+    @staticmethod
+    def digest(probe_output):
+        """Returns the digest a snapshot is validated against"""
+        return hashlib.sha256(to_bytes(probe_output.strip(), errors="surrogate_then_replace")).hexdigest()
+
+    def get(self, host, command, digest):
+        """Returns the cached configuration or None if it is missing or stale"""
+        path = self._path(host, command)
+        try:
+            with gzip.open(path, "rb") as snapshot:
+                if to_text(snapshot.readline()).strip() != digest:
+                    return None
+                return to_text(snapshot.read(), errors="surrogate_then_replace")
+        except (IOError, OSError, EOFError):
+            return None
+
+    def put(self, host, command, digest, config):
+        """Stores `config` as the snapshot taken at probe state `digest`"""
+        directory = os.path.dirname(self._path(host, command))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                with gzip.GzipFile(fileobj=tmp_file, mode="wb") as snapshot:
+                    snapshot.write(to_bytes(digest) + b"\n")
+                    snapshot.write(to_bytes(config, errors="surrogate_then_replace"))
+            os.rename(tmp_path, self._path(host, command))
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def invalidate(self, host):
+        """Drops all snapshots of `host`"""
+        directory = os.path.dirname(self._path(host, ""))
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+
+    def _path(self, host, command):
+        host_dir = hashlib.sha1(to_bytes(host)).hexdigest()
+        name = hashlib.sha1(to_bytes(command)).hexdigest() + ".gz"
+        return os.path.join(self._directory, host_dir, name)
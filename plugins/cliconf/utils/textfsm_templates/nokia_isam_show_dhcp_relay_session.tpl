@@ -0,0 +1,9 @@
+Value port (\d+(?:/\d+)+)
+Value vlan_id (\d+)
+Value ip_addr (\d+\.\d+\.\d+\.\d+)
+Value mac_addr ([0-9a-fA-F]{2}(?::[0-9a-fA-F]{2}){5})
+Value lease_time_remaining (\d+)
+
+
+Start
+  ^${port}\s+${vlan_id}\s+${ip_addr}\s+${mac_addr}\s+${lease_time_remaining}\s*$$ -> Record
@@ -0,0 +1,12 @@
+Value position (\S+:\S+)
+Value los (\S+)
+Value tx_fault (\S+)
+Value tx_power ([^"]+)
+Value rx_power ([^"]+)
+Value tx_bias_current ([^"]+)
+Value supply_voltage ([^"]+)
+Value temperature ([^"]+)
+
+
+Start
+  ^${position}\s+${los}\s+${tx_fault}\s+"${tx_power}"\s+"${rx_power}"\s+"${tx_bias_current}"\s+"${supply_voltage}"\s+"${temperature}"\s*$$ -> Record
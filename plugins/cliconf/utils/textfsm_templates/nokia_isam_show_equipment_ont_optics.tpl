@@ -0,0 +1,11 @@
+Value ont_idx (\d+/\d+/\d+/\d+/\d+)
+Value rx_signal_level (\S+)
+Value tx_signal_level (\S+)
+Value ont_voltage (\S+)
+Value olt_rx_sig_level (\S+)
+Value ont_temperature (\S+)
+Value laser_bias_curr (\S+)
+
+
+Start
+  ^${ont_idx}\s+${rx_signal_level}\s+${tx_signal_level}\s+${ont_voltage}\s+${olt_rx_sig_level}\s+${ont_temperature}\s+${laser_bias_curr}\s*$$ -> Record
@@ -0,0 +1,14 @@
+Value pon_idx (\d+/\d+/\d+/\d+)
+Value ont_idx (\d+/\d+/\d+/\d+/\d+)
+Value sernum (\S+)
+Value admin_status (\S+)
+Value oper_status (\S+)
+Value olt_rx_sig_level (\S+)
+Value ont_olt_distance (\S+)
+Value desc1 ("[^"]*"|\S+)
+Value desc2 ("[^"]*"|\S+)
+Value hostname ("[^"]*"|\S+)
+
+
+Start
+  ^${pon_idx}\s+${ont_idx}\s+${sernum}\s+${admin_status}\s+${oper_status}\s+${olt_rx_sig_level}\s+${ont_olt_distance}\s+${desc1}\s+${desc2}\s+${hostname}\s*$$ -> Record
@@ -0,0 +1,11 @@
+Value position (\S+:\S+)
+Value inventory_status (\S+)
+Value alu_part_num (\S+)
+Value tx_wavelength (\S+)
+Value fiber_type (\S+)
+Value rssi_profile_id (\S+)
+Value rssi_state (\S+)
+
+
+Start
+  ^${position}\s+${inventory_status}\s+${alu_part_num}\s+${tx_wavelength}\s+${fiber_type}\s+${rssi_profile_id}\s+${rssi_state}\s*$$ -> Record
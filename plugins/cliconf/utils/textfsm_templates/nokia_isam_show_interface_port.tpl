@@ -0,0 +1,9 @@
+Value port ([\w-]+:\d+(?:/\d+)+)
+Value admin_status (\S+)
+Value oper_status (\S+)
+Value last_chg_opr_stat (\S+)
+Value customer_id ("[^"]*"|\S+)
+
+
+Start
+  ^${port}\s+${admin_status}\s+${oper_status}\s+${last_chg_opr_stat}\s+${customer_id}\s*$$ -> Record
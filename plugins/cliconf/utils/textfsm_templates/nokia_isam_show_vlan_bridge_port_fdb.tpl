@@ -0,0 +1,8 @@
+Value port (\d+(?:/\d+)+)
+Value vlan_id (\d+)
+Value mac ([0-9a-fA-F]{2}(?::[0-9a-fA-F]{2}){5})
+Value status (\S+)
+
+
+Start
+  ^${port}\s+${vlan_id}\s+${mac}\s+${status}\s*$$ -> Record
@@ -2,8 +2,7 @@ import itertools
 import logging
 import re
 from datetime import datetime
-from unittest import result
-from xml.etree.ElementTree import ElementTree
+from xml.etree.ElementTree import ElementTree, XMLPullParser
 
 LOG_FORMAT = '%(asctime)-15s %(filename)s %(funcName)s line %(lineno)d %(levelname)s:  %(message)s'
 
@@ -40,17 +39,122 @@ def getXMLElements(tree, attrib, name=None):
             result.append(i)
     return result
 
+# C0 and C1 control characters
+_CTRL_CHARS = ''.join(map(chr, itertools.chain(range(0x00, 0x20), range(0x7f, 0xa0))))
+_CTRL_CHAR_TABLE = dict.fromkeys(map(ord, _CTRL_CHARS))
+
+# Values of xml responses converted by iterXMLInstances()
+_INT_RE = re.compile(r"^-?\d+$")
+_FLOAT_RE = re.compile(r"^-?\d*\.\d+$")
+
+# Alarms the device interleaves with the output start with their date, e.g.
+# `18/10/26 12:00:01 ...`, and are dropped including their line terminator
+_ALARM_LINE = r"^\d{2}/\d{2}/\d{2}[^\n]*\n?"
+_ALARM_RE = re.compile(_ALARM_LINE, re.M)
+
+# One pass over a response drops alarm lines and every control character but
+# tab and newline. Bytes are scrubbed of the C0 set and DEL only, as the C1
+# range is part of multi-byte UTF-8 sequences there.
+_SCRUB_RE = re.compile(_ALARM_LINE + r"|[\x00-\x08\x0b-\x1f\x7f-\x9f]+", re.M)
+_SCRUB_BYTES_RE = re.compile(_ALARM_LINE.encode() + rb"|[\x00-\x08\x0b-\x1f\x7f]+", re.M)
+
+
 def removeCtrlChars(s):
-    control_chars = ''.join(map(chr, itertools.chain(range(0x00,0x20), range(0x7f,0xa0))))
-    control_char_re = re.compile('[%s]' % re.escape(control_chars))
-    satinized_s = control_char_re.sub('', s)
-    difference = diff(s,satinized_s)
-    return satinized_s
+    return s.translate(_CTRL_CHAR_TABLE)
 
 def removeAlarms(s):
-    out = ''
-    for l in s.splitlines(keepends=True):
-        if not re.search('^\d{2}\/\d{2}\/\d{2}',l):
-            out +=l
-    return out
+    return _ALARM_RE.sub('', s)
+
+def scrubOutput(data):
+    """Drops alarm lines and control characters from a device response
+
+    :param data: the response as str or bytes
+    :returns: the scrubbed response of the same type
+    """
+    if isinstance(data, bytes):
+        return _SCRUB_BYTES_RE.sub(b'', data)
+    return _SCRUB_RE.sub('', data)
+
+def iterScrubbedChunks(chunks):
+    """Scrubs a response streamed in arbitrary chunks
+
+    Alarm lines are recognized by their start, so the partial last line of
+    every chunk is held back until its line is complete.
+
+    :param chunks: an iterable of str or bytes chunks
+    :returns: a generator yielding the scrubbed chunks
+    """
+    pending = None
+    for chunk in chunks:
+        if not chunk:
+            continue
+        data = chunk if pending is None else pending + chunk
+        newline = b'\n' if isinstance(data, bytes) else '\n'
+        cut = data.rfind(newline) + 1
+        pending = data[cut:]
+        if cut:
+            yield scrubOutput(data[:cut])
+    if pending:
+        yield scrubOutput(pending)
+
+def _typedXMLValue(text):
+    if text is None:
+        return None
+    text = text.strip()
+    if _INT_RE.match(text):
+        return int(text)
+    if _FLOAT_RE.match(text):
+        return float(text)
+    return text
+
+def iterXMLInstances(chunks, typed=True):
+    """Streams the `<instance>` elements of an xml response as dicts
+
+    The response is fed to an incremental parser as it arrives and every
+    instance is removed from the tree once it has been converted, so memory
+    stays bounded by a single instance instead of the whole response. Every
+    `res-id` and `info` child is keyed by its name attribute, anything ahead
+    of the xml document such as the echoed command is skipped.
+
+    :param chunks: the response as a string or an iterable of text chunks
+    :param typed: convert integer and decimal values to int and float
+    :returns: a generator yielding a dict per instance
+    """
+    if isinstance(chunks, (str, bytes)):
+        chunks = [chunks]
+    parser = XMLPullParser(events=("start", "end"))
+    started = False
+    stack = []
+    for chunk in chunks:
+        if not started:
+            start = chunk.find(b"<" if isinstance(chunk, bytes) else "<")
+            if start == -1:
+                continue
+            chunk = chunk[start:]
+            started = True
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == "start":
+                stack.append(element)
+                continue
+            stack.pop()
+            if element.tag != "instance":
+                continue
+            instance = {}
+            for child in element:
+                if child.tag in ("res-id", "info"):
+                    text = child.text.strip() if child.text else child.text
+                    instance[child.attrib.get("name")] = _typedXMLValue(text) if typed else text
+            if stack:
+                stack[-1].remove(element)
+            yield instance
+    if started:
+        parser.close()
+
+def getXMLInstances(tree):
+    """Returns the `<instance>` elements of an xml response as dicts
 
+    :param tree: the xml response as text
+    :returns: a list holding a dict per instance
+    """
+    return list(iterXMLInstances(tree, typed=False))
@@ -34,7 +34,6 @@ class BridgesArgs(object):  # pylint: disable=R0903
     argument_spec = {
         "config": {
             "type": "dict",
-            "elements": "dict",
             "options": {
                 "ageing_time": {"type": "int", "default": 300},
                 "port": {
@@ -120,20 +119,14 @@ class BridgesArgs(object):  # pylint: disable=R0903
                                 },
                                 "qos": {"type": "str", "default": "none"},
                                 "qos_profile": {"type": "str", "default": "none"},
-                                "prior_best_effort": {
-                                    "type": "boolean",
-                                    "default": "none",
-                                },
-                                "prior_background": {
-                                    "type": "boolean",
-                                    "default": "none",
-                                },
-                                "prior_spare": {"type": "boolean"},
-                                "prior_exc_effort": {"type": "boolean"},
-                                "prior_ctrl_load": {"type": "boolean"},
-                                "prior_less_100ms": {"type": "boolean"},
-                                "prior_less_10ms": {"type": "boolean"},
-                                "prior_nw_ctrl": {"type": "boolean"},
+                                "prior_best_effort": {"type": "bool"},
+                                "prior_background": {"type": "bool"},
+                                "prior_spare": {"type": "bool"},
+                                "prior_exc_effort": {"type": "bool"},
+                                "prior_ctrl_load": {"type": "bool"},
+                                "prior_less_100ms": {"type": "bool"},
+                                "prior_less_10ms": {"type": "bool"},
+                                "prior_nw_ctrl": {"type": "bool"},
                                 "in_qos_prof_name": {"type": "str"},
                                 "max_up_qos_policy": {"type": "int"},
                                 "max_ip_antispoof": {"type": "int"},
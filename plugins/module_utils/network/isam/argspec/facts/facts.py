@@ -23,6 +23,7 @@ class FactsArgs(object):  # pylint: disable=R0903
         'all',
         'interfaces',
         'bridges',
+        'ethernet_line',
     ]
 
     argument_spec = {
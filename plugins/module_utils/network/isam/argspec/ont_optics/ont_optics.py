@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+"""
+The arg spec for the isam_show_equipment_ont_optics module.
+"""
+
+
+class OntOpticsArgs(object):  # pylint: disable=R0903
+    """ The arg spec for the isam_show_equipment_ont_optics module
+    """
+
+    def __init__(self, **kwargs):
+        pass
+
+    argument_spec = {
+        'ont_idx': dict(type='list', elements='str'),
+        'split_by_lt': dict(type='bool', default=False),
+        'batch_size': dict(type='int', default=16),
+        'output': dict(type='str', choices=['xml', 'text'], default='xml'),
+    }
@@ -51,7 +51,7 @@ class VlansArgs(object):  # pylint: disable=R0903
                 "sntp-proxy": {"type": "bool"},
                 "priority": {"type": "int"},
                 "vmac-not-in-opt61": {"type": "bool"},
-                "new-broadcast:": {
+                "new-broadcast": {
                     "type": "str",
                     "choices": ["inherit", "enable", "disable"],
                     "default": "inherit",
@@ -72,9 +72,9 @@ class VlansArgs(object):  # pylint: disable=R0903
                 },
                 "pppoe-relay-tag": {
                     "type": "str",
-                    "choices": [True, False, "configurable"],
+                    "choices": ["true", "false", "configurable"],
                 },
-                "drly-srv-usr-side": {"type": "bool", "default": "disable"},
+                "drly-srv-usr-side": {"type": "bool"},
                 "new-secure-fwd": {
                     "type": "str",
                     "choices": ["inherit", "enable", "disable"],
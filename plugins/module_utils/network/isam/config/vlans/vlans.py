@@ -17,18 +17,15 @@ necessary to bring the current configuration to its desired end-state is
 created.
 """
 
-from copy import deepcopy
-
-from ansible.module_utils.six import iteritems
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
-    dict_merge,
-)
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.rm_base.resource_module import (
     ResourceModule,
 )
 from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.facts import (
     Facts,
 )
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.utils.utils import (
+    diff_entries,
+)
 from ansible_collections.isam.isam.plugins.module_utils.network.isam.rm_templates.vlans import (
     VlansTemplate,
 )
@@ -64,29 +61,14 @@ class Vlans(ResourceModule):
     def generate_commands(self):
         """ Generate configuration commands to send based on
             want, have and desired state.
-        """
-        wantd = {entry['name']: entry for entry in self.want}
-        haved = {entry['name']: entry for entry in self.have}
 
-        # if state is merged, merge want onto have and then compare
-        if self.state == "merged":
-            wantd = dict_merge(haved, wantd)
-
-        # if state is deleted, empty out wantd and set haved to wantd
-        if self.state == "deleted":
-            haved = {
-                k: v for k, v in iteritems(haved) if k in wantd or not wantd
-            }
-            wantd = {}
-
-        # remove superfluous config for overridden and deleted
-        if self.state in ["overridden", "deleted"]:
-            for k, have in iteritems(haved):
-                if k not in wantd:
-                    self._compare(want={}, have=have)
+            Only the entries whose fingerprints differ are compared.
+        """
+        wantd = {entry['id']: entry for entry in self.want}
+        haved = {entry['id']: entry for entry in self.have}
 
-        for k, want in iteritems(wantd):
-            self._compare(want=want, have=haved.pop(k, {}))
+        for want, have in diff_entries(wantd, haved, self.state):
+            self._compare(want=want, have=have)
 
     def _compare(self, want, have):
         """Leverages the base class `compare()` method and
@@ -4,8 +4,7 @@
 # (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
 from __future__ import absolute_import, division, print_function
-from queue import Empty
-import re
+import sys
 
 __metaclass__ = type
 
@@ -29,6 +28,156 @@ from ansible_collections.isam.isam.plugins.module_utils.network.isam.rm_template
 from ansible_collections.isam.isam.plugins.module_utils.network.isam.argspec.bridges.bridges import (
     BridgesArgs,
 )
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.utils.utils import (
+    iter_lines,
+)
+
+_PORT_OPTIONS = BridgesArgs.argument_spec["config"]["options"]["port"]["options"]
+_VLAN_OPTIONS = _PORT_OPTIONS["vlan_id"]["options"]
+
+# CLI keyword of every attribute mapped to its key in the facts
+PORT_ATTRIBUTES = dict((key, key) for key in _PORT_OPTIONS if key not in ("port", "vlan_id"))
+PORT_ATTRIBUTES["max-committed-mac"] = "max-commited-mac"
+VLAN_ATTRIBUTES = dict((key.replace("_", "-"), key) for key in _VLAN_OPTIONS if key != "id")
+VLAN_ATTRIBUTES["max-unicast-mac"] = "max_unicaast_mac"
+
+# Boolean attributes are written without a value, e.g. `mac-learn-off`
+FLAG_ATTRIBUTES = frozenset(
+    [cli for cli, key in PORT_ATTRIBUTES.items() if _PORT_OPTIONS.get(key, {}).get("type") == "bool"]
+    + [cli for cli, key in VLAN_ATTRIBUTES.items() if _VLAN_OPTIONS.get(key, {}).get("type") == "bool"]
+)
+
+
+class BridgeRecords(object):
+    """ Columnar (port, vlan, attribute, value) records of the bridge config
+
+    Every attribute of `configure bridge port <port> [vlan-id <vlan>] ...`
+    becomes one record. A record with attribute None only states that the
+    port, or the VLAN of the port, exists. Negated attributes (`no <attr>`)
+    have the value False and flags the value True. Repeated port, VLAN and
+    attribute names are interned, so a large configuration is held as four
+    lists of references.
+    """
+
+    __slots__ = ("ageing_time", "ports", "vlans", "attributes", "values")
+
+    def __init__(self):
+        self.ageing_time = None
+        self.ports = []
+        self.vlans = []
+        self.attributes = []
+        self.values = []
+
+    def __len__(self):
+        return len(self.ports)
+
+    def __iter__(self):
+        return zip(self.ports, self.vlans, self.attributes, self.values)
+
+    def append(self, port, vlan, attribute, value):
+        self.ports.append(port)
+        self.vlans.append(vlan)
+        self.attributes.append(attribute)
+        self.values.append(value)
+
+
+def _iter_attributes(tokens, start):
+    """ Yields the (attribute, value) pairs of a tokenized line from `start`
+    """
+    index = start
+    end = len(tokens)
+    while index < end:
+        token = tokens[index]
+        if token == "no" and index + 1 < end:
+            yield tokens[index + 1], False
+            index += 2
+        elif token in FLAG_ATTRIBUTES or index + 1 == end:
+            yield token, True
+            index += 1
+        else:
+            value = tokens[index + 1]
+            index += 2
+            if value.startswith('"'):
+                # quoted values may contain blanks
+                while (len(value) == 1 or not value.endswith('"')) and index < end:
+                    value += " " + tokens[index]
+                    index += 1
+                value = value.strip('"')
+            yield token, value
+
+
+def tokenize_bridge_config(data):
+    """ Tokenize `info configure bridge flat` into BridgeRecords in one pass
+
+    :param data: the configuration text or an iterable of lines
+    :rtype: BridgeRecords
+    :returns: the records of all bridge ports
+    """
+    records = BridgeRecords()
+    intern = sys.intern
+    for line in iter_lines(data):
+        if not line.startswith("configure bridge "):
+            continue
+        tokens = line.split()
+        if len(tokens) < 4 or tokens[2] != "port":
+            for attribute, value in _iter_attributes(tokens, 2):
+                if attribute == "ageing-time":
+                    records.ageing_time = value or None
+            continue
+
+        port = intern(tokens[3])
+        vlan = None
+        start = 4
+        if len(tokens) > 5 and tokens[4] == "vlan-id":
+            vlan = intern(tokens[5])
+            start = 6
+        records.append(port, vlan, None, None)
+        for attribute, value in _iter_attributes(tokens, start):
+            records.append(port, vlan, intern(attribute), value)
+    return records
+
+
+def records_to_config(records):
+    """ Build the bridges config as described by BridgesArgs from records
+
+    Attributes unknown to the argspec are skipped and a negated attribute
+    drops the value, so the default applies.
+
+    :param records: the BridgeRecords
+    :rtype: dict
+    :returns: the bridges config
+    """
+    ports = {}
+    for port, vlan, attribute, value in records:
+        entry = ports.get(port)
+        if entry is None:
+            entry = ports[port] = {"port": port}
+        if vlan is None:
+            target = entry
+            key = PORT_ATTRIBUTES.get(attribute)
+        else:
+            vlans = entry.setdefault("vlan_id", {})
+            target = vlans.get(vlan)
+            if target is None:
+                target = vlans[vlan] = {"id": vlan}
+            key = VLAN_ATTRIBUTES.get(attribute)
+
+        if key is None:
+            continue
+        if value is False and attribute not in FLAG_ATTRIBUTES:
+            target.pop(key, None)
+        else:
+            target[key] = value
+
+    for entry in ports.values():
+        if "vlan_id" in entry:
+            entry["vlan_id"] = list(entry["vlan_id"].values())
+
+    config = {"port": list(ports.values())}
+    if records.ageing_time is not None:
+        config["ageing_time"] = records.ageing_time
+    return config
+
 
 class BridgesFacts(object):
     """ The isam bridges facts class
@@ -41,6 +190,9 @@ class BridgesFacts(object):
     def populate_facts(self, connection, ansible_facts, data=None):
         """ Populate the facts for Bridges network resource
 
+        The flat configuration is tokenized once into BridgeRecords and the
+        facts are built from the records directly.
+
         :param connection: the device connection
         :param ansible_facts: Facts dictionary
         :param data: previously collected conf
@@ -49,64 +201,21 @@ class BridgesFacts(object):
         :returns: facts
         """
         facts = {}
-        objs = []
 
-        # if not debugpy.is_client_connected():
-        #     debugpy.listen(("localhost",3000))
-        #     debugpy.wait_for_client()
-        if not data:
+        if data is None:
             data = connection.get("info configure bridge flat")
-        
-        data = self._flatten_config(data)
 
-        # debugpy.breakpoint()
+        records = tokenize_bridge_config(data)
 
-        # parse native config using the Bridges template
-        bridges_parser = BridgesTemplate(lines=data, module=self._module)
-        parsed = bridges_parser.parse()
-        values = parsed.values()
-        list_parsed = list(parsed)
-        list_valued = list(values)
-        objs = list(bridges_parser.parse().values())
+        bridges_parser = BridgesTemplate(lines=[], module=self._module)
 
         ansible_facts['ansible_network_resources'].pop('bridges', None)
 
-        # debugpy.breakpoint()
+        params = utils.remove_empties(
+            bridges_parser.validate_config(self.argument_spec, {"config": records_to_config(records)}, redact=True)
+        )
 
-        params = utils.remove_empties(bridges_parser.validate_config(self.argument_spec, {"config": list_valued}, redact=True))
-
-        facts['bridges'] = params['config']
+        facts['bridges'] = params.get('config', {})
         ansible_facts['ansible_network_resources'].update(facts)
 
         return ansible_facts
-
-    def _divide_chunks(self, l, n):
-        for i in range(0, len(l), n):
-            yield l[i:i + n]
-
-    def _flatten_config(self, config):
-
-        parser = re.compile(
-                r"""
-                configure\sbridge\s(port\s(?P<id>\S+)\s)?(vlan-id(?P<vlan_id>\d+)\s)?(?P<rest>.*)
-                """
-            )
-        
-        flattened_config = []
-        bridge_string = None        
-        vlan_string = None
-        lines = config.splitlines()
-        for line in lines:  
-        # if line contains bridge port id, store it in bridge_id
-            match = parser.match(line)
-            if match:
-                regDict = match.groupdict()
-                if 'id' in regDict:
-                    bridge_string = "port" + regDict['id']
-                if 'vlan_id' in regDict:
-                    vlan_string = "vlan-id" + regDict['vlan_id']
-                if 'rest' in regDict:
-                    values = match.group("rest").split()
-                    for item,item2 in self._divide_chunks(values,2):
-                        flattened_config.append("configure bridge ".join([bridge_string, vlan_string, item, item2]))
-        return flattened_config
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+"""
+Parallel fact collection across many isam hosts
+
+The collector fans the existing resource facts classes out over a bounded
+thread pool. Device latency dominates a sweep, so running the hosts side by
+side bounds the wall-clock time by the slowest host rather than by the sum
+of all of them.
+"""
+
+# load_inventory_hosts() used to live here
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.connections import (  # noqa: F401
+    load_inventory_hosts,
+)
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.facts import (
+    FACT_RESOURCE_SUBSETS,
+)
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.sweep import (
+    HostSweep,
+    write_json,
+)
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.isam import RESOURCE_SUBTREES
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.utils.utils import (
+    index_config_sections,
+)
+
+
+class FactCollectionError(Exception):
+    pass
+
+
+class _CollectorModule(object):
+    """ The parts of AnsibleModule the facts classes rely on
+    """
+
+    def __init__(self):
+        # the templates only parse configuration the collector retrieved, so
+        # they must not look up a connection of their own
+        self.params = {"state": "parsed"}
+        self.no_log_values = set()
+
+    def fail_json(self, msg, **kwargs):
+        raise FactCollectionError(msg)
+
+
+class FactCollector(object):
+    """ Gather resource facts from many hosts in parallel
+
+    `connection_factory` is called with the inventory name and address of a
+    host and returns a connection exposing `get_config(resources=...)`, e.g.
+    a NetworkCliConnectionFactory. It is called once per task and the
+    returned object is closed afterwards if it has a `close` method.
+
+    At most `max_workers` tasks run at the same time across all hosts and at
+    most `per_host_limit` of them against the same address. With a limit
+    above one the resources of a host are split into that many tasks, each
+    retrieving its subtrees with a single transfer.
+    """
+
+    def __init__(self, connection_factory, resources=None, max_workers=16, per_host_limit=1, output_dir=None):
+        self._sweep = HostSweep(connection_factory, max_workers=max_workers, per_host_limit=per_host_limit)
+        self._resources = sorted(resources or FACT_RESOURCE_SUBSETS)
+        self._per_host_limit = max(1, per_host_limit)
+        self._output_dir = output_dir
+
+    def collect(self, hosts):
+        """ Gather the facts of all hosts
+
+        A failing host does not stop the sweep, its error is returned instead.
+
+        :param hosts: the addresses of the hosts keyed by their inventory name
+        :rtype: tuple
+        :returns: the facts keyed by host and the errors keyed by host
+        """
+        tasks = []
+        for name, address in sorted(hosts.items()):
+            for resources in self._split_resources():
+                tasks.append((name, address, self._fetcher(resources), self._parser(resources)))
+
+        facts = {}
+        errors = {}
+        for name, host_facts, error in self._sweep.run(tasks):
+            if error is None:
+                facts.setdefault(name, {}).update(host_facts)
+            else:
+                errors.setdefault(name, []).append(error)
+
+        for name in errors:
+            facts.pop(name, None)
+        if self._output_dir:
+            for name, host_facts in facts.items():
+                write_json(self._output_dir, "%s.json" % name, host_facts, indent=4, sort_keys=True)
+        return facts, errors
+
+    def _split_resources(self):
+        groups = [self._resources[i::self._per_host_limit] for i in range(self._per_host_limit)]
+        return [group for group in groups if group]
+
+    @staticmethod
+    def _fetcher(resources):
+        return lambda connection: connection.get_config(resources=resources)
+
+    @staticmethod
+    def _parser(resources):
+        def parse(data):
+            sections = index_config_sections(data)
+            module = _CollectorModule()
+            ansible_facts = {"ansible_network_resources": {}}
+            for resource in resources:
+                section = sections.get(RESOURCE_SUBTREES[resource].split()[0], [])
+                FACT_RESOURCE_SUBSETS[resource](module).populate_facts(None, ansible_facts, data=section)
+            return ansible_facts["ansible_network_resources"]
+        return parse
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+"""
+network_cli connections to the hosts of an inventory outside of a playbook
+
+The collectors only need an object exposing the RPCs of the isam cliconf
+plugin, which a network_cli connection opened in this process provides. The
+plugin loaders find the isam plugins through the collection loader, which
+has to be installed before anything of `ansible_collections` is imported,
+scripts/isam_estate.py does so before running the collectors.
+"""
+
+import json
+import os
+import threading
+
+NETWORK_OS = "isam.isam.isam"
+
+
+def load_inventory_hostvars(path):
+    """ Read the variables of every host of a JSON inventory
+
+    :param path: the output of `ansible-inventory --list`
+    :rtype: dict
+    :returns: the variables of every host keyed by its inventory name
+    """
+    with open(path) as inventory_file:
+        return json.load(inventory_file).get("_meta", {}).get("hostvars", {})
+
+
+def load_inventory_hosts(path, role=None):
+    """ Read the hosts of a JSON inventory
+
+    `path` holds the output of `ansible-inventory --list`, e.g. hk.json as
+    generated from tests/netbox_inventory.yaml.
+
+    :param path: the inventory file
+    :param role: only return hosts carrying this NetBox device role
+    :rtype: dict
+    :returns: the address of every host keyed by its inventory name
+    """
+    hosts = {}
+    for name, host_vars in load_inventory_hostvars(path).items():
+        if role and role not in host_vars.get("device_roles", []):
+            continue
+        hosts[name] = host_vars.get("ansible_host") or host_vars.get("primary_ip4") or name
+    return hosts
+
+
+def _connection_loader():
+    """ The connection plugin loader
+    """
+    from ansible.plugins.loader import connection_loader
+    from ansible.utils.collection_loader import AnsibleCollectionConfig
+
+    if AnsibleCollectionConfig.collection_finder is None:
+        raise ValueError(
+            "the ansible collection loader is not installed, call "
+            "ansible.plugins.loader.init_plugin_loader() before importing the collection"
+        )
+    return connection_loader
+
+
+class NetworkCliConnectionFactory(object):
+    """ Opens network_cli connections to the hosts of an inventory
+
+    The factory is the `connection_factory` of FactCollector and
+    FdbCollector. A connection runs in this process with the isam terminal
+    and cliconf plugins, so it exposes the RPCs of the cliconf plugin, e.g.
+    get_config(). Closing a connection handed out by the factory keeps it
+    logged in for the next task against the same host, so a host is logged
+    in to once for every session used at the same time. close() of the
+    factory logs out of all of them.
+
+    The variables of a connection are the ones of network_cli, e.g.
+    `ansible_user` or `ansible_password`, from `variables` and overridden
+    by the ones of the host in `hostvars`.
+
+    The connections are opened and used on the worker threads of the
+    collectors. With the paramiko transport, network_cli waits out
+    `persistent_buffer_read_timeout` after a prompt with SIGALRM, which only
+    works on the main thread, so the factory sets it to 0. A response then
+    ends at its prompt, as with libssh.
+    """
+
+    def __init__(self, variables=None, hostvars=None):
+        self._variables = dict(variables or {})
+        self._hostvars = hostvars or {}
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_inventory(cls, path, variables=None):
+        """ A factory for the hosts of the JSON inventory at `path`
+        """
+        return cls(variables, load_inventory_hostvars(path))
+
+    def __call__(self, name, address):
+        with self._lock:
+            idle = self._idle.get(name)
+            connection = idle.pop() if idle else None
+        if connection is None:
+            connection = self._open(name, address)
+        return _HostConnection(self, name, connection)
+
+    def _open(self, name, address):
+        from ansible.playbook.play_context import PlayContext
+
+        variables = dict(self._variables)
+        variables.update(self._hostvars.get(name, {}))
+        variables["inventory_hostname"] = name
+        variables["ansible_host"] = address
+        variables.setdefault("ansible_network_os", NETWORK_OS)
+        variables["ansible_buffer_read_timeout"] = 0
+
+        play_context = PlayContext()
+        play_context.network_os = variables["ansible_network_os"]
+        play_context.remote_addr = address
+        connection = _connection_loader().get("ansible.netcommon.network_cli", play_context, os.devnull)
+        connection.set_options(var_options=variables)
+        connection._connect()
+        return connection
+
+    def _release(self, name, connection):
+        with self._lock:
+            self._idle.setdefault(name, []).append(connection)
+
+    def close(self):
+        """ Logs out of all hosts
+        """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+
+class _HostConnection(object):
+    """ A connection of NetworkCliConnectionFactory, close() hands it back
+    """
+
+    def __init__(self, factory, name, connection):
+        self._factory = factory
+        self._name = name
+        self._connection = connection
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def close(self):
+        if self._connection is not None:
+            self._factory._release(self._name, self._connection)
+            self._connection = None
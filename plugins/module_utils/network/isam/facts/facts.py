@@ -9,9 +9,15 @@ this file validates each subset of facts and selectively
 calls the appropriate facts gathering function
 """
 
+from ansible.module_utils._text import to_text
+from ansible.module_utils.connection import ConnectionError
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.facts.facts import (
     FactsBase,
 )
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.isam import RESOURCE_SUBTREES
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.utils.utils import (
+    index_config_sections,
+)
 from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.interfaces.interfaces import InterfacesFacts
 from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.bridges.bridges import BridgesFacts
 from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.ethernet_line.ethernet_line import Ethernet_lineFacts
@@ -51,3 +57,44 @@ class Facts(FactsBase):
             self.get_network_legacy_facts(FACT_LEGACY_SUBSETS, legacy_facts_type)
 
         return self.ansible_facts, self._warnings
+
+    def get_network_resources_facts(self, facts_resource_obj_map, resource_facts_type=None, data=None):
+        """ Gather several resources from a single configuration transfer
+
+        The subtrees of all requested resources are retrieved with one
+        `get_config` call, indexed by their top-level `configure <section>`
+        and each facts class is handed its own slice through `data`. A single
+        resource, or configuration passed in by the caller, is left to the
+        facts class as before.
+
+        :param facts_resource_obj_map: The facts classes keyed by resource
+        :param resource_facts_type: List of resource fact types
+        :param data: previously collected conf
+        """
+        if not resource_facts_type:
+            resource_facts_type = self._gather_network_resources
+
+        restorun_subsets = self.gen_runable(
+            resource_facts_type,
+            frozenset(facts_resource_obj_map.keys()),
+            resource_facts=True,
+        )
+        if data is not None or not self._connection or len(restorun_subsets) < 2:
+            return super(Facts, self).get_network_resources_facts(
+                facts_resource_obj_map, resource_facts_type, data
+            )
+
+        self.ansible_facts["ansible_net_gather_network_resources"] = list(restorun_subsets)
+        try:
+            config = self._connection.get_config(resources=sorted(restorun_subsets))
+        except ConnectionError as exc:
+            self._module.fail_json(msg=to_text(exc, errors="surrogate_then_replace"))
+        sections = index_config_sections(config)
+
+        for key in restorun_subsets:
+            section = RESOURCE_SUBTREES[key].split()[0]
+            inst = facts_resource_obj_map[key](self._module)
+            try:
+                inst.populate_facts(self._connection, self.ansible_facts, sections.get(section, []))
+            except Exception as exc:
+                self._module.fail_json(msg=to_text(exc))
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+"""
+Estate wide bridge-port FDB snapshots
+
+The collector pulls `show vlan bridge-port-fdb` from many OLTs in parallel
+and indexes every learned MAC address by the host, bridge port and VLAN it
+was seen on, so "where is this MAC" is a dict or dbm lookup instead of a
+query against every device.
+"""
+
+import dbm
+import json
+import os
+import tempfile
+
+from ansible.module_utils._text import to_bytes, to_text
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.sweep import (
+    HostSweep,
+    write_json,
+)
+
+INDEX_FILE = "mac_index"
+
+
+def normalize_mac(mac):
+    """ The MAC address in lower case with colons, e.g. `00:1b:2c:00:00:01`
+
+    :param mac: the MAC address with `:`, `-` or `.` separators or none
+    :rtype: str
+    """
+    digits = "".join(c for c in mac.lower() if c in "0123456789abcdef")
+    return ":".join(digits[i:i + 2] for i in range(0, len(digits), 2))
+
+
+class FdbTable(object):
+    """ The FDB of one host
+
+    Ports and VLANs repeat for every MAC learned behind them, so the rows
+    refer to them by their position in a shared list instead of holding
+    their own copies.
+    """
+
+    __slots__ = ("ports", "vlans", "rows", "_refs")
+
+    def __init__(self):
+        self.ports = []
+        self.vlans = []
+        self.rows = []
+        self._refs = ({}, {})
+
+    def add(self, port, vlan_id, mac):
+        self.rows.append((
+            self._ref(self.ports, self._refs[0], port),
+            self._ref(self.vlans, self._refs[1], vlan_id),
+            normalize_mac(mac),
+        ))
+
+    @staticmethod
+    def _ref(values, refs, value):
+        ref = refs.get(value)
+        if ref is None:
+            ref = refs[value] = len(values)
+            values.append(value)
+        return ref
+
+    def __iter__(self):
+        for port, vlan, mac in self.rows:
+            yield self.ports[port], self.vlans[vlan], mac
+
+    def __len__(self):
+        return len(self.rows)
+
+    def to_dict(self):
+        return {"ports": self.ports, "vlans": self.vlans, "rows": self.rows}
+
+    @classmethod
+    def from_dict(cls, data):
+        table = cls()
+        table.ports = list(data["ports"])
+        table.vlans = list(data["vlans"])
+        table.rows = [tuple(row) for row in data["rows"]]
+        table._refs = (
+            dict((port, ref) for ref, port in enumerate(table.ports)),
+            dict((vlan, ref) for ref, vlan in enumerate(table.vlans)),
+        )
+        return table
+
+
+class MacIndex(object):
+    """ Maps every MAC address to the (host, port, vlan) it was seen on
+    """
+
+    def __init__(self):
+        self._index = {}
+
+    def add_table(self, host, table):
+        for port, vlan_id, mac in table:
+            self._index.setdefault(mac, []).append((host, port, vlan_id))
+
+    def lookup(self, mac):
+        """ Where `mac` was learned
+
+        :param mac: the MAC address in any common notation
+        :rtype: list
+        :returns: (host, port, vlan_id) tuples
+        """
+        return list(self._index.get(normalize_mac(mac), []))
+
+    def __len__(self):
+        return len(self._index)
+
+    def save(self, path):
+        """ Writes the index to a dbm database at `path`, replacing it
+
+        Lookups in the database read a single key, see DiskMacIndex.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        tmp_dir = tempfile.mkdtemp(dir=directory)
+        tmp_path = os.path.join(tmp_dir, os.path.basename(path))
+        try:
+            with dbm.open(tmp_path, "n") as db:
+                for mac, locations in self._index.items():
+                    db[mac] = json.dumps(locations)
+            for name in os.listdir(tmp_dir):
+                os.rename(os.path.join(tmp_dir, name), os.path.join(directory, name))
+        finally:
+            for name in os.listdir(tmp_dir):
+                os.remove(os.path.join(tmp_dir, name))
+            os.rmdir(tmp_dir)
+
+
+class DiskMacIndex(object):
+    """ Lookups in a MacIndex saved to disk without loading it
+    """
+
+    def __init__(self, path):
+        self._db = dbm.open(path, "r")
+
+    def lookup(self, mac):
+        value = self._db.get(to_bytes(normalize_mac(mac)))
+        if value is None:
+            return []
+        return [tuple(location) for location in json.loads(to_text(value))]
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FdbCollector(object):
+    """ Snapshot the bridge-port FDB of many hosts in parallel
+
+    `connection_factory` is called with the inventory name and address of a
+    host and returns a connection exposing `get_bridge_port_fdb()`, e.g. a
+    NetworkCliConnectionFactory, as for FactCollector. The returned object
+    is closed afterwards if it has a `close` method.
+    """
+
+    def __init__(self, connection_factory, max_workers=16, output_dir=None):
+        self._sweep = HostSweep(connection_factory, max_workers=max_workers)
+        self._output_dir = output_dir
+
+    def collect(self, hosts):
+        """ Snapshot the FDB of all hosts and index their MAC addresses
+
+        A failing host does not stop the sweep, its error is returned instead.
+
+        :param hosts: the addresses of the hosts keyed by their inventory name
+        :rtype: tuple
+        :returns: the FdbTable keyed by host, the MacIndex and the errors keyed by host
+        """
+        tables = {}
+        errors = {}
+        tasks = [
+            (name, address, lambda connection: connection.get_bridge_port_fdb(), self._table)
+            for name, address in sorted(hosts.items())
+        ]
+        for name, table, error in self._sweep.run(tasks):
+            if error is None:
+                tables[name] = table
+            else:
+                errors[name] = error
+
+        index = MacIndex()
+        for name, table in sorted(tables.items()):
+            index.add_table(name, table)
+        if self._output_dir:
+            for name, table in tables.items():
+                write_json(self._output_dir, "%s.fdb.json" % name, table.to_dict())
+            index.save(os.path.join(self._output_dir, INDEX_FILE))
+        return tables, index, errors
+
+    @staticmethod
+    def _table(entries):
+        table = FdbTable()
+        for entry in entries:
+            table.add(entry["port"], entry["vlan_id"], entry["mac"])
+        return table
@@ -27,6 +27,9 @@ from ansible_collections.isam.isam.plugins.module_utils.network.isam.rm_template
 from ansible_collections.isam.isam.plugins.module_utils.network.isam.argspec.interfaces.interfaces import (
     InterfacesArgs,
 )
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.utils.utils import (
+    iter_lines,
+)
 
 class InterfacesFacts(object):
     """ The isam interfaces facts class
@@ -49,12 +52,12 @@ class InterfacesFacts(object):
         facts = {}
         objs = []
            
-        if not data:
+        if data is None:
             data = connection.get("info configure interface port flat")
 
         
         # parse native config using the Interfaces template
-        lines = data.splitlines()
+        lines = iter_lines(data)
         interfaces_parser = InterfacesTemplate(lines=lines, module=self._module)
         parsed = interfaces_parser.parse()
         valued = parsed.values()
@@ -67,7 +70,7 @@ class InterfacesFacts(object):
             interfaces_parser.validate_config(self.argument_spec, {"config": objs}, redact=True)
         )
 
-        facts['interfaces'] = params['config']
+        facts['interfaces'] = params.get('config', [])
         ansible_facts['ansible_network_resources'].update(facts)
 
         return ansible_facts
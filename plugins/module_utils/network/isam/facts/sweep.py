@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+"""
+The thread pool and result files the estate wide collectors share
+"""
+
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible.module_utils._text import to_text
+
+
+class HostSweep(object):
+    """ Runs tasks against many hosts on a bounded thread pool
+
+    A task fetches from its host over a connection of `connection_factory`,
+    called with the inventory name and address of the host, and closes the
+    connection if it has a `close` method before the fetched data is
+    processed, so the next task against the host does not wait for the
+    parsing. At most `max_workers` tasks run at the same time and at most
+    `per_host_limit` of them against the same address.
+    """
+
+    def __init__(self, connection_factory, max_workers=16, per_host_limit=1):
+        self._connection_factory = connection_factory
+        self._max_workers = max_workers
+        self._per_host_limit = max(1, per_host_limit)
+        self._host_locks = {}
+        self._host_locks_lock = threading.Lock()
+
+    def run(self, tasks):
+        """ Runs all tasks
+
+        A failing task does not stop the others, its error is returned
+        instead.
+
+        :param tasks: (name, address, fetch, process) tuples, `fetch` is
+            called with a connection of the host and `process` with what
+            `fetch` returned
+        :rtype: list
+        :returns: (name, result, error) of every task in the order of
+            `tasks`, error is the text of the exception or None
+        """
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            futures = [
+                (name, executor.submit(self._run_task, name, address, fetch, process))
+                for name, address, fetch, process in tasks
+            ]
+            outcomes = []
+            for name, future in futures:
+                try:
+                    outcomes.append((name, future.result(), None))
+                except Exception as exc:
+                    outcomes.append((name, None, to_text(exc, errors="surrogate_then_replace")))
+        finally:
+            executor.shutdown(wait=True)
+        return outcomes
+
+    def _host_lock(self, address):
+        with self._host_locks_lock:
+            if address not in self._host_locks:
+                self._host_locks[address] = threading.BoundedSemaphore(self._per_host_limit)
+            return self._host_locks[address]
+
+    def _run_task(self, name, address, fetch, process):
+        with self._host_lock(address):
+            connection = self._connection_factory(name, address)
+            try:
+                data = fetch(connection)
+            finally:
+                if hasattr(connection, "close"):
+                    connection.close()
+        return process(data)
+
+
+def write_json(directory, filename, data, **kwargs):
+    """ Writes `data` as JSON to `<directory>/<filename>`
+
+    The file is written under a temporary name first, so a reader never
+    sees a partial file.
+
+    :param kwargs: passed on to json.dump()
+    """
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as tmp_file:
+            json.dump(data, tmp_file, **kwargs)
+        os.rename(tmp_path, os.path.join(directory, filename))
+    except Exception:
+        os.remove(tmp_path)
+        raise
@@ -26,6 +26,9 @@ from ansible_collections.isam.isam.plugins.module_utils.network.isam.rm_template
 from ansible_collections.isam.isam.plugins.module_utils.network.isam.argspec.vlans.vlans import (
     VlansArgs,
 )
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.utils.utils import (
+    iter_lines,
+)
 
 class VlansFacts(object):
     """ The isam vlans facts class
@@ -48,11 +51,11 @@ class VlansFacts(object):
         facts = {}
         objs = []
 
-        if not data:
-            data = connection.get("info configure vlan id detail")
+        if data is None:
+            data = connection.get("info configure vlan id flat")
 
         # parse native config using the Vlans template
-        vlans_parser = VlansTemplate(lines=data.splitlines(), module=self._module)
+        vlans_parser = VlansTemplate(lines=iter_lines(data), module=self._module)
         objs = list(vlans_parser.parse().values())
 
         ansible_facts['ansible_network_resources'].pop('vlans', None)
@@ -61,7 +64,7 @@ class VlansFacts(object):
             vlans_parser.validate_config(self.argument_spec, {"config": objs}, redact=True)
         )
 
-        facts['vlans'] = params['config']
+        facts['vlans'] = params.get('config', [])
         ansible_facts['ansible_network_resources'].update(facts)
 
         return ansible_facts
@@ -9,6 +9,17 @@ from ansible.module_utils.connection import Connection, ConnectionError
 
 _DEVICE_CONFIGS = {}
 
+# The `info configure` subtree each resource module gathers its facts from
+RESOURCE_SUBTREES = {
+    "bridges": "bridge",
+    "ethernet_line": "ethernet line",
+    "interfaces": "interface port",
+    "vlans": "vlan id",
+}
+
+# Resources whose parsers read the indented output instead of the flat one
+HIERARCHICAL_RESOURCES = frozenset(["ethernet_line"])
+
 isam_provider_spec = {
     "host": dict(),
     "port": dict(type="int"),
@@ -15,11 +15,11 @@ the given network resource.
 """
 
 import re
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.rm_base.network_template import (
-    NetworkTemplate,
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.utils.network_template import (
+    IsamNetworkTemplate,
 )
 
-class InterfacesTemplate(NetworkTemplate):
+class InterfacesTemplate(IsamNetworkTemplate):
     def __init__(self, lines=None, module=None):
         super(InterfacesTemplate, self).__init__(lines=lines, tmplt=self, module=module)
 
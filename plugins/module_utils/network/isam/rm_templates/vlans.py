@@ -15,399 +15,486 @@ the given network resource.
 """
 
 import re
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.rm_base.network_template import (
-    NetworkTemplate,
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.utils.network_template import (
+    IsamNetworkTemplate,
 )
 
-class VlansTemplate(NetworkTemplate):
+
+def _setval(attribute):
+    """ The command setting `attribute` of a VLAN to the value in `data`
+
+    A flag is negated in place, `configure vlan id 10 no sntp-proxy`, and a
+    value without a value in `data` is removed the same way.
+    """
+    def setval(data):
+        value = data.get(attribute)
+        if value is True:
+            return "configure vlan id %s %s" % (data["id"], attribute)
+        if value is False or value is None:
+            return "configure vlan id %s no %s" % (data["id"], attribute)
+        if attribute == "name":
+            value = '"%s"' % value
+        return "configure vlan id %s %s %s" % (data["id"], attribute, value)
+    return setval
+
+
+class VlansTemplate(IsamNetworkTemplate):
+    """ Parses `info configure vlan id flat`
+
+    A line sets one or more attributes of a VLAN, e.g.
+    `configure vlan id 100 name "hsi" mode residential-bridge`. The
+    attribute parsers take lines setting a single attribute and render the
+    commands of the config class, the `vlan` parser takes the lines setting
+    several.
+    """
+
     def __init__(self, lines=None, module=None):
         super(VlansTemplate, self).__init__(lines=lines, tmplt=self, module=module)
 
     # fmt: off
     PARSERS = [
         {
-            'name': 'id',
-            'getval': re.compile(
-                r'''
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "name",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s((?P<negate_name>no\sname)|name\s(?P<name>"[^"]*"|\S+))
+                \s*$""", re.VERBOSE),
+            "setval": _setval("name"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "name": "{{ name.strip('\"') if name is defined }}",
                 },
             },
-            'shared': True,
         },
         {
-            'name': 'name',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s+(name\s+(?P<name>[a-zA-Z0-9_]*))
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "mode",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s((?P<negate_mode>no\smode)|mode\s(?P<mode>\S+))
+                \s*$""", re.VERBOSE),
+            "setval": _setval("mode"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "mode": "{{ mode if mode is defined }}",
                 },
             },
         },
         {
-            'name': 'mode',
-            'getval': re.compile(
-                r'''
-                (mode\s+(?P<user>(cross-connect|residential-bridge|qos-aware|layer2-terminated|mirror))
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "sntp-proxy",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_sntp_proxy>no\s)?(?P<sntp_proxy_set>sntp-proxy)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("sntp-proxy"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "sntp-proxy": "{{ (negate_sntp_proxy is not defined) if sntp_proxy_set is defined }}",
                 },
             },
         },
         {
-            'name': 'sntp-proxy',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<sntp_proxy>sntp-proxy)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "priority",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s((?P<negate_priority>no\spriority)|priority\s(?P<priority>\d+))
+                \s*$""", re.VERBOSE),
+            "setval": _setval("priority"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "priority": "{{ priority|int if priority is defined }}",
                 },
             },
         },
         {
-            'name': 'priority',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\spriority\s(?P<priority>\d)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "vmac-not-in-opt61",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_vmac_not_in_opt61>no\s)?(?P<vmac_not_in_opt61_set>vmac-not-in-opt61)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("vmac-not-in-opt61"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "vmac-not-in-opt61": "{{ (negate_vmac_not_in_opt61 is not defined) if vmac_not_in_opt61_set is defined }}",
                 },
             },
         },
         {
-            'name': 'vmac-not-in-opt61',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<vmac_not_in_opt61>vmac-not-in-opt61)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "new-broadcast",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s((?P<negate_new_broadcast>no\snew-broadcast)|new-broadcast\s(?P<new_broadcast>\S+))
+                \s*$""", re.VERBOSE),
+            "setval": _setval("new-broadcast"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "new-broadcast": "{{ new_broadcast if new_broadcast is defined }}",
                 },
             },
         },
         {
-            'name': 'new-broadcast',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s+(new-broadcast\s+(?P<new_broadcast>(inherit|disable|enable)))
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "protocol-filter",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s((?P<negate_protocol_filter>no\sprotocol-filter)|protocol-filter\s(?P<protocol_filter>\S+))
+                \s*$""", re.VERBOSE),
+            "setval": _setval("protocol-filter"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "protocol-filter": "{{ protocol_filter if protocol_filter is defined }}",
                 },
             },
         },
         {
-            'name': 'protocol-filter',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s+(protocol-filter\s+(?P<new_broadcast>(pass-all|pass-pppoe|pass-ipoe|pass-pppoe-ipoe|pass-ipv6oe|pass-pppoe-ipv6oe|pass-ipoe-ipv6oe|pass-pppoe-ipoe-ipv6oe)))
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "pppoe-relay-tag",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s((?P<negate_pppoe_relay_tag>no\spppoe-relay-tag)|pppoe-relay-tag\s(?P<pppoe_relay_tag>\S+))
+                \s*$""", re.VERBOSE),
+            "setval": _setval("pppoe-relay-tag"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "pppoe-relay-tag": "{{ pppoe_relay_tag if pppoe_relay_tag is defined }}",
                 },
             },
         },
         {
-            'name': 'pppoe-relay-tag',
-            'getval': re.compile(
-                r'''
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "drly-srv-usr-side",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_drly_srv_usr_side>no\s)?(?P<drly_srv_usr_side_set>drly-srv-usr-side)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("drly-srv-usr-side"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "drly-srv-usr-side": "{{ (negate_drly_srv_usr_side is not defined) if drly_srv_usr_side_set is defined }}",
                 },
             },
         },
         {
-            'name': 'drly-srv-usr-side',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<drly_srv_usr_side>drly-srv-usr-side)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "new-secure-fwd",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s((?P<negate_new_secure_fwd>no\snew-secure-fwd)|new-secure-fwd\s(?P<new_secure_fwd>\S+))
+                \s*$""", re.VERBOSE),
+            "setval": _setval("new-secure-fwd"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "new-secure-fwd": "{{ new_secure_fwd if new_secure_fwd is defined }}",
                 },
             },
         },
         {
-            'name': 'new-secure-fwd',
-            'getval': re.compile(
-                r'''
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "aging-time",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s((?P<negate_aging_time>no\saging-time)|aging-time\s(?P<aging_time>\d+))
+                \s*$""", re.VERBOSE),
+            "setval": _setval("aging-time"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "aging-time": "{{ aging_time|int if aging_time is defined }}",
                 },
             },
         },
         {
-            'name': 'aging-time',
-            'getval': re.compile(
-                r'''
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "l2cp-transparent",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_l2cp_transparent>no\s)?(?P<l2cp_transparent_set>l2cp-transparent)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("l2cp-transparent"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "l2cp-transparent": "{{ (negate_l2cp_transparent is not defined) if l2cp_transparent_set is defined }}",
                 },
             },
         },
         {
-            'name': 'l2cp-transparent',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<l2cp_transparent>l2cp-transparent)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "in-qos-prof-name",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s((?P<negate_in_qos_prof_name>no\sin-qos-prof-name)|in-qos-prof-name\s(?P<in_qos_prof_name>\S+))
+                \s*$""", re.VERBOSE),
+            "setval": _setval("in-qos-prof-name"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "in-qos-prof-name": "{{ in_qos_prof_name if in_qos_prof_name is defined }}",
                 },
             },
         },
         {
-            'name': 'in-qos-prof-name',
-            'getval': re.compile(
-                r'''
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "ipv4-mcast-ctrl",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_ipv4_mcast_ctrl>no\s)?(?P<ipv4_mcast_ctrl_set>ipv4-mcast-ctrl)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("ipv4-mcast-ctrl"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "ipv4-mcast-ctrl": "{{ (negate_ipv4_mcast_ctrl is not defined) if ipv4_mcast_ctrl_set is defined }}",
                 },
             },
         },
         {
-            'name': 'ipv4-mcast-ctrl',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<ipv4_mcast_ctrl>ipv4-mcast-ctrl)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "ipv6-mcast-ctrl",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_ipv6_mcast_ctrl>no\s)?(?P<ipv6_mcast_ctrl_set>ipv6-mcast-ctrl)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("ipv6-mcast-ctrl"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "ipv6-mcast-ctrl": "{{ (negate_ipv6_mcast_ctrl is not defined) if ipv6_mcast_ctrl_set is defined }}",
                 },
             },
         },
         {
-            'name': 'ipv6-mcast-ctrl',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<ipv6_mcast_ctrl>ipv6-mcast-ctrl)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "mac-mcast-ctrl",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_mac_mcast_ctrl>no\s)?(?P<mac_mcast_ctrl_set>mac-mcast-ctrl)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("mac-mcast-ctrl"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "mac-mcast-ctrl": "{{ (negate_mac_mcast_ctrl is not defined) if mac_mcast_ctrl_set is defined }}",
                 },
             },
         },
         {
-            'name': 'mac-mcast-ctrl',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<mac_mcast_ctrl>mac-mcast-ctrl)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "dis-proto-rip",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_dis_proto_rip>no\s)?(?P<dis_proto_rip_set>dis-proto-rip)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("dis-proto-rip"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "dis-proto-rip": "{{ (negate_dis_proto_rip is not defined) if dis_proto_rip_set is defined }}",
                 },
             },
         },
         {
-            'name': 'dis-proto-rip',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<dis_proto_rip>dis-proto-rip)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "proto-ntp",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_proto_ntp>no\s)?(?P<proto_ntp_set>proto-ntp)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("proto-ntp"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "proto-ntp": "{{ (negate_proto_ntp is not defined) if proto_ntp_set is defined }}",
                 },
             },
         },
         {
-            'name': 'proto-ntp',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<proto_ntp>proto-ntp)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "dis-ip-antispoof",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_dis_ip_antispoof>no\s)?(?P<dis_ip_antispoof_set>dis-ip-antispoof)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("dis-ip-antispoof"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "dis-ip-antispoof": "{{ (negate_dis_ip_antispoof is not defined) if dis_ip_antispoof_set is defined }}",
                 },
             },
         },
         {
-            'name': 'dis-ip-antispoof',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<dis_ip_antispoof>dis-ip-antispoof)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "unknown-unicast",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_unknown_unicast>no\s)?(?P<unknown_unicast_set>unknown-unicast)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("unknown-unicast"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "unknown-unicast": "{{ (negate_unknown_unicast is not defined) if unknown_unicast_set is defined }}",
                 },
             },
         },
         {
-            'name': 'unknown-unicast',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<unknown_unicast>unknown-unicast)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "pt2ptgem-flooding",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_pt2ptgem_flooding>no\s)?(?P<pt2ptgem_flooding_set>pt2ptgem-flooding)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("pt2ptgem-flooding"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "pt2ptgem-flooding": "{{ (negate_pt2ptgem_flooding is not defined) if pt2ptgem_flooding_set is defined }}",
                 },
             },
         },
         {
-            'name': 'pt2ptgem-flooding',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<pt2ptgem_flooding>pt2ptgem-flooding)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "mac-movement-ctrl",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_mac_movement_ctrl>no\s)?(?P<mac_movement_ctrl_set>mac-movement-ctrl)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("mac-movement-ctrl"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "mac-movement-ctrl": "{{ (negate_mac_movement_ctrl is not defined) if mac_movement_ctrl_set is defined }}",
                 },
             },
         },
         {
-            'name': 'mac-movement-ctrl',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<mac_movement_ctrl>mac-movement-ctrl)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "cvlan4095passthru",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s((?P<negate_cvlan4095passthru>no\scvlan4095passthru)|cvlan4095passthru\s(?P<cvlan4095passthru>\S+))
+                \s*$""", re.VERBOSE),
+            "setval": _setval("cvlan4095passthru"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "cvlan4095passthru": "{{ cvlan4095passthru if cvlan4095passthru is defined }}",
                 },
             },
         },
         {
-            'name': 'cvlan4095passthru',
-            'getval': re.compile(
-                r'''
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "arp-snooping",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_arp_snooping>no\s)?(?P<arp_snooping_set>arp-snooping)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("arp-snooping"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "arp-snooping": "{{ (negate_arp_snooping is not defined) if arp_snooping_set is defined }}",
                 },
             },
         },
         {
-            'name': 'arp-snooping',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<arp_snooping>arp-snooping)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "arp-polling",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_arp_polling>no\s)?(?P<arp_polling_set>arp-polling)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("arp-polling"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "arp-polling": "{{ (negate_arp_polling is not defined) if arp_polling_set is defined }}",
                 },
             },
         },
         {
-            'name': 'arp-polling',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<arp_polling>arp-polling)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "arp-polling-ip",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s((?P<negate_arp_polling_ip>no\sarp-polling-ip)|arp-polling-ip\s(?P<arp_polling_ip>\S+))
+                \s*$""", re.VERBOSE),
+            "setval": _setval("arp-polling-ip"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "arp-polling-ip": "{{ arp_polling_ip if arp_polling_ip is defined }}",
                 },
             },
         },
         {
-            'name': 'arp-polling-ip',
-            'getval': re.compile(
-                r'''
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "mac-unauth",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)\s(?P<negate_mac_unauth>no\s)?(?P<mac_unauth_set>mac-unauth)
+                \s*$""", re.VERBOSE),
+            "setval": _setval("mac-unauth"),
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "mac-unauth": "{{ (negate_mac_unauth is not defined) if mac_unauth_set is defined }}",
                 },
             },
         },
         {
-            'name': 'mac-unauth',
-            'getval': re.compile(
-                r'''
-                (?P<negate> no)?\s(?P<mac_unauth>mac-unauth)
-                $''', re.VERBOSE,
-            ),
-            'setval': 'configure vlan id {{ id }}',
-            'result': {
-                '{{ name }}': {
-                    'id': '{{ name }}',
+            "name": "vlan",
+            "getval": re.compile(
+                r"""
+                ^configure\svlan\sid\s(?P<id>\d+)
+                (?=(?:.*?\sname\s(?P<name>"[^"]*"|\S+))?)
+                (?=(?:.*?\smode\s(?P<mode>\S+))?)
+                (?=(?:.*?\s(?P<negate_sntp_proxy>no\s)?(?P<sntp_proxy_set>sntp-proxy)(?:\s|$))?)
+                (?=(?:.*?\spriority\s(?P<priority>\d+))?)
+                (?=(?:.*?\s(?P<negate_vmac_not_in_opt61>no\s)?(?P<vmac_not_in_opt61_set>vmac-not-in-opt61)(?:\s|$))?)
+                (?=(?:.*?\snew-broadcast\s(?P<new_broadcast>\S+))?)
+                (?=(?:.*?\sprotocol-filter\s(?P<protocol_filter>\S+))?)
+                (?=(?:.*?\spppoe-relay-tag\s(?P<pppoe_relay_tag>\S+))?)
+                (?=(?:.*?\s(?P<negate_drly_srv_usr_side>no\s)?(?P<drly_srv_usr_side_set>drly-srv-usr-side)(?:\s|$))?)
+                (?=(?:.*?\snew-secure-fwd\s(?P<new_secure_fwd>\S+))?)
+                (?=(?:.*?\saging-time\s(?P<aging_time>\d+))?)
+                (?=(?:.*?\s(?P<negate_l2cp_transparent>no\s)?(?P<l2cp_transparent_set>l2cp-transparent)(?:\s|$))?)
+                (?=(?:.*?\sin-qos-prof-name\s(?P<in_qos_prof_name>\S+))?)
+                (?=(?:.*?\s(?P<negate_ipv4_mcast_ctrl>no\s)?(?P<ipv4_mcast_ctrl_set>ipv4-mcast-ctrl)(?:\s|$))?)
+                (?=(?:.*?\s(?P<negate_ipv6_mcast_ctrl>no\s)?(?P<ipv6_mcast_ctrl_set>ipv6-mcast-ctrl)(?:\s|$))?)
+                (?=(?:.*?\s(?P<negate_mac_mcast_ctrl>no\s)?(?P<mac_mcast_ctrl_set>mac-mcast-ctrl)(?:\s|$))?)
+                (?=(?:.*?\s(?P<negate_dis_proto_rip>no\s)?(?P<dis_proto_rip_set>dis-proto-rip)(?:\s|$))?)
+                (?=(?:.*?\s(?P<negate_proto_ntp>no\s)?(?P<proto_ntp_set>proto-ntp)(?:\s|$))?)
+                (?=(?:.*?\s(?P<negate_dis_ip_antispoof>no\s)?(?P<dis_ip_antispoof_set>dis-ip-antispoof)(?:\s|$))?)
+                (?=(?:.*?\s(?P<negate_unknown_unicast>no\s)?(?P<unknown_unicast_set>unknown-unicast)(?:\s|$))?)
+                (?=(?:.*?\s(?P<negate_pt2ptgem_flooding>no\s)?(?P<pt2ptgem_flooding_set>pt2ptgem-flooding)(?:\s|$))?)
+                (?=(?:.*?\s(?P<negate_mac_movement_ctrl>no\s)?(?P<mac_movement_ctrl_set>mac-movement-ctrl)(?:\s|$))?)
+                (?=(?:.*?\scvlan4095passthru\s(?P<cvlan4095passthru>\S+))?)
+                (?=(?:.*?\s(?P<negate_arp_snooping>no\s)?(?P<arp_snooping_set>arp-snooping)(?:\s|$))?)
+                (?=(?:.*?\s(?P<negate_arp_polling>no\s)?(?P<arp_polling_set>arp-polling)(?:\s|$))?)
+                (?=(?:.*?\sarp-polling-ip\s(?P<arp_polling_ip>\S+))?)
+                (?=(?:.*?\s(?P<negate_mac_unauth>no\s)?(?P<mac_unauth_set>mac-unauth)(?:\s|$))?)
+                (\s|$)""", re.VERBOSE),
+            "setval": "",
+            "result": {
+                "{{ id }}": {
+                    "id": "{{ id }}",
+                    "name": "{{ name.strip('\"') if name is defined }}",
+                    "mode": "{{ mode if mode is defined }}",
+                    "sntp-proxy": "{{ (negate_sntp_proxy is not defined) if sntp_proxy_set is defined }}",
+                    "priority": "{{ priority|int if priority is defined }}",
+                    "vmac-not-in-opt61": "{{ (negate_vmac_not_in_opt61 is not defined) if vmac_not_in_opt61_set is defined }}",
+                    "new-broadcast": "{{ new_broadcast if new_broadcast is defined }}",
+                    "protocol-filter": "{{ protocol_filter if protocol_filter is defined }}",
+                    "pppoe-relay-tag": "{{ pppoe_relay_tag if pppoe_relay_tag is defined }}",
+                    "drly-srv-usr-side": "{{ (negate_drly_srv_usr_side is not defined) if drly_srv_usr_side_set is defined }}",
+                    "new-secure-fwd": "{{ new_secure_fwd if new_secure_fwd is defined }}",
+                    "aging-time": "{{ aging_time|int if aging_time is defined }}",
+                    "l2cp-transparent": "{{ (negate_l2cp_transparent is not defined) if l2cp_transparent_set is defined }}",
+                    "in-qos-prof-name": "{{ in_qos_prof_name if in_qos_prof_name is defined }}",
+                    "ipv4-mcast-ctrl": "{{ (negate_ipv4_mcast_ctrl is not defined) if ipv4_mcast_ctrl_set is defined }}",
+                    "ipv6-mcast-ctrl": "{{ (negate_ipv6_mcast_ctrl is not defined) if ipv6_mcast_ctrl_set is defined }}",
+                    "mac-mcast-ctrl": "{{ (negate_mac_mcast_ctrl is not defined) if mac_mcast_ctrl_set is defined }}",
+                    "dis-proto-rip": "{{ (negate_dis_proto_rip is not defined) if dis_proto_rip_set is defined }}",
+                    "proto-ntp": "{{ (negate_proto_ntp is not defined) if proto_ntp_set is defined }}",
+                    "dis-ip-antispoof": "{{ (negate_dis_ip_antispoof is not defined) if dis_ip_antispoof_set is defined }}",
+                    "unknown-unicast": "{{ (negate_unknown_unicast is not defined) if unknown_unicast_set is defined }}",
+                    "pt2ptgem-flooding": "{{ (negate_pt2ptgem_flooding is not defined) if pt2ptgem_flooding_set is defined }}",
+                    "mac-movement-ctrl": "{{ (negate_mac_movement_ctrl is not defined) if mac_movement_ctrl_set is defined }}",
+                    "cvlan4095passthru": "{{ cvlan4095passthru if cvlan4095passthru is defined }}",
+                    "arp-snooping": "{{ (negate_arp_snooping is not defined) if arp_snooping_set is defined }}",
+                    "arp-polling": "{{ (negate_arp_polling is not defined) if arp_polling_set is defined }}",
+                    "arp-polling-ip": "{{ arp_polling_ip if arp_polling_ip is defined }}",
+                    "mac-unauth": "{{ (negate_mac_unauth is not defined) if mac_unauth_set is defined }}",
                 },
             },
         },
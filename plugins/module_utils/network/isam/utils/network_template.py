@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+"""
+The base class of the isam parser templates
+
+`NetworkTemplate.parse()` tries every `getval` regex of a template against
+every line. Most of them can only match lines starting with a fixed
+sequence of keywords, e.g. `configure bridge port <id> vlan-id`, so the
+templates here route each line by its leading tokens to the few parsers
+that are able to match it and only try those, in PARSERS order.
+"""
+
+import ast
+import re
+
+from copy import deepcopy
+from itertools import chain
+
+from ansible.module_utils.common._collections_compat import Mapping
+
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.rm_base.network_template import (
+    NetworkTemplate,
+)
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
+    Template,
+    dict_merge,
+    sort_list,
+)
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+try:
+    from jinja2.exceptions import UndefinedError
+except ImportError:
+    pass
+
+
+# Stands for a token whose text is not known in advance, e.g. a port id
+ANY_TOKEN = "*"
+
+# Alternatives followed per regex before it is treated as matching anything
+_MAX_PREFIXES = 32
+
+# Leading tokens looked up are cached per template, up to this many keys
+_MAX_CACHED_KEYS = 10000
+
+# Partial token whose text is not known
+_WILD = object()
+
+
+def _set_kind(items):
+    """ Whether a character class only matches whitespace ("sep"), never
+    matches whitespace ("tok") or both (None)
+    """
+    negate = False
+    chars = []
+    categories = set()
+    for op, av in items:
+        if op == sre_parse.NEGATE:
+            negate = True
+        elif op == sre_parse.LITERAL:
+            chars.append(chr(av))
+        elif op == sre_parse.RANGE:
+            if av[1] - av[0] > 256:
+                return None
+            chars.extend(chr(c) for c in range(av[0], av[1] + 1))
+        elif op == sre_parse.CATEGORY:
+            categories.add(av)
+        else:
+            return None
+
+    if negate:
+        # only [^\s...] is known to never match whitespace
+        if sre_parse.CATEGORY_SPACE in categories:
+            return "tok"
+        return None
+    if not categories - set([sre_parse.CATEGORY_SPACE]) and all(c.isspace() for c in chars):
+        return "sep" if categories or chars else None
+    non_space = set([sre_parse.CATEGORY_NOT_SPACE, sre_parse.CATEGORY_DIGIT, sre_parse.CATEGORY_WORD])
+    if categories <= non_space and not any(c.isspace() for c in chars):
+        return "tok"
+    return None
+
+
+def _item_kind(op, av):
+    """ Whether a regex item consumes only whitespace ("sep"), only
+    non-whitespace ("tok") or either (None)
+    """
+    if op == sre_parse.LITERAL:
+        return "sep" if chr(av).isspace() else "tok"
+    if op == sre_parse.IN:
+        return _set_kind(av)
+    if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+        return _seq_kind(av[2]) if av[0] > 0 else None
+    if op == sre_parse.SUBPATTERN and not av[1] and not av[2]:
+        return _seq_kind(av[3])
+    return None
+
+
+def _seq_kind(items):
+    kinds = set(_item_kind(op, av) for op, av in items)
+    return kinds.pop() if len(kinds) == 1 else None
+
+
+def _walk(items, states, done):
+    """ Advance the (tokens, partial token) states over the regex items
+
+    States that reach an item whose effect on the tokens is unknown are
+    moved to `done` with the tokens completed so far.
+    """
+    for op, av in items:
+        if not states:
+            break
+        if op == sre_parse.AT and av == sre_parse.AT_BEGINNING and all(
+            not tokens and buf == "" for tokens, buf in states
+        ):
+            continue
+        if op == sre_parse.SUBPATTERN and not av[1] and not av[2]:
+            states = _walk(av[3], states, done)
+            continue
+        if op == sre_parse.BRANCH:
+            branched = []
+            for alternative in av[1]:
+                branched.extend(_walk(alternative, states, done))
+            states = list(dict.fromkeys(branched))
+            if len(states) > _MAX_PREFIXES:
+                done.extend(states)
+                states = []
+            continue
+
+        kind = _item_kind(op, av)
+        if kind == "sep":
+            states = [
+                (tokens + ((ANY_TOKEN if buf is _WILD else buf),), "") if buf != "" else (tokens, buf)
+                for tokens, buf in states
+            ]
+        elif kind == "tok" and op == sre_parse.LITERAL:
+            states = [(tokens, _WILD if buf is _WILD else buf + chr(av)) for tokens, buf in states]
+        elif kind == "tok":
+            states = [(tokens, _WILD) for tokens, buf in states]
+        else:
+            done.extend(states)
+            states = []
+    return states
+
+
+def token_prefixes(regex):
+    """ The leading tokens a line has to start with for `regex` to match it
+
+    Tokens are whitespace delimited as by `str.split()`, ANY_TOKEN stands
+    for a token of any text. An empty prefix means the regex may match any
+    line.
+
+    :param regex: the compiled `getval` regex
+    :rtype: set
+    :returns: the token tuples, one per alternative of the regex
+    """
+    if regex.flags & re.IGNORECASE:
+        return set([()])
+    try:
+        parsed = sre_parse.parse(regex.pattern, regex.flags)
+    except Exception:
+        return set([()])
+
+    done = []
+    done.extend(_walk(list(parsed), [((), "")], done))
+    prefixes = set()
+    for tokens, _buf in done:
+        while tokens and tokens[-1] == ANY_TOKEN:
+            tokens = tokens[:-1]
+        prefixes.add(tokens)
+    return prefixes
+
+
+class ParserDispatcher(object):
+    """ Routes lines to the parsers able to match them
+
+    The token prefixes of all parsers are kept in a trie. A line walks the
+    trie along its own leading tokens, following the ANY_TOKEN branches as
+    well, and every parser found on the way is a candidate. Parsers without
+    a usable prefix sit at the root and are candidates for every line.
+    """
+
+    _cache = {}
+    _source = None
+
+    def __init__(self, parsers):
+        self._parsers = [(parser, re.compile(parser["getval"])) for parser in parsers]
+        self._trie = ({}, [])
+        self._depth = 0
+        for index, (_parser, regex) in enumerate(self._parsers):
+            for prefix in token_prefixes(regex):
+                node = self._trie
+                for token in prefix:
+                    node = node[0].setdefault(token, ({}, []))
+                node[1].append(index)
+                self._depth = max(self._depth, len(prefix))
+        self._candidates = {}
+
+    @classmethod
+    def for_template(cls, tmplt):
+        """ Returns the dispatcher of a template, built once per class
+
+        :param tmplt: the template instance
+        :rtype: ParserDispatcher
+        """
+        dispatcher = cls._cache.get(type(tmplt))
+        if dispatcher is None or dispatcher._source is not tmplt.PARSERS:
+            dispatcher = cls(tmplt.PARSERS)
+            dispatcher._source = tmplt.PARSERS
+            cls._cache[type(tmplt)] = dispatcher
+        return dispatcher
+
+    def candidates(self, line):
+        """ The parsers that may match `line`, in PARSERS order
+
+        :param line: the configuration line
+        :rtype: list
+        :returns: (parser, compiled regex) tuples
+        """
+        key = tuple(line.split(None, self._depth)[:self._depth])
+        candidates = self._candidates.get(key)
+        if candidates is None:
+            found = []
+            nodes = [self._trie]
+            for token in key:
+                found.extend(index for node in nodes for index in node[1])
+                nodes = [
+                    child
+                    for node in nodes
+                    for child in (node[0].get(token), node[0].get(ANY_TOKEN))
+                    if child is not None
+                ]
+                if not nodes:
+                    break
+            found.extend(index for node in nodes for index in node[1])
+            candidates = [self._parsers[index] for index in sorted(set(found))]
+            if len(self._candidates) >= _MAX_CACHED_KEYS:
+                self._candidates.clear()
+            self._candidates[key] = candidates
+        return candidates
+
+
+class CachedTemplate(Template):
+    """ Template compiling every template string only once
+
+    The result templates of the parsers are rendered for every parsed line
+    and jinja2 compiling them over and over again takes most of the time.
+    """
+
+    _compiled = {}
+
+    def __call__(self, value, variables=None, fail_on_undefined=True):
+        variables = variables or {}
+
+        if not self.contains_vars(value):
+            return value
+
+        compiled = self._compiled.get(value)
+        if compiled is None:
+            compiled = self._compiled[value] = self.env.from_string(value)
+        try:
+            value = compiled.render(variables)
+        except UndefinedError:
+            if not fail_on_undefined:
+                return None
+            raise
+
+        if value:
+            try:
+                return ast.literal_eval(value)
+            except Exception:
+                return str(value)
+        else:
+            return None
+
+
+def merge_into(base, other):
+    """ In place variant of `dict_merge(base, other)`
+
+    `dict_merge` deep copies `base` on every call, which makes merging the
+    result of every parsed line into the facts quadratic in the number of
+    lines. This one updates `base` with the same rules instead.
+
+    :param base: dict object to update, it must not be shared
+    :param other: dict object to combine with base
+    :returns: base
+    """
+    for key, item in other.items():
+        if key not in base:
+            base[key] = item
+            continue
+        value = base[key]
+        if item is None:
+            base[key] = item
+        elif isinstance(value, dict):
+            if isinstance(item, Mapping):
+                merge_into(value, item)
+            else:
+                base[key] = item
+        elif isinstance(value, list):
+            try:
+                base[key] = list(set(chain(value, item)))
+            except TypeError:
+                value.extend([i for i in item if i not in value])
+        elif sort_list(value) != sort_list(item):
+            base[key] = item
+    return base
+
+
+class IsamNetworkTemplate(NetworkTemplate):
+    """ NetworkTemplate trying only the parsers a line can match
+    """
+
+    def __init__(self, lines=None, tmplt=None, prefix=None, module=None):
+        super(IsamNetworkTemplate, self).__init__(lines=lines, tmplt=tmplt, prefix=prefix, module=module)
+        self._template = CachedTemplate()
+
+    def parse(self):
+        """ Same as NetworkTemplate.parse(), but every line is only matched
+        against the candidates of the ParserDispatcher and merged into the
+        result in place
+        """
+        result = {}
+        shared = {}
+        dispatcher = ParserDispatcher.for_template(self._tmplt)
+        for line in self._lines:
+            for parser, regex in dispatcher.candidates(line):
+                cap = regex.match(line)
+                if cap:
+                    capdict = cap.groupdict()
+                    capdict = dict((k, v) for k, v in capdict.items() if v is not None)
+                    if parser.get("shared"):
+                        shared = capdict
+                    vals = dict_merge(capdict, shared)
+                    res = self._deepformat(deepcopy(parser["result"]), vals)
+                    merge_into(result, res)
+                    break
+        return result
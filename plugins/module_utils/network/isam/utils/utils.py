@@ -4,3 +4,196 @@
 # (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
 # utils
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import json
+
+from ansible.module_utils.six import iteritems, string_types
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
+    dict_merge,
+)
+
+
+def iter_lines(data):
+    """Lazily yield the lines of a device response
+
+    `data` is either the complete response as a string or an iterable
+    that already yields single lines (e.g. a generator fed by a streamed
+    transfer). A string is walked with `str.find` so that no intermediate
+    list of lines is ever built.
+
+    :param data: the response text or an iterable of lines
+    :rtype: generator
+    :returns: the lines without their line terminators
+    """
+    if not data:
+        return
+    if not isinstance(data, string_types):
+        for line in data:
+            yield line.rstrip("\r\n")
+        return
+    start = 0
+    end = data.find("\n")
+    while end != -1:
+        yield data[start:end].rstrip("\r")
+        start = end + 1
+        end = data.find("\n", start)
+    if start < len(data):
+        yield data[start:].rstrip("\r")
+
+
+def iter_chunk_lines(chunks):
+    """Reassemble complete lines from arbitrarily sized chunks
+
+    Only the current partial line is buffered, so memory use is bounded by
+    the longest line rather than by the size of the whole transfer.
+
+    :param chunks: an iterable of text chunks as received from the channel
+    :rtype: generator
+    :returns: the lines without their line terminators
+    """
+    pending = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        pending += chunk
+        start = 0
+        end = pending.find("\n")
+        while end != -1:
+            yield pending[start:end].rstrip("\r")
+            start = end + 1
+            end = pending.find("\n", start)
+        pending = pending[start:]
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def index_config_sections(data):
+    """Index configuration lines by their top-level `configure <section>`
+
+    Flat lines each name their section (`configure bridge port ...`), while
+    in the indented output a `configure <section>` line opens a block that
+    lasts until the next one. Lines ahead of the first section are dropped.
+
+    :param data: the configuration text or an iterable of lines
+    :rtype: dict
+    :returns: the lines of every section, keyed by the section name
+    """
+    sections = {}
+    current = None
+    for line in iter_lines(data):
+        tokens = line.split(None, 2) if line.startswith("configure ") else ()
+        if len(tokens) > 1:
+            current = sections.setdefault(tokens[1], [])
+        if current is not None:
+            current.append(line)
+    return sections
+
+
+def flatten_config(data):
+    """Flatten the indented `info configure` output into flat lines
+
+    The first `configure <section>` line is the root and every indented
+    line, as well as every line at the root's indentation, is nested below
+    the line it follows; an `exit` at a smaller indentation closes one
+    level. Each leaf is returned with the path leading to it, e.g.
+    `configure ethernet line 1/1/8/1 mau 1 type 1000basebx10d`.
+
+    The path is kept on a stack, so the lines are converted in one pass
+    and in linear time. A further `configure ...` line at column 0 starts a
+    new root, so flat lines and several sections pass through unchanged.
+
+    :param data: the configuration text or an iterable of lines
+    :rtype: generator
+    :returns: the flat lines in the order of the configuration
+    """
+    parents = None
+    prev = None
+    last_spaces = 0
+    for line in iter_lines(data):
+        if line.startswith("echo") or line.startswith("#") or not line.strip():
+            continue
+
+        spaces = len(line) - len(line.lstrip(" "))
+        name = line.split("#", 1)[0].strip()
+
+        if prev is None or (spaces == 0 and line.startswith("configure ")):
+            if prev is not None:
+                yield " ".join(prev)
+            # a root without children is a leaf of its own
+            parents = prev = [name]
+        elif name == "exit":
+            if spaces >= last_spaces:
+                continue
+            if len(parents) > 1:
+                parents = parents[:-1]
+        elif spaces > last_spaces:
+            parents = prev
+            prev = prev + [name]
+        else:
+            if prev is not parents:
+                yield " ".join(prev)
+            prev = parents + [name]
+        last_spaces = spaces
+
+    if prev is not None:
+        yield " ".join(prev)
+
+
+def fingerprint(entry):
+    """Stable digest of a resource entry
+
+    Equal entries have equal fingerprints regardless of the order of their
+    keys, so an entry of `want` whose fingerprint matches the one of `have`
+    needs no commands.
+
+    :param entry: the entry of a resource, e.g. one bridge port
+    :rtype: str
+    :returns: the hex digest of the entry
+    """
+    serialized = json.dumps(entry, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+
+def diff_entries(wantd, haved, state):
+    """Yield the entries of a resource that need commands
+
+    Both dicts hold the entries keyed by their resource key, e.g. the port
+    or the if_index. Entries whose fingerprints match are skipped without
+    walking them, so `compare()` only runs on the entries that differ and a
+    run over thousands of ports scales with the number of changed ports.
+    With `merged` an entry of `want` is merged onto its `have` entry first.
+
+    :param wantd: the wanted entries keyed by resource key
+    :param haved: the entries on the device keyed by resource key
+    :param state: the state of the module
+    :rtype: generator
+    :returns: (want, have) tuples in the order `generate_commands` compares them
+    """
+    if state == "deleted":
+        for key, have in iteritems(haved):
+            if key in wantd or not wantd:
+                yield {}, have
+        return
+
+    # remove superfluous config for overridden
+    if state == "overridden":
+        for key, have in iteritems(haved):
+            if key not in wantd:
+                yield {}, have
+
+    for key, want in iteritems(wantd):
+        have = haved.get(key, {})
+        if have:
+            have_print = fingerprint(have)
+            if fingerprint(want) == have_print:
+                continue
+            if state == "merged":
+                want = dict_merge(have, want)
+                if fingerprint(want) == have_print:
+                    continue
+        yield want, have
@@ -191,44 +191,42 @@ options:
                 - 'the qos profile'
                 default: none
               prior_best_effort:
-                type: boolean
+                type: bool
                 description:
-                - 'optional parameter with default value: "none"'
+                - 'optional parameter'
                 - 'enable best effort priority (value: 0)'
-                default: none
               prior_background:
-                type: boolean
+                type: bool
                 description:
-                - 'optional parameter with default value: "none"'
+                - 'optional parameter'
                 - 'enable background priority (value: 1)'
-                default: none
               prior_spare:
-                type: boolean
+                type: bool
                 description:
                 - 'optional parameter'
                 - 'enable spare priority (value: 2)'
               prior_exc_effort:
-                type: boolean
+                type: bool
                 description:
                 - 'optional parameter'
                 - 'enable excellen effort priority (value: 3)'
               prior_ctrl_load:
-                type: boolean
+                type: bool
                 description:
                 - 'optional parameter'
                 - 'enable controlled load priority (value: 4)'
               prior_less_100ms:
-                type: boolean
+                type: bool
                 description:
                 - 'optional parameter'
                 - 'enable less than 100ms latency and jitter priority (value: 5)'
               prior_less_10ms:
-                type: boolean
+                type: bool
                 description:
                 - 'optional parameter'
                 - 'enable less than 10ms latency and jitter priority (value: 6)'
               prior_nw_ctrl:
-                type: boolean
+                type: bool
                 description:
                 - 'optional parameter'
                 - 'enable network controlled priority (value: 7)'
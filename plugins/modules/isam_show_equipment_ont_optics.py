@@ -0,0 +1,121 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright 2022 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The module file for isam_show_equipment_ont_optics
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: isam_show_equipment_ont_optics
+version_added: 1.0.0
+short_description: 'Shows optical data of ont interfaces.'
+description:
+- 'Collects the optical levels of the ONTs of Nokia ISAM MSAN devices.'
+- 'The C(show equipment ont optics) commands are pipelined in batches and the
+  rows are returned as typed records, so a sweep over thousands of ONTs needs
+  few round trips.'
+author: Jan Kühnemund (@jahknem)
+notes:
+- 'Tested against Nokia ISAM with OS Version R6.2.04m'
+options:
+  ont_idx:
+    description:
+    - The ONT, PON or LT indexes to query, e.g. C(1/1/5/1/3), C(1/1/5/1) or C(1/1/5).
+    - All ONTs of the device are queried if omitted.
+    type: list
+    elements: str
+  split_by_lt:
+    description:
+    - Query every LT on its own instead of the whole device or the given LTs at once.
+    - The LTs are read from C(show equipment slot). This bounds the size of every
+      single response on large OLTs.
+    type: bool
+    default: false
+  batch_size:
+    description:
+    - The number of commands sent in a single write.
+    type: int
+    default: 16
+  output:
+    description:
+    - The output requested from the device.
+    - C(text) parses the table with the TextFSM template for devices without xml output.
+    type: str
+    choices:
+    - xml
+    - text
+    default: xml
+"""
+
+EXAMPLES = """
+- name: Collect the optics of every ONT, one LT at a time
+  isam.isam.isam_show_equipment_ont_optics:
+    split_by_lt: true
+
+- name: Collect the optics of two PONs
+  isam.isam.isam_show_equipment_ont_optics:
+    ont_idx:
+    - 1/1/5/1
+    - 1/1/5/2
+"""
+
+RETURN = """
+onts:
+  description: The optical levels of every ONT, values the ONT did not report are null.
+  returned: always
+  type: list
+  elements: dict
+  sample:
+  - ont_idx: 1/1/5/1/1
+    rx_power: -19.6
+    tx_power: 2.36
+    olt_rx_power: -21.5
+    temperature: 42.0
+    bias_current: 14000.0
+    voltage: 3.28
+"""
+
+from ansible.module_utils._text import to_text
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.connection import ConnectionError
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.argspec.ont_optics.ont_optics import (
+    OntOpticsArgs,
+)
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.isam import (
+    get_connection,
+)
+
+
+def main():
+    """
+    Main entry point for module execution
+
+    :returns: the optics of the ONTs
+    """
+    module = AnsibleModule(argument_spec=OntOpticsArgs.argument_spec,
+                           supports_check_mode=True)
+
+    connection = get_connection(module)
+    try:
+        onts = connection.get_ont_optics(
+            ont_idx=module.params['ont_idx'],
+            split_by_lt=module.params['split_by_lt'],
+            batch_size=module.params['batch_size'],
+            output=module.params['output'],
+        )
+    except ConnectionError as exc:
+        module.fail_json(msg=to_text(exc, errors="surrogate_then_replace"))
+
+    module.exit_json(changed=False, onts=onts)
+
+
+if __name__ == '__main__':
+    main()
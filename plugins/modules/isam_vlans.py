@@ -55,7 +55,7 @@ options:
       vmac-not-in-opt61:
         type: bool
         description: skip vmac translation in dhcp option 61 even when vmac is enabled
-      new-broadcast::
+      new-broadcast:
         type: str
         description: switch downstream broadcast frames (On GPON and L2+ LT boards, broadcast control for S+C L2 Forwarders can only be controlled at S-VLAN level, not individually at S+C-VLAN-port level)
         choices:
@@ -84,8 +84,8 @@ options:
         - false                 ! no pppoe tag
         - configurable          ! circuit-id-pppoe and remote-id-pppoe controlling format
         choices:
-        - true
-        - false
+        - 'true'
+        - 'false'
         - configurable
       drly-srv-usr-side:
         description:
@@ -94,7 +94,6 @@ options:
         - enable                ! enable DHCP(v4/v6) server transparency at the user side when DHCP(v4/v6) relay is enabled.
         - disable               ! disable DHCP(v4/v6) server transparency at the user side when DHCP(v4/v6) relay is enabled.
         type: bool
-        default: disable
       new-secure-fwd:
         description: 
         - enable secure forwarding for the VLAN (On GPON and L2+ LT boards, secure forwarding can only be controlled at S-VLAN level, not individually at S+C-VLAN-port level)
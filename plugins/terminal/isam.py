@@ -27,24 +27,68 @@ from ansible.plugins.terminal import TerminalBase
 from ansible.errors import AnsibleConnectionFailure
 
 
+# network_cli matches the prompt and error patterns against its receive
+# buffer after every read. Only this many bytes at the end of the buffer are
+# searched for the prompt, which is the last thing the device sends.
+TAIL_WINDOW = 4096
+
+# All error markers of the ISAM CLI in one alternation, so the response is
+# scanned once. `\s\^` finds the same lines as `\s+\^` without rescanning
+# every blank of a padded table.
+TERMINAL_STDERR_RE = rb"\s\^|invalid token|Error :|command is not complete"
+
+
+class TailWindowRegex(object):
+    """A compiled regex that only searches the part of a buffer not seen yet
+
+    network_cli searches the whole response buffer after every read, which
+    costs more with every chunk of a large transfer. With `incremental` set
+    the search starts `window` bytes before the end of the buffer searched
+    last, as long as the buffer still starts with the same bytes, so every
+    byte is searched about once. reset() forgets that buffer, for a response
+    that may start like the one before. Without `incremental` only the last
+    `window` bytes are searched, which is where the prompt has to be. The
+    other methods and attributes are those of the compiled regex.
+    """
+
+    def __init__(self, pattern, flags=0, window=TAIL_WINDOW, incremental=False):
+        self._regex = re.compile(pattern, flags)
+        self._window = window
+        self._incremental = incremental
+        self._seen = 0
+        self._head = b""
+
+    def __getattr__(self, name):
+        return getattr(self._regex, name)
+
+    def reset(self):
+        """Searches the next buffer from its start"""
+        self._seen = 0
+        self._head = b""
+
+    def search(self, data, pos=0):
+        if not self._incremental:
+            return self._regex.search(data, max(pos, len(data) - self._window))
+        start = pos
+        if self._seen and len(data) >= self._seen and data.startswith(self._head):
+            # an error split by the last read is still found in the overlap
+            start = max(pos, self._seen - self._window)
+        self._seen = len(data)
+        self._head = data[:self._window]
+        return self._regex.search(data, start)
+
+
+# The prompt is the host name, optionally behind a user or session prefix
+# such as `typ:isadmin`, followed by `>`. It has to start a line and end the
+# buffer, so output such as xml tags (`<runtime-data>`) does not pass for a
+# prompt.
+TERMINAL_PROMPT_HOST_RE = rb"(?<![^\r\n])[^\s<>#$]*[\w-]+>"
+
 
 class TerminalModule(TerminalBase):
-    # This is the prompt that I use on my machines. You should modify this to
-    # match the devices you are using.
     terminal_stdout_re = [
-        re.compile(rb"[\w-]+>.*#"),
-        re.compile(rb"[\w-]+>.*$"),
-    ]
-
-    # This list is the only way that network_cli has to know that something
-    # has gone wrong. Without this list, it will assume that every command
-    # it issues is a success. In this instance, my prompt changes to a ! when
-    # the exit code is non-zero, so I can use that.
-    terminal_stderr_re = [
-        re.compile(rb"\s+\^"),
-        re.compile(rb"invalid token.*"),
-        re.compile(rb"Error :.*"),
-        re.compile(rb"command is not complete.*"),
+        TailWindowRegex(TERMINAL_PROMPT_HOST_RE + rb"[^\n]*#\s*$"),
+        TailWindowRegex(TERMINAL_PROMPT_HOST_RE + rb"[^\n]*$"),
     ]
 
     # My terminal uses a lot of ANSI codes. You almost certainly don't need all
@@ -67,7 +111,69 @@ class TerminalModule(TerminalBase):
         re.compile(rb"\x1b(=|>)"),
     ]
 
+    # Commands every new CLI session runs before the first task. Batch mode
+    # turns off paging (`--More--`) and confirmation prompts.
+    session_commands = [
+        "environment mode batch",
+        "environment inhibit-alarms",
+    ]
+
+    # Size of the pty, so that neither long command lines nor wide tables
+    # are wrapped by the terminal
+    terminal_width = 1024
+    terminal_height = 1024
+
+    def __init__(self, *args, **kwargs):
+        super(TerminalModule, self).__init__(*args, **kwargs)
+        self._terminal_stderr_re = [
+            TailWindowRegex(TERMINAL_STDERR_RE, incremental=True),
+        ]
+
+    @property
+    def terminal_stderr_re(self):
+        # This list is the only way that network_cli has to know that
+        # something has gone wrong. Without this list, it will assume that
+        # every command it issues is a success. network_cli fetches it at the
+        # start of every response, so the error search of every command
+        # starts from the first byte of its response.
+        for regex in self._terminal_stderr_re:
+            regex.reset()
+        return self._terminal_stderr_re
+
     def on_open_shell(self):
-        self._exec_cli_command("environment mode batch")
-        self._exec_cli_command('environment inhibit-alarms')
-        self._exec_cli_command('exit')
+        self.setup_session()
+
+    def setup_session(self, shell=None):
+        """Sets up a new CLI session in a single round trip
+
+        The pty is widened so long command lines are not wrapped, then
+        `session_commands`, the `session_commands` option of the cliconf
+        plugin and a final `exit` are sent in one write. Their responses are
+        checked together once the last prompt is back.
+
+        :param shell: the channel of the session, by default the one of the
+            connection. The cliconf plugin passes the sessions of its pool.
+        """
+        if shell is None:
+            shell = self._connection._ssh_shell
+        resize_pty = getattr(shell, "resize_pty", None)
+        if resize_pty is not None:
+            resize_pty(width=self.terminal_width, height=self.terminal_height)
+
+        commands = list(self.session_commands) + self._get_extra_session_commands() + ["exit"]
+        failed = [
+            "%s: %s" % (command, response)
+            for command, (response, error) in zip(
+                commands, self._connection.cliconf._send_batch(commands, shell=shell)
+            )
+            if error
+        ]
+        if failed:
+            raise AnsibleConnectionFailure("unable to set up the CLI session: %s" % "; ".join(failed))
+
+    def _get_extra_session_commands(self):
+        try:
+            commands = self._connection.cliconf.get_option("session_commands")
+        except KeyError:
+            commands = None
+        return [str(command) for command in commands or []]
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2022 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Estate wide collection from the isam hosts of an inventory
+
+    python scripts/isam_estate.py facts -i hk.json --role msan -u admin -k -o facts
+    python scripts/isam_estate.py fdb -i hk.json -u admin -k -o fdb --mac 00:1b:2c:00:00:01
+
+The collection has to be installed in a collections path, e.g. with
+`ansible-galaxy collection install`, the hosts are queried over network_cli
+as in a playbook.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import getpass
+import os
+import sys
+
+from ansible.plugins.loader import init_plugin_loader
+
+
+def connection_factory(args):
+    """ The NetworkCliConnectionFactory for the inventory and login options
+    """
+    from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.connections import (
+        NetworkCliConnectionFactory,
+    )
+
+    variables = {}
+    if args.user:
+        variables["ansible_user"] = args.user
+    if args.port:
+        variables["ansible_port"] = args.port
+    if args.private_key:
+        variables["ansible_private_key_file"] = args.private_key
+    password = getpass.getpass() if args.ask_pass else os.environ.get("ANSIBLE_NET_PASSWORD")
+    if password:
+        variables["ansible_password"] = password
+    return NetworkCliConnectionFactory.from_inventory(args.inventory, variables)
+
+
+def facts(args):
+    """ Gathers the facts of the hosts into a directory
+    """
+    from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.collector import FactCollector
+    from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.connections import (
+        load_inventory_hosts,
+    )
+
+    factory = connection_factory(args)
+    try:
+        collector = FactCollector(factory, resources=args.resources, max_workers=args.max_workers,
+                                  per_host_limit=args.per_host_limit, output_dir=args.output_dir)
+        host_facts, errors = collector.collect(load_inventory_hosts(args.inventory, role=args.role))
+    finally:
+        factory.close()
+
+    for name, host_errors in sorted(errors.items()):
+        for error in host_errors:
+            sys.stderr.write("%s: %s\n" % (name, error))
+    print("facts of %d hosts written to %s, %d hosts failed" % (len(host_facts), args.output_dir, len(errors)))
+    return 1 if errors else 0
+
+
+def fdb(args):
+    """ Snapshots the FDB of the hosts into a directory and looks up MAC
+    addresses in it
+    """
+    from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.connections import (
+        load_inventory_hosts,
+    )
+    from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.fdb import (
+        FdbCollector,
+        normalize_mac,
+    )
+
+    factory = connection_factory(args)
+    try:
+        collector = FdbCollector(factory, max_workers=args.max_workers, output_dir=args.output_dir)
+        tables, index, errors = collector.collect(load_inventory_hosts(args.inventory, role=args.role))
+    finally:
+        factory.close()
+
+    for name, error in sorted(errors.items()):
+        sys.stderr.write("%s: %s\n" % (name, error))
+    print("%d MAC addresses of %d hosts indexed in %s, %d hosts failed"
+          % (len(index), len(tables), args.output_dir, len(errors)))
+    for mac in args.mac:
+        for host, port, vlan_id in index.lookup(mac):
+            print("%s %s %s %s" % (normalize_mac(mac), host, port, vlan_id))
+    return 1 if errors else 0
+
+
+def parse_args(argv):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-i", "--inventory", required=True, help="JSON output of `ansible-inventory --list`")
+    common.add_argument("--role", help="only the hosts with this NetBox device role")
+    common.add_argument("-u", "--user", help="login user of the hosts without ansible_user")
+    common.add_argument("--port", type=int, help="SSH port of the hosts without ansible_port")
+    common.add_argument("--private-key", help="SSH private key file of the hosts without one")
+    common.add_argument("-k", "--ask-pass", action="store_true",
+                        help="ask for the password of the hosts without ansible_password, "
+                             "else it is taken from ANSIBLE_NET_PASSWORD")
+    common.add_argument("--max-workers", type=int, default=16, help="hosts queried at once, default 16")
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    facts_parser = commands.add_parser("facts", parents=[common],
+                                       help="gather isam resource facts of many hosts in parallel")
+    facts_parser.add_argument("--resources", nargs="+",
+                              choices=["bridges", "ethernet_line", "interfaces"])
+    facts_parser.add_argument("--per-host-limit", type=int, default=1, help="sessions per host, default 1")
+    facts_parser.add_argument("-o", "--output-dir", required=True,
+                              help="the facts of a host go to <output-dir>/<host>.json")
+    facts_parser.set_defaults(run=facts)
+
+    fdb_parser = commands.add_parser("fdb", parents=[common],
+                                     help="snapshot the bridge-port FDB of many hosts in parallel")
+    fdb_parser.add_argument("-o", "--output-dir", required=True,
+                            help="the FDB of a host goes to <output-dir>/<host>.fdb.json, "
+                                 "the MAC index to <output-dir>/mac_index")
+    fdb_parser.add_argument("--mac", nargs="+", default=[], help="print where these MAC addresses are learned")
+    fdb_parser.set_defaults(run=fdb)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    # the plugin loaders only find the isam plugins through the collection
+    # loader, so it is installed before the collection is imported
+    init_plugin_loader()
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
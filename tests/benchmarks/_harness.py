@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The command line, result file and regression check the benchmark scripts
+share, the scripts only define their cases
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import gc
+import json
+import platform
+import time
+import tracemalloc
+
+
+def measure(func, repeat):
+    """ Returns the result of the last call, the best wall-clock time and
+    the peak of the memory allocated during one call
+    """
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, best, peak
+
+
+class Benchmark(object):
+    """ A benchmark script
+
+    Every case is a dict of its parameters and measurements. A subclass
+    names the parameters telling the cases apart in `key`, how a case is
+    printed in `label` and the measurements checked against earlier results
+    in `metrics`, then adds its options in add_arguments() and yields its
+    cases from cases().
+    """
+
+    key = ()
+    label = ""
+    metrics = ()
+
+    def __init__(self, doc):
+        self._doc = doc
+
+    def add_arguments(self, parser):
+        """ Adds the options of the script to `parser`
+        """
+
+    def settings(self, args):
+        """ The options recorded with the results besides the cases
+        """
+        return {}
+
+    def cases(self, args):
+        """ Runs and yields the cases
+        """
+        raise NotImplementedError
+
+    def failure(self, case):
+        """ Why a case measured nothing, None if it did
+        """
+        return case.get("error")
+
+    def compare(self, results, baseline, tolerance):
+        """ Lists the cases that got slower or bigger than `tolerance` allows
+        """
+        previous = dict(
+            (tuple(case.get(name) for name in self.key), case) for case in baseline.get("results", [])
+        )
+        regressions = []
+        for case in results["results"]:
+            before = previous.get(tuple(case.get(name) for name in self.key))
+            if not before:
+                continue
+            for metric in self.metrics:
+                if metric in case and before.get(metric) and case[metric] > before[metric] * (1 + tolerance):
+                    regressions.append(
+                        "%s %s: %.4g -> %.4g" % (self.label % case, metric, before[metric], case[metric])
+                    )
+        return regressions
+
+    def main(self, argv=None):
+        """ Runs the script, the exit status is 1 if a case failed or
+        regressed
+        """
+        parser = argparse.ArgumentParser(description=self._doc.strip().splitlines()[0])
+        self.add_arguments(parser)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--output", help="write the results as JSON to this file")
+        parser.add_argument("--compare", help="JSON results of an earlier run to check against")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative increase, default 0.25")
+        args = parser.parse_args(argv)
+
+        results = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        }
+        results.update(self.settings(args))
+        results["results"] = []
+        for case in self.cases(args):
+            results["results"].append(case)
+            print(json.dumps(case, sort_keys=True))
+
+        if args.output:
+            with open(args.output, "w") as output:
+                json.dump(results, output, indent=4, sort_keys=True)
+
+        status = 0
+        for case in results["results"]:
+            reason = self.failure(case)
+            if reason:
+                print("FAILED %s: %s" % (self.label % case, reason))
+                status = 1
+
+        if args.compare:
+            with open(args.compare) as baseline:
+                regressions = self.compare(results, json.load(baseline), args.tolerance)
+            for regression in regressions:
+                print("REGRESSION %s" % regression)
+            if regressions:
+                status = 1
+        return status
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2022 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Facts parsing benchmarks
+
+Times and memory profiles populate_facts() of every resource and the
+generate_commands() of its config class on synthetic OLTs with 1, 4, 8 and
+16 line cards, see synthetic.py. Run it from the root of the collection:
+
+    python tests/benchmarks/bench_facts.py --output results.json
+    python tests/benchmarks/bench_facts.py --compare results.json
+
+The run fails if a case raises or parses no entries. A config class that
+generates no commands, e.g. one without parsers, is recorded with a `note`.
+With --compare it also fails if a case got slower or needs more memory than
+the given earlier results allow.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import importlib
+import os
+import sys
+
+from copy import deepcopy
+
+if __name__ == "__main__":
+    # make the collection importable when run as a script
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), *[os.pardir] * 5)))
+
+from ansible_collections.isam.isam.tests.benchmarks._harness import Benchmark, measure
+from ansible_collections.isam.isam.tests.benchmarks.synthetic import GENERATORS
+
+MODULE_UTILS = "ansible_collections.isam.isam.plugins.module_utils.network.isam"
+
+# resource: (facts class, config class, attribute changed in want)
+RESOURCES = {
+    "bridges": ("BridgesFacts", "Bridges", ("max-unicast-mac", 8)),
+    "ethernet_line": ("Ethernet_lineFacts", "Ethernet_line", ("port_type", "nni")),
+    "interfaces": ("InterfacesFacts", "Interfaces", ("admin-up", False)),
+    "vlans": ("VlansFacts", "Vlans", ("name", "benchmark")),
+}
+
+CARDS = (1, 4, 8, 16)
+
+
+class BenchmarkModule(object):
+    """ The parts of AnsibleModule the facts and config classes rely on
+    """
+
+    def __init__(self, params):
+        self.params = params
+        self.no_log_values = set()
+
+    def fail_json(self, msg, **kwargs):
+        raise RuntimeError(msg)
+
+
+def load_class(kind, resource, name):
+    module = importlib.import_module("%s.%s.%s.%s" % (MODULE_UTILS, kind, resource, resource))
+    return getattr(module, name)
+
+
+def entries(facts):
+    """ The list entries of the facts, the bridges facts keep them under `port`
+    """
+    if isinstance(facts, dict):
+        return facts.get("port", [])
+    return facts
+
+
+def bench_resource(resource, cards, onts_per_pon, repeat):
+    facts_name, config_name, (attribute, value) = RESOURCES[resource]
+    data = GENERATORS[resource](cards, onts_per_pon)
+    case = {
+        "resource": resource,
+        "cards": cards,
+        "lines": data.count("\n") + 1,
+    }
+
+    try:
+        facts_class = load_class("facts", resource, facts_name)
+
+        def gather():
+            ansible_facts = {"ansible_network_resources": {}}
+            facts_class(BenchmarkModule({"state": "parsed"})).populate_facts(None, ansible_facts, data=data)
+            return ansible_facts["ansible_network_resources"].get(resource, [])
+
+        have, case["facts_seconds"], case["facts_peak_bytes"] = measure(gather, repeat)
+        case["entries"] = len(entries(have))
+    except (Exception, SystemExit) as exc:
+        case["error"] = "facts: %s: %s" % (type(exc).__name__, exc)
+        return case
+
+    if not entries(have):
+        return case
+
+    # every other entry differs from the device
+    want = deepcopy(have)
+    for entry in entries(want)[::2]:
+        entry[attribute] = value
+
+    try:
+        config_class = load_class("config", resource, config_name)
+
+        def generate():
+            config = config_class(BenchmarkModule({"state": "rendered", "config": want}))
+            config.state = "overridden"
+            config.have = deepcopy(have)
+            config.generate_commands()
+            return config.commands
+
+        commands, case["commands_seconds"], case["commands_peak_bytes"] = measure(generate, repeat)
+        case["commands"] = len(commands)
+        if not commands:
+            case["note"] = "no commands"
+    except (Exception, SystemExit) as exc:
+        case["error"] = "generate_commands: %s: %s" % (type(exc).__name__, exc)
+    return case
+
+
+class FactsBenchmark(Benchmark):
+    key = ("resource", "cards")
+    label = "%(resource)s/%(cards)d cards"
+    metrics = ("facts_seconds", "facts_peak_bytes", "commands_seconds", "commands_peak_bytes")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--resources", nargs="+", choices=sorted(RESOURCES), default=sorted(RESOURCES))
+        parser.add_argument("--cards", nargs="+", type=int, default=list(CARDS))
+        parser.add_argument("--onts-per-pon", type=int, default=32)
+
+    def settings(self, args):
+        return {"onts_per_pon": args.onts_per_pon}
+
+    def cases(self, args):
+        for resource in args.resources:
+            for cards in args.cards:
+                yield bench_resource(resource, cards, args.onts_per_pon, args.repeat)
+
+    def failure(self, case):
+        if "error" in case:
+            return case["error"]
+        if not case.get("entries"):
+            return "facts: no entries parsed"
+        return None
+
+
+if __name__ == "__main__":
+    sys.exit(FactsBenchmark(__doc__).main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2022 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Receive loop benchmarks
+
+Times the prompt and error detection network_cli runs after every read of
+a response, with the patterns of the terminal plugin and with the plain
+patterns they replaced, and the streaming read loop of the cliconf plugin.
+The response is a synthetic `info configure bridge flat` dump, see
+synthetic.py, received in chunks of `--chunk` bytes. The detection time
+of the last tenth of the chunks against the first tenth shows whether the
+cost per chunk grows with the response. Run it from the root of the
+collection:
+
+    python tests/benchmarks/bench_receive.py --output results.json
+    python tests/benchmarks/bench_receive.py --compare results.json
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import re
+import sys
+import time
+
+if __name__ == "__main__":
+    # make the collection importable when run as a script
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), *[os.pardir] * 5)))
+
+from ansible_collections.isam.isam.plugins.cliconf.isam import Cliconf
+from ansible_collections.isam.isam.plugins.terminal.isam import TerminalModule
+from ansible_collections.isam.isam.tests.benchmarks._harness import Benchmark, measure
+from ansible_collections.isam.isam.tests.benchmarks.synthetic import bridges_config
+
+PROMPT = b"DS-LIN-TEST-01>#"
+COMMAND = b"info configure bridge flat"
+
+# the patterns of the terminal plugin before the tail window
+PLAIN_STDOUT_RE = [re.compile(rb"[\w-]+>.*#"), re.compile(rb"[\w-]+>.*$")]
+PLAIN_STDERR_RE = [
+    re.compile(rb"\s+\^"),
+    re.compile(rb"invalid token.*"),
+    re.compile(rb"Error :.*"),
+    re.compile(rb"command is not complete.*"),
+]
+
+
+class FakeShell(object):
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    def recv(self, size):
+        return next(self._chunks, b"")
+
+    def settimeout(self, timeout):
+        pass
+
+
+class FakeConnection(object):
+    ssh_type = "paramiko"
+
+    def __init__(self, chunks, terminal):
+        self._ssh_shell = FakeShell(chunks)
+        self._terminal = terminal
+
+    def send(self, **kwargs):
+        pass
+
+    def get_option(self, option):
+        return {"host": "olt-1", "persistent_command_timeout": 30}[option]
+
+    def _get_terminal_std_re(self, option):
+        return getattr(self._terminal, option)
+
+    def _strip(self, data):
+        return data
+
+
+def response_chunks(cards, chunk):
+    data = PROMPT + COMMAND + b"\r\n"
+    data += bridges_config(cards).encode().replace(b"\n", b"\r\n") + b"\r\n" + PROMPT
+    return [data[start:start + chunk] for start in range(0, len(data), chunk)]
+
+
+def detect(chunks, stdout_re, stderr_re):
+    """ The detection of network_cli with libssh, which searches the whole
+    response after every read
+
+    :returns: the seconds spent searching after every read
+    """
+    timings = []
+    response = b""
+    clock = time.perf_counter
+    for data in chunks:
+        response += data
+        start = clock()
+        for regex in stderr_re:
+            regex.search(response)
+        for regex in stdout_re:
+            if regex.search(response):
+                break
+        timings.append(clock() - start)
+    return timings
+
+
+def read_until_prompt(chunks):
+    cliconf = Cliconf(FakeConnection(chunks, TerminalModule(None)))
+    # the plugin options are not loaded outside of a connection
+    cliconf.get_option = {}.get
+    return sum(len(chunk) for chunk in cliconf._read_until_prompt([COMMAND.decode()]))
+
+
+def bench_detection(patterns, cards, chunk, repeat):
+    chunks = response_chunks(cards, chunk)
+    case = {"case": "detection-%s" % patterns, "cards": cards, "bytes": sum(len(data) for data in chunks)}
+
+    def run():
+        if patterns == "plain":
+            return detect(chunks, PLAIN_STDOUT_RE, PLAIN_STDERR_RE)
+        terminal = TerminalModule(None)
+        return detect(chunks, terminal.terminal_stdout_re, terminal.terminal_stderr_re)
+
+    timings, _, case["peak_bytes"] = measure(run, repeat)
+    tenth = max(len(timings) // 10, 1)
+    case["seconds"] = sum(timings)
+    case["first_tenth_seconds"] = sum(timings[:tenth])
+    case["last_tenth_seconds"] = sum(timings[-tenth:])
+    return case
+
+
+def bench_read_loop(cards, chunk, repeat):
+    chunks = response_chunks(cards, chunk)
+    case = {"case": "cliconf-read-loop", "cards": cards, "bytes": sum(len(data) for data in chunks)}
+    case["received"], case["seconds"], case["peak_bytes"] = measure(lambda: read_until_prompt(chunks), repeat)
+    return case
+
+
+class ReceiveBenchmark(Benchmark):
+    key = ("case", "cards")
+    label = "%(case)s/%(cards)d cards"
+    metrics = ("seconds", "peak_bytes")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cards", nargs="+", type=int, default=[1, 4, 16])
+        parser.add_argument("--chunk", type=int, default=8192, help="bytes per read, default 8192")
+        parser.add_argument("--patterns", nargs="+", choices=["plain", "tail-window"], default=["plain", "tail-window"])
+
+    def cases(self, args):
+        for cards in args.cards:
+            for patterns in args.patterns:
+                yield bench_detection(patterns, cards, args.chunk, args.repeat)
+            yield bench_read_loop(cards, args.chunk, args.repeat)
+
+
+if __name__ == "__main__":
+    sys.exit(ReceiveBenchmark(__doc__).main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2022 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Show command parsing benchmarks
+
+Times and memory profiles parse_show_output() of every ISAM TextFSM
+template on synthetic tables of 10k rows, see synthetic.py. Run it from
+the root of the collection:
+
+    python tests/benchmarks/bench_show.py --output results.json
+    python tests/benchmarks/bench_show.py --compare results.json
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import sys
+
+if __name__ == "__main__":
+    # make the collection importable when run as a script
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), *[os.pardir] * 5)))
+
+from ansible_collections.isam.isam.plugins.cliconf.utils.parse_output_to_dict import parse_show_output
+from ansible_collections.isam.isam.tests.benchmarks._harness import Benchmark, measure
+from ansible_collections.isam.isam.tests.benchmarks.synthetic import SHOW_GENERATORS
+
+
+def bench_command(command, rows, repeat):
+    data = SHOW_GENERATORS[command](rows)
+    case = {"command": command, "rows": rows}
+    try:
+        parsed, case["seconds"], case["peak_bytes"] = measure(lambda: parse_show_output(command, data), repeat)
+        case["parsed"] = len(parsed)
+    except Exception as exc:
+        case["error"] = "%s: %s" % (type(exc).__name__, exc)
+    return case
+
+
+class ShowBenchmark(Benchmark):
+    key = ("command", "rows")
+    label = "%(command)s/%(rows)d rows"
+    metrics = ("seconds", "peak_bytes")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--commands", nargs="+", choices=sorted(SHOW_GENERATORS), default=sorted(SHOW_GENERATORS))
+        parser.add_argument("--rows", nargs="+", type=int, default=[10000])
+
+    def cases(self, args):
+        for command in args.commands:
+            for rows in args.rows:
+                yield bench_command(command, rows, args.repeat)
+
+    def failure(self, case):
+        if "error" in case:
+            return case["error"]
+        if not case.get("parsed"):
+            return "no rows parsed"
+        return None
+
+
+if __name__ == "__main__":
+    sys.exit(ShowBenchmark(__doc__).main())
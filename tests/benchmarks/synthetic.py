@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Synthetic `info configure` output of fully populated OLTs
+
+Every line card is a GPON card whose PON ports carry `onts_per_pon` ONTs
+with one UNI each, and every UNI has a bridge port in the service VLAN. The
+ethernet lines of the card are generated as well. The layout follows the
+fixtures in tests/parser_templates/cli.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+PONS_PER_CARD = 16
+ETHERNET_LINES_PER_CARD = 48
+FIRST_SLOT = 1
+SERVICE_VLAN = 100
+
+
+def iter_unis(cards, onts_per_pon=32):
+    """ Yields the (slot, pon, ont) of every UNI
+    """
+    for slot in range(FIRST_SLOT, FIRST_SLOT + cards):
+        for pon in range(1, PONS_PER_CARD + 1):
+            for ont in range(1, onts_per_pon + 1):
+                yield slot, pon, ont
+
+
+def interfaces_config(cards, onts_per_pon=32):
+    """ `info configure interface`, indented like the device prints it
+    """
+    lines = ["configure interface"]
+    for slot, pon, ont in iter_unis(cards, onts_per_pon):
+        lines.extend([
+            "port ont:1/1/%d/%d/%d" % (slot, pon, ont),
+            "  admin-up",
+            "  link-updown-trap",
+            "exit",
+            "port uni:1/1/%d/%d/%d/1/1" % (slot, pon, ont),
+            "  admin-up",
+            "  user Y%07d" % ont,
+            "  severity major",
+            "exit",
+        ])
+    return "\n".join(lines)
+
+
+def bridges_config(cards, onts_per_pon=32):
+    """ `info configure bridge flat`
+    """
+    lines = ["configure bridge ageing-time 600"]
+    for slot, pon, ont in iter_unis(cards, onts_per_pon):
+        port = "1/1/%d/%d/%d/1/1" % (slot, pon, ont)
+        lines.append("configure bridge port %s" % port)
+        lines.append("configure bridge port %s max-unicast-mac 4" % port)
+        lines.append("configure bridge port %s vlan-id %d" % (port, SERVICE_VLAN))
+        lines.append("configure bridge port %s vlan-id %d tag single-tagged" % (port, SERVICE_VLAN))
+        lines.append("configure bridge port %s pvid %d" % (port, SERVICE_VLAN))
+    return "\n".join(lines)
+
+
+def ethernet_line_config(cards, onts_per_pon=32):
+    """ `info configure ethernet line`, indented like the device prints it
+    """
+    lines = [
+        "configure ethernet",
+        "#" + "-" * 96,
+        "echo \"ethernet\"",
+        "#" + "-" * 96,
+    ]
+    for slot in range(FIRST_SLOT, FIRST_SLOT + cards):
+        for port in range(1, ETHERNET_LINES_PER_CARD + 1):
+            lines.extend([
+                "line 1/1/%d/%d" % (slot, port),
+                "  port-type uni",
+                "  admin-up",
+                "  mau 1",
+                "    type 1000basebx10d",
+                "    power up",
+                "    speed-auto-sense",
+                "  exit",
+                "exit",
+            ])
+    lines.append("#" + "-" * 96)
+    return "\n".join(lines)
+
+
+def vlans_config(cards, onts_per_pon=32):
+    """ `info configure vlan flat`, one residential VLAN per card
+    """
+    lines = ["configure vlan id %d mode residential-bridge" % SERVICE_VLAN]
+    for slot in range(FIRST_SLOT, FIRST_SLOT + cards):
+        lines.append("configure vlan id %d mode residential-bridge name card-%d" % (SERVICE_VLAN + slot, slot))
+        lines.append("configure vlan id %d protocol-filter pass-pppoe" % (SERVICE_VLAN + slot))
+        lines.append("configure vlan id %d dis-proto-rip" % (SERVICE_VLAN + slot))
+    return "\n".join(lines)
+
+
+GENERATORS = {
+    "bridges": bridges_config,
+    "ethernet_line": ethernet_line_config,
+    "interfaces": interfaces_config,
+    "vlans": vlans_config,
+}
+
+
+def show_table(title, columns, rows):
+    """ A `show` table laid out as the ISAM CLI prints it
+    """
+    widths = [max(len(column), 16) for column in columns]
+    width = sum(widths) + len(widths)
+    lines = [
+        "=" * width,
+        title,
+        "=" * width,
+        "|".join(column.ljust(size) for column, size in zip(columns, widths)).rstrip(),
+        "+".join("-" * size for size in widths),
+    ]
+    for row in rows:
+        lines.append(" ".join(str(value).ljust(size) for value, size in zip(row, widths)).rstrip())
+    lines.extend([
+        "-" * width,
+        "%s count : %d" % (title.split()[0], len(rows)),
+        "=" * width,
+    ])
+    return "\n".join(lines)
+
+
+def iter_onts(rows):
+    """ Yields (slot, pon, ont) of `rows` ONTs, 128 per PON
+    """
+    for index in range(rows):
+        yield FIRST_SLOT + index // (PONS_PER_CARD * 128), index // 128 % PONS_PER_CARD + 1, index % 128 + 1
+
+
+def _mac(index):
+    return ":".join("%02x" % byte for byte in (0x00, 0x1b, 0x2c, (index >> 16) & 0xff, (index >> 8) & 0xff, index & 0xff))
+
+
+def show_equipment_ont_optics(rows):
+    return show_table(
+        "optics table",
+        ["ont-idx", "rx-signal-level", "tx-signal-level", "ont-voltage", "olt-rx-sig-level", "ont-temperature", "laser-bias-curr"],
+        [
+            ("1/1/%d/%d/%d" % ont, "%.3f" % (-18 - ont[2] % 7 / 2.0), "2.360", "3.280", "-21.500", "42.000", "14000")
+            for ont in iter_onts(rows)
+        ],
+    )
+
+
+def show_equipment_ont_status(rows):
+    return show_table(
+        "status-table",
+        ["pon-idx", "ont-idx", "sernum", "admin-status", "oper-status", "olt-rx-sig-level", "ont-olt-distance(km)",
+         "desc1", "desc2", "hostname"],
+        [
+            ("1/1/%d/%d" % ont[:2], "1/1/%d/%d/%d" % ont, "ALCL:B%07X" % index, "up", "up" if index % 9 else "down",
+             "-21.5", "1.2", "\"cust %d\"" % index, "undefined", "undefined")
+            for index, ont in enumerate(iter_onts(rows))
+        ],
+    )
+
+
+def show_vlan_bridge_port_fdb(rows):
+    return show_table(
+        "port fdb table",
+        ["port", "vlan-id", "mac", "status"],
+        [("1/1/%d/%d/%d/1/1" % ont, SERVICE_VLAN, _mac(index), "learned") for index, ont in enumerate(iter_onts(rows))],
+    )
+
+
+def show_dhcp_relay_session(rows):
+    return show_table(
+        "session table",
+        ["port", "vlan-id", "ip-addr", "mac-addr", "lease-time-remaining"],
+        [
+            ("1/1/%d/%d/%d/1/1" % ont, SERVICE_VLAN, "10.%d.%d.%d" % (index >> 16 & 0xff, index >> 8 & 0xff, index & 0xff),
+             _mac(index), 86400 - index % 86400)
+            for index, ont in enumerate(iter_onts(rows))
+        ],
+    )
+
+
+def show_equipment_diagnostics_sfp(rows):
+    return show_table(
+        "sfp-diag table",
+        ["position", "los", "tx-fault", "tx-power", "rx-power", "tx-bias-current", "supply-voltage", "temperature"],
+        [
+            ("lt:1/1/%d:sfp:%d" % (FIRST_SLOT + index // PONS_PER_CARD, index % PONS_PER_CARD + 1), "no-los",
+             "no-tx-fault", "\"4.51 dBm\"", "\"-5.23 dBm\"", "\"35.6 mA\"", "\"3.28 VDC\"", "\"39.50 degrees Celsius\"")
+            for index in range(rows)
+        ],
+    )
+
+
+def show_equipment_transceiver_inventory(rows):
+    return show_table(
+        "transceiver-inventory table",
+        ["position", "inventory-status", "alu-part-num", "tx-wavelength", "fiber-type", "rssi-profile-id", "rssi-state"],
+        [
+            ("lt:1/1/%d:sfp:%d" % (FIRST_SLOT + index // PONS_PER_CARD, index % PONS_PER_CARD + 1), "sfp-plugged",
+             "3FE53441AA", "1490.00nm", "single-mode", "65535", "enable")
+            for index in range(rows)
+        ],
+    )
+
+
+def show_interface_port(rows):
+    return show_table(
+        "port table",
+        ["port", "admin-status", "opr-status", "last-chg-opr-stat", "customer-id"],
+        [
+            ("uni:1/1/%d/%d/%d/1/1" % ont, "up", "up" if index % 9 else "down", "%d" % (index * 17), "Y%07d" % index)
+            for index, ont in enumerate(iter_onts(rows))
+        ],
+    )
+
+
+SHOW_GENERATORS = {
+    "show equipment ont optics": show_equipment_ont_optics,
+    "show equipment ont status": show_equipment_ont_status,
+    "show vlan bridge-port-fdb": show_vlan_bridge_port_fdb,
+    "show dhcp-relay session": show_dhcp_relay_session,
+    "show equipment diagnostics sfp": show_equipment_diagnostics_sfp,
+    "show equipment transceiver-inventory": show_equipment_transceiver_inventory,
+    "show interface port": show_interface_port,
+}
@@ -0,0 +1,79 @@
+from textwrap import dedent
+
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.bridges.bridges import (
+    BridgesFacts,
+    records_to_config,
+    tokenize_bridge_config,
+)
+from ansible_collections.isam.isam.tests.unit.compat import unittest
+from ansible_collections.isam.isam.tests.unit.compat.mock import MagicMock
+
+
+BRIDGE_CONFIG = dedent(
+    """\
+    configure bridge ageing-time 600
+    configure bridge port 1/1/5/1/10/1/1
+    configure bridge port 1/1/5/1/10/1/1 max-unicast-mac 4 mac-learn-off
+    configure bridge port 1/1/5/1/10/1/1 vlan-id 10
+    configure bridge port 1/1/5/1/10/1/1 vlan-id 10 tag single-tagged l2fwder-vlan 110 vlan-scope local
+    configure bridge port 1/1/5/1/10/1/1 vlan-id 10 prior-best-effort
+    configure bridge port 1/1/5/1/10/1/1 pvid 10
+    configure bridge port 1/1/5/1/11/1/1 qos-profile "name:high prio"
+    configure bridge port 1/1/5/1/11/1/1 no pvid
+    """
+)
+
+
+class TestIsamBridgesFacts(unittest.TestCase):
+    def test_tokenize_bridge_config(self):
+        records = tokenize_bridge_config(BRIDGE_CONFIG)
+
+        self.assertEqual(records.ageing_time, "600")
+        self.assertIn(("1/1/5/1/10/1/1", None, "mac-learn-off", True), list(records))
+        self.assertIn(("1/1/5/1/10/1/1", "10", "l2fwder-vlan", "110"), list(records))
+        self.assertIn(("1/1/5/1/11/1/1", None, "qos-profile", "name:high prio"), list(records))
+        self.assertIn(("1/1/5/1/11/1/1", None, "pvid", False), list(records))
+
+    def test_tokenize_short_lines(self):
+        records = tokenize_bridge_config("configure bridge \nconfigure bridge port\nconfigure bridge ageing-time 300\n")
+
+        self.assertEqual(records.ageing_time, "300")
+        self.assertEqual(list(records), [])
+
+    def test_records_to_config(self):
+        config = records_to_config(tokenize_bridge_config(BRIDGE_CONFIG))
+
+        self.assertEqual(config["ageing_time"], "600")
+        ports = dict((entry["port"], entry) for entry in config["port"])
+        self.assertEqual(sorted(ports), ["1/1/5/1/10/1/1", "1/1/5/1/11/1/1"])
+        self.assertEqual(ports["1/1/5/1/10/1/1"]["pvid"], "10")
+        self.assertTrue(ports["1/1/5/1/10/1/1"]["mac-learn-off"])
+        self.assertEqual(
+            ports["1/1/5/1/10/1/1"]["vlan_id"],
+            [{
+                "id": "10",
+                "tag": "single-tagged",
+                "l2fwder_vlan": "110",
+                "vlan_scope": "local",
+                "prior_best_effort": True,
+            }],
+        )
+        self.assertNotIn("pvid", ports["1/1/5/1/11/1/1"])
+
+    def test_populate_facts(self):
+        module = MagicMock()
+        module.params = {"state": "parsed"}
+        module.no_log_values = set()
+        connection = MagicMock()
+        connection.get.return_value = BRIDGE_CONFIG
+
+        ansible_facts = {"ansible_network_resources": {}}
+        BridgesFacts(module).populate_facts(connection, ansible_facts)
+
+        connection.get.assert_called_once_with("info configure bridge flat")
+        bridges = ansible_facts["ansible_network_resources"]["bridges"]
+        self.assertEqual(bridges["ageing_time"], 600)
+        ports = dict((entry["port"], entry) for entry in bridges["port"])
+        self.assertEqual(ports["1/1/5/1/10/1/1"]["max-unicast-mac"], 4)
+        self.assertEqual(ports["1/1/5/1/10/1/1"]["vlan_id"][0]["l2fwder_vlan"], "110")
+        self.assertEqual(ports["1/1/5/1/11/1/1"]["qos-profile"], "name:high prio")
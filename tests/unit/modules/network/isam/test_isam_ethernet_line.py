@@ -11,7 +11,6 @@ from ansible_collections.isam.isam.tests.unit.compat.mock import patch
 from ansible_collections.isam.isam.tests.unit.modules.utils import AnsibleFailJson
 
 from .isam_module import TestIsamModule, load_fixture, set_module_args
-import debugpy
 
 
 ignore_provider_arg = True
@@ -0,0 +1,180 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+from textwrap import dedent
+
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts import connections
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.collector import (
+    FactCollector,
+)
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.connections import (
+    NetworkCliConnectionFactory,
+    load_inventory_hosts,
+)
+from ansible_collections.isam.isam.scripts import isam_estate
+from ansible_collections.isam.isam.tests.unit.compat import unittest
+from ansible_collections.isam.isam.tests.unit.compat.mock import MagicMock, patch
+
+
+class FakeConnection(object):
+    def __init__(self, config):
+        self.config = config
+        self.requested = []
+
+    def get_config(self, resources=None):
+        self.requested.append(resources)
+        if isinstance(self.config, Exception):
+            raise self.config
+        return self.config
+
+
+class FakeNetworkCli(object):
+    """ network_cli as the connection loader returns it, logging in on _connect()
+    """
+
+    def __init__(self, play_context, configs):
+        self.play_context = play_context
+        self.configs = configs
+        self.variables = None
+        self.connected = False
+        self.closed = False
+
+    def set_options(self, var_options=None):
+        self.variables = var_options
+
+    def _connect(self):
+        self.connected = True
+
+    def get_config(self, resources=None):
+        return self.configs[self.variables["ansible_host"]]
+
+    def close(self):
+        self.closed = True
+
+
+class TestIsamFactCollector(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+
+    def test_collect_hosts_in_parallel(self):
+        barrier = threading.Barrier(2, timeout=5)
+        configs = {
+            "10.0.0.1": "configure interface\nport uni:1/1/5/1/1/1/1 admin-up\n",
+            "10.0.0.2": "configure interface\nport uni:1/1/6/1/1/1/1 admin-up\n",
+        }
+
+        def connection_factory(name, address):
+            # both hosts have to be in flight at the same time to pass
+            barrier.wait()
+            return FakeConnection(configs[address])
+
+        collector = FactCollector(connection_factory, resources=["interfaces"], max_workers=2,
+                                  output_dir=self.output_dir)
+        facts, errors = collector.collect({"olt-1": "10.0.0.1", "olt-2": "10.0.0.2"})
+
+        self.assertEqual(errors, {})
+        self.assertEqual(facts["olt-1"]["interfaces"][0]["id"], "uni:1/1/5/1/1/1/1")
+        self.assertEqual(facts["olt-2"]["interfaces"][0]["id"], "uni:1/1/6/1/1/1/1")
+        with open(os.path.join(self.output_dir, "olt-2.json")) as facts_file:
+            self.assertEqual(json.load(facts_file), facts["olt-2"])
+
+    def test_collect_reports_failing_host(self):
+        connections = {
+            "10.0.0.1": FakeConnection(dedent("""\
+                configure interface
+                  port uni:1/1/5/1/1/1/1
+                configure ethernet
+                line 1/1/8/1
+                  port-type uni
+                  mau 1
+                    type 1000basebx10d
+                  exit
+                exit
+                """)),
+            "10.0.0.2": FakeConnection(ValueError("connection timed out")),
+        }
+        collector = FactCollector(lambda name, address: connections[address],
+                                  resources=["interfaces", "ethernet_line"])
+        facts, errors = collector.collect({"olt-1": "10.0.0.1", "olt-2": "10.0.0.2"})
+
+        self.assertEqual(connections["10.0.0.1"].requested, [["ethernet_line", "interfaces"]])
+        self.assertEqual(facts["olt-1"]["ethernet_line"][0]["port_type"], "uni")
+        self.assertNotIn("olt-2", facts)
+        self.assertEqual(errors, {"olt-2": ["connection timed out"]})
+
+    def test_load_inventory_hosts(self):
+        path = os.path.join(self.output_dir, "inventory.json")
+        with open(path, "w") as inventory_file:
+            json.dump({"_meta": {"hostvars": {
+                "DS-ALT1-01": {"ansible_host": "10.190.1.9", "device_roles": ["msan"]},
+                "SW-ALT1-01": {"primary_ip4": "10.190.1.10", "device_roles": ["switch"]},
+            }}}, inventory_file)
+
+        self.assertEqual(load_inventory_hosts(path, role="msan"), {"DS-ALT1-01": "10.190.1.9"})
+        self.assertEqual(len(load_inventory_hosts(path)), 2)
+
+    def write_inventory(self):
+        path = os.path.join(self.output_dir, "inventory.json")
+        with open(path, "w") as inventory_file:
+            json.dump({"_meta": {"hostvars": {
+                "olt-1": {"ansible_host": "10.0.0.1", "device_roles": ["msan"]},
+                "olt-2": {"ansible_host": "10.0.0.2", "device_roles": ["msan"], "ansible_user": "olt2"},
+            }}}, inventory_file)
+        return path
+
+    def fake_loader(self, opened):
+        configs = {
+            "10.0.0.1": "configure interface\nport uni:1/1/5/1/1/1/1 admin-up\n",
+            "10.0.0.2": "configure interface\nport uni:1/1/6/1/1/1/1 admin-up\n",
+        }
+
+        def get(name, play_context, new_stdin):
+            self.assertEqual(name, "ansible.netcommon.network_cli")
+            connection = FakeNetworkCli(play_context, configs)
+            opened.append(connection)
+            return connection
+
+        loader = MagicMock()
+        loader.get.side_effect = get
+        return patch.object(connections, "_connection_loader", return_value=loader)
+
+    def test_main_collects_inventory_over_network_cli(self):
+        opened = []
+        facts_dir = os.path.join(self.output_dir, "facts")
+        with self.fake_loader(opened), patch.dict(os.environ, {"ANSIBLE_NET_PASSWORD": "secret"}), \
+                patch.object(isam_estate, "init_plugin_loader"):
+            status = isam_estate.main(["facts", "-i", self.write_inventory(), "--role", "msan", "-u", "admin",
+                                       "--resources", "interfaces", "-o", facts_dir])
+
+        self.assertEqual(status, 0)
+        variables = dict((connection.variables["inventory_hostname"], connection.variables) for connection in opened)
+        self.assertEqual(sorted(variables), ["olt-1", "olt-2"])
+        self.assertEqual(variables["olt-1"]["ansible_user"], "admin")
+        self.assertEqual(variables["olt-2"]["ansible_user"], "olt2")
+        self.assertEqual(variables["olt-1"]["ansible_password"], "secret")
+        self.assertEqual(variables["olt-1"]["ansible_network_os"], "isam.isam.isam")
+        # network_cli waits out the buffer read timeout with SIGALRM, which
+        # fails on the worker threads
+        self.assertEqual(variables["olt-1"]["ansible_buffer_read_timeout"], 0)
+        self.assertEqual(opened[0].play_context.network_os, "isam.isam.isam")
+        self.assertTrue(all(connection.connected and connection.closed for connection in opened))
+        with open(os.path.join(facts_dir, "olt-2.json")) as facts_file:
+            self.assertEqual(json.load(facts_file)["interfaces"][0]["id"], "uni:1/1/6/1/1/1/1")
+
+    def test_factory_keeps_hosts_logged_in(self):
+        opened = []
+        factory = NetworkCliConnectionFactory.from_inventory(self.write_inventory())
+        collector = FactCollector(factory, resources=["interfaces"])
+        with self.fake_loader(opened):
+            collector.collect({"olt-1": "10.0.0.1"})
+            facts, errors = collector.collect({"olt-1": "10.0.0.1"})
+
+        self.assertEqual(errors, {})
+        self.assertEqual(facts["olt-1"]["interfaces"][0]["id"], "uni:1/1/5/1/1/1/1")
+        self.assertEqual(len(opened), 1)
+        self.assertFalse(opened[0].closed)
+        factory.close()
+        self.assertTrue(opened[0].closed)
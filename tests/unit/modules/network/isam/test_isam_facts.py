@@ -0,0 +1,56 @@
+from textwrap import dedent
+
+from ansible_collections.isam.isam.plugins.modules import isam_facts
+from ansible_collections.isam.isam.tests.unit.compat.mock import patch
+
+from .isam_module import TestIsamModule, set_module_args
+
+
+ignore_provider_arg = True
+
+
+class TestIsamFactsModule(TestIsamModule):
+    module = isam_facts
+
+    def setUp(self):
+        super(TestIsamFactsModule, self).setUp()
+
+        self.mock_get_resource_connection_facts = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils.network.common.facts.facts.get_resource_connection",
+        )
+        self.get_resource_connection_facts = self.mock_get_resource_connection_facts.start()
+        self.connection = self.get_resource_connection_facts.return_value
+
+    def tearDown(self):
+        super(TestIsamFactsModule, self).tearDown()
+        self.mock_get_resource_connection_facts.stop()
+
+    def test_isam_facts_single_config_transfer(self):
+        self.connection.get_config.return_value = dedent("""\
+            configure bridge port 1/1/5/1/1/1/1 max-unicast-mac 4
+            configure interface port uni:1/1/5/1/1/1/1 admin-up user 316333
+            configure ethernet
+            #-------------------------------------------------------------------------------
+            echo "ethernet"
+            #-------------------------------------------------------------------------------
+            line 1/1/8/1
+              port-type uni
+              admin-up
+              mau 1
+                type 1000basebx10d
+                power up
+              exit
+            exit
+            #-------------------------------------------------------------------------------
+            """)
+        set_module_args(dict(gather_network_resources=["interfaces", "ethernet_line"]), ignore_provider_arg)
+
+        result = self.execute_module(changed=False)
+
+        self.connection.get_config.assert_called_once_with(
+            resources=["ethernet_line", "interfaces"],
+        )
+        self.connection.get.assert_not_called()
+        resources = result["ansible_facts"]["ansible_network_resources"]
+        self.assertEqual(resources["ethernet_line"][0]["if_index"], "1/1/8/1")
+        self.assertEqual(resources["ethernet_line"][0]["port_type"], "uni")
@@ -0,0 +1,129 @@
+import json
+import os
+import shutil
+import tempfile
+
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts import connections
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.fdb import (
+    INDEX_FILE,
+    DiskMacIndex,
+    FdbCollector,
+    FdbTable,
+    normalize_mac,
+)
+from ansible_collections.isam.isam.scripts import isam_estate
+from ansible_collections.isam.isam.tests.unit.compat import unittest
+from ansible_collections.isam.isam.tests.unit.compat.mock import MagicMock, patch
+
+
+FDB = {
+    "olt-1": [
+        {"port": "1/1/5/1/1/1/1", "vlan_id": 100, "mac": "00:1b:2c:00:00:01", "status": "learned"},
+        {"port": "1/1/5/1/1/1/1", "vlan_id": 200, "mac": "00:1b:2c:00:00:02", "status": "learned"},
+    ],
+    "olt-2": [
+        {"port": "1/1/6/1/1/1/1", "vlan_id": 100, "mac": "00:1b:2c:00:00:01", "status": "learned"},
+    ],
+}
+
+
+class FakeConnection(object):
+    def __init__(self, entries):
+        self.entries = entries
+
+    def get_bridge_port_fdb(self):
+        if isinstance(self.entries, Exception):
+            raise self.entries
+        return self.entries
+
+
+class FakeNetworkCli(object):
+    """ network_cli as the connection loader returns it
+    """
+
+    def __init__(self, play_context):
+        self.variables = None
+        self.closed = False
+
+    def set_options(self, var_options=None):
+        self.variables = var_options
+
+    def _connect(self):
+        pass
+
+    def get_bridge_port_fdb(self):
+        return FDB[self.variables["inventory_hostname"]]
+
+    def close(self):
+        self.closed = True
+
+
+class TestIsamFdbCollector(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+
+    def test_normalize_mac(self):
+        self.assertEqual(normalize_mac("00-1B-2C-00-00-01"), "00:1b:2c:00:00:01")
+        self.assertEqual(normalize_mac("001b.2c00.0001"), "00:1b:2c:00:00:01")
+
+    def test_collect_and_lookup(self):
+        fdb = dict(FDB, **{"olt-3": ValueError("unreachable")})
+        collector = FdbCollector(lambda name, address: FakeConnection(fdb[name]), output_dir=self.output_dir)
+
+        tables, index, errors = collector.collect({"olt-1": "10.0.0.1", "olt-2": "10.0.0.2", "olt-3": "10.0.0.3"})
+
+        self.assertEqual(errors, {"olt-3": "unreachable"})
+        self.assertEqual(len(tables["olt-1"]), 2)
+        self.assertEqual(tables["olt-1"].ports, ["1/1/5/1/1/1/1"])
+        self.assertEqual(
+            index.lookup("00:1B:2C:00:00:01"),
+            [("olt-1", "1/1/5/1/1/1/1", 100), ("olt-2", "1/1/6/1/1/1/1", 100)],
+        )
+        self.assertEqual(index.lookup("00:1b:2c:00:00:99"), [])
+
+        with DiskMacIndex(os.path.join(self.output_dir, INDEX_FILE)) as disk_index:
+            self.assertEqual(disk_index.lookup("00-1b-2c-00-00-02"), [("olt-1", "1/1/5/1/1/1/1", 200)])
+            self.assertEqual(disk_index.lookup("00:1b:2c:00:00:99"), [])
+
+        with open(os.path.join(self.output_dir, "olt-1.fdb.json")) as table_file:
+            table = FdbTable.from_dict(json.load(table_file))
+        self.assertEqual(list(table), list(tables["olt-1"]))
+
+    def test_main_collects_inventory_over_network_cli(self):
+        inventory = os.path.join(self.output_dir, "inventory.json")
+        with open(inventory, "w") as inventory_file:
+            json.dump({"_meta": {"hostvars": {
+                "olt-1": {"ansible_host": "10.0.0.1"},
+                "olt-2": {"ansible_host": "10.0.0.2"},
+            }}}, inventory_file)
+        opened = []
+
+        def get(name, play_context, new_stdin):
+            opened.append(FakeNetworkCli(play_context))
+            return opened[-1]
+
+        loader = MagicMock()
+        loader.get.side_effect = get
+        fdb_dir = os.path.join(self.output_dir, "fdb")
+        with patch.object(connections, "_connection_loader", return_value=loader), \
+                patch.object(isam_estate, "init_plugin_loader"):
+            status = isam_estate.main(["fdb", "-i", inventory, "-u", "admin", "-o", fdb_dir,
+                                       "--mac", "00-1b-2c-00-00-01"])
+
+        self.assertEqual(status, 0)
+        self.assertEqual(sorted(connection.variables["inventory_hostname"] for connection in opened), ["olt-1", "olt-2"])
+        self.assertTrue(all(connection.closed for connection in opened))
+        self.assertTrue(all(connection.variables["ansible_buffer_read_timeout"] == 0 for connection in opened))
+        with DiskMacIndex(os.path.join(fdb_dir, INDEX_FILE)) as disk_index:
+            self.assertEqual(len(disk_index.lookup("00:1b:2c:00:00:01")), 2)
+
+    def test_index_written_when_every_host_fails(self):
+        fdb_dir = os.path.join(self.output_dir, "fdb")
+        collector = FdbCollector(lambda name, address: FakeConnection(ValueError("unreachable")), output_dir=fdb_dir)
+
+        tables, index, errors = collector.collect({"olt-1": "10.0.0.1"})
+
+        self.assertEqual((tables, len(index)), ({}, 0))
+        with DiskMacIndex(os.path.join(fdb_dir, INDEX_FILE)) as disk_index:
+            self.assertEqual(disk_index.lookup("00:1b:2c:00:00:01"), [])
@@ -0,0 +1,69 @@
+import re
+
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.rm_base.network_template import (
+    NetworkTemplate,
+)
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import dict_merge
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.rm_templates.bridges import BridgesTemplate
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.rm_templates.ethernet_line import (
+    Ethernet_lineTemplate,
+)
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.utils.network_template import (
+    ANY_TOKEN,
+    ParserDispatcher,
+    merge_into,
+    token_prefixes,
+)
+from ansible_collections.isam.isam.tests.unit.compat import unittest
+
+
+BRIDGE_LINES = [
+    "configure bridge port 1/1/5/1/1/1/1",
+    "configure bridge port 1/1/5/1/1/1/1 max-unicast-mac 4",
+    "configure bridge port 1/1/5/1/1/1/1 vlan-id 100",
+    "configure bridge port 1/1/5/1/1/1/1 vlan-id 100 tag single-tagged",
+    "configure bridge port 1/1/5/1/1/1/1 pvid 100",
+    "configure bridge port 1/1/5/1/1/1/2 vlan-id 200 tag untagged",
+    "configure bridge ageing-time 600",
+]
+
+ETHERNET_LINES = [
+    "configure ethernet line 1/1/8/1 port-type uni",
+    "configure ethernet line 1/1/8/1 admin-up",
+    "configure ethernet line 1/1/8/1 mau 1 type 1000basebx10d",
+    "configure ethernet line 1/1/8/1 mau 1 power up",
+    "configure ethernet line 1/1/8/2 no admin-up",
+]
+
+
+class TestIsamNetworkTemplate(unittest.TestCase):
+    def test_token_prefixes(self):
+        self.assertEqual(
+            token_prefixes(re.compile(r"configure\sbridge\sport\s(?P<id>\S+)\svlan-id\s(?P<vlan>\d+)")),
+            set([("configure", "bridge", "port", ANY_TOKEN, "vlan-id")]),
+        )
+        self.assertEqual(
+            token_prefixes(re.compile(r"configure\sbridge\s(no\sageing-time|ageing-time\s\d+)")),
+            set([("configure", "bridge", "no"), ("configure", "bridge", "ageing-time")]),
+        )
+        self.assertEqual(token_prefixes(re.compile(r"\s+(?P<negate> no)?\sadmin-up")), set([()]))
+        self.assertEqual(token_prefixes(re.compile(r"configure.*port")), set([()]))
+
+    def test_candidates_keep_parsers_order(self):
+        dispatcher = ParserDispatcher(BridgesTemplate.PARSERS)
+        for line in BRIDGE_LINES:
+            candidates = [BridgesTemplate.PARSERS.index(parser) for parser, _regex in dispatcher.candidates(line)]
+            self.assertEqual(candidates, sorted(candidates))
+            self.assertLess(len(candidates), len(BridgesTemplate.PARSERS))
+            first = next((p["name"] for p in BridgesTemplate.PARSERS if re.match(p["getval"], line)), None)
+            self.assertEqual(next((p["name"] for p, r in dispatcher.candidates(line) if r.match(line)), None), first)
+
+    def test_parse_matches_network_template(self):
+        for template, lines in ((BridgesTemplate, BRIDGE_LINES), (Ethernet_lineTemplate, ETHERNET_LINES)):
+            self.assertEqual(template(lines=lines).parse(), NetworkTemplate.parse(template(lines=lines)))
+
+    def test_merge_into_matches_dict_merge(self):
+        base = {"a": {"b": 1, "c": [1, 2]}, "d": "x", "e": {"f": 1}}
+        other = {"a": {"b": 2, "c": [2, 3], "g": None}, "d": "y", "e": None, "h": {"i": 1}}
+        expected = dict_merge(base, other)
+        self.assertEqual(merge_into(base, other), expected)
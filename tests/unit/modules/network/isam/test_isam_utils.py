@@ -0,0 +1,137 @@
+from textwrap import dedent
+
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.utils.utils import (
+    diff_entries,
+    fingerprint,
+    flatten_config,
+    index_config_sections,
+    iter_chunk_lines,
+    iter_lines,
+)
+from ansible_collections.isam.isam.tests.unit.compat import unittest
+
+
+class TestIsamUtils(unittest.TestCase):
+    def test_iter_lines_string(self):
+        data = "configure bridge\r\nconfigure vlan\n\nconfigure ethernet"
+        self.assertEqual(list(iter_lines(data)), data.splitlines())
+
+    def test_iter_lines_passes_through_line_iterables(self):
+        lines = (line for line in ["configure bridge\n", "configure vlan"])
+        self.assertEqual(list(iter_lines(lines)), ["configure bridge", "configure vlan"])
+
+    def test_iter_lines_empty(self):
+        self.assertEqual(list(iter_lines("")), [])
+        self.assertEqual(list(iter_lines(None)), [])
+
+    def test_iter_chunk_lines(self):
+        chunks = ["confi", "gure bridge\r\nconfigure", " vlan\n", "", "configure ethernet"]
+        self.assertEqual(
+            list(iter_chunk_lines(chunks)),
+            ["configure bridge", "configure vlan", "configure ethernet"],
+        )
+
+    def test_index_config_sections(self):
+        data = "\n".join([
+            "#------",
+            "configure bridge port 1/1/5/1/1/1/1 pvid 100",
+            "configure interface port uni:1/1/5/1/1/1/1 admin-up",
+            "configure ethernet",
+            "line 1/1/8/1",
+            "  port-type uni",
+            "exit",
+            "configure bridge port 1/1/5/1/2/1/1 pvid 200",
+        ])
+        self.assertEqual(
+            index_config_sections(data),
+            {
+                "bridge": [
+                    "configure bridge port 1/1/5/1/1/1/1 pvid 100",
+                    "configure bridge port 1/1/5/1/2/1/1 pvid 200",
+                ],
+                "interface": ["configure interface port uni:1/1/5/1/1/1/1 admin-up"],
+                "ethernet": ["configure ethernet", "line 1/1/8/1", "  port-type uni", "exit"],
+            },
+        )
+
+    def test_flatten_config(self):
+        data = dedent("""\
+            configure ethernet
+            #------
+            echo "ethernet"
+            #------
+            line 1/1/8/1
+              port-type uni
+              admin-up
+              mau 1
+                type 1000basebx10d
+                power up
+              exit
+            exit
+            line 1/1/8/2
+              no admin-up
+            exit
+            configure bridge port 1/1/5/1/1/1/1 pvid 100
+            """)
+        self.assertEqual(
+            list(flatten_config(data)),
+            [
+                "configure ethernet line 1/1/8/1 port-type uni",
+                "configure ethernet line 1/1/8/1 admin-up",
+                "configure ethernet line 1/1/8/1 mau 1 type 1000basebx10d",
+                "configure ethernet line 1/1/8/1 mau 1 power up",
+                "configure ethernet line 1/1/8/2 no admin-up",
+                "configure bridge port 1/1/5/1/1/1/1 pvid 100",
+            ],
+        )
+
+    def test_flatten_config_flat_lines(self):
+        lines = [
+            "configure ethernet line 1/1/8/1 port-type uni",
+            "configure ethernet line 1/1/8/1 admin-up",
+        ]
+        self.assertEqual(list(flatten_config(lines)), lines)
+        self.assertEqual(list(flatten_config("")), [])
+
+    def test_fingerprint_ignores_key_order(self):
+        self.assertEqual(
+            fingerprint({"port": "1/1/1", "pvid": 10, "vlan_id": [{"id": "10", "tag": "untagged"}]}),
+            fingerprint({"vlan_id": [{"tag": "untagged", "id": "10"}], "pvid": 10, "port": "1/1/1"}),
+        )
+        self.assertNotEqual(fingerprint({"pvid": 10}), fingerprint({"pvid": "10"}))
+
+    def test_diff_entries_skips_identical_entries(self):
+        haved = {
+            "1/1/1": {"if_index": "1/1/1", "admin_up": True},
+            "1/1/2": {"if_index": "1/1/2", "admin_up": True},
+            "1/1/3": {"if_index": "1/1/3", "admin_up": True},
+        }
+        wantd = {
+            "1/1/1": {"if_index": "1/1/1", "admin_up": True},
+            "1/1/2": {"if_index": "1/1/2", "admin_up": False},
+            "1/1/4": {"if_index": "1/1/4", "admin_up": True},
+        }
+
+        self.assertEqual(
+            list(diff_entries(wantd, haved, "replaced")),
+            [(wantd["1/1/2"], haved["1/1/2"]), (wantd["1/1/4"], {})],
+        )
+        self.assertEqual(
+            list(diff_entries(wantd, haved, "overridden")),
+            [({}, haved["1/1/3"]), (wantd["1/1/2"], haved["1/1/2"]), (wantd["1/1/4"], {})],
+        )
+        self.assertEqual(
+            list(diff_entries({"1/1/1": {}}, haved, "deleted")),
+            [({}, haved["1/1/1"])],
+        )
+        self.assertEqual(len(list(diff_entries({}, haved, "deleted"))), 3)
+
+    def test_diff_entries_merged(self):
+        haved = {"1/1/1": {"if_index": "1/1/1", "admin_up": True, "mau": [{"index": 1}]}}
+
+        # merging a subset of have onto have changes nothing
+        self.assertEqual(list(diff_entries({"1/1/1": {"if_index": "1/1/1", "admin_up": True}}, haved, "merged")), [])
+        self.assertEqual(
+            list(diff_entries({"1/1/1": {"if_index": "1/1/1", "admin_up": False}}, haved, "merged")),
+            [({"if_index": "1/1/1", "admin_up": False, "mau": [{"index": 1}]}, haved["1/1/1"])],
+        )
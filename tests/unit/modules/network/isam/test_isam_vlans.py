@@ -0,0 +1,41 @@
+from textwrap import dedent
+
+from ansible_collections.isam.isam.plugins.module_utils.network.isam.facts.vlans.vlans import VlansFacts
+from ansible_collections.isam.isam.tests.unit.compat import unittest
+from ansible_collections.isam.isam.tests.unit.compat.mock import MagicMock
+
+
+VLAN_CONFIG = dedent(
+    """\
+    configure vlan id 100 mode residential-bridge
+    configure vlan id 100 name "hsi internet"
+    configure vlan id 101 name card-1 mode residential-bridge no sntp-proxy priority 3 new-broadcast enable
+    configure vlan id 102
+    configure vlan id 103 no arp-snooping
+    """
+)
+
+
+class TestIsamVlansFacts(unittest.TestCase):
+    def test_populate_facts(self):
+        module = MagicMock()
+        module.params = {"state": "parsed"}
+        module.no_log_values = set()
+        connection = MagicMock()
+        connection.get.return_value = VLAN_CONFIG
+
+        ansible_facts = {"ansible_network_resources": {}}
+        VlansFacts(module).populate_facts(connection, ansible_facts)
+
+        connection.get.assert_called_once_with("info configure vlan id flat")
+        vlans = dict((entry["id"], entry) for entry in ansible_facts["ansible_network_resources"]["vlans"])
+        self.assertEqual(sorted(vlans), [100, 101, 102, 103])
+        self.assertEqual(vlans[100]["name"], "hsi internet")
+        self.assertEqual(vlans[100]["mode"], "residential-bridge")
+        self.assertEqual(vlans[101]["name"], "card-1")
+        self.assertEqual(vlans[101]["mode"], "residential-bridge")
+        self.assertIs(vlans[101]["sntp-proxy"], False)
+        self.assertEqual(vlans[101]["priority"], 3)
+        self.assertEqual(vlans[101]["new-broadcast"], "enable")
+        self.assertIs(vlans[103]["arp-snooping"], False)
+        self.assertNotIn("mode", vlans[102])
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+
+from ansible_collections.isam.isam.plugins.action import isam
+from ansible_collections.isam.isam.tests.unit.compat import unittest
+from ansible_collections.isam.isam.tests.unit.compat.mock import MagicMock, patch
+
+# the directory holding the ansible_collections the plugin is imported from
+COLLECTIONS_PATH = os.path.abspath(os.path.join(os.path.dirname(isam.__file__), *[os.pardir] * 5))
+
+RESOLVE_ACTION = """
+import sys
+from ansible.plugins.loader import init_plugin_loader, module_loader
+init_plugin_loader([sys.argv[1]])
+for name in sys.argv[2:]:
+    print(module_loader.find_plugin_with_context("isam.isam." + name).action_plugin)
+"""
+
+
+class TestIsamActionModule(unittest.TestCase):
+    def action_module(self):
+        task = MagicMock()
+        task.action = "isam.isam.isam_facts"
+        play_context = MagicMock()
+        play_context.connection = "ansible.netcommon.network_cli"
+        connection = MagicMock()
+        connection.socket_path = "/tmp/isam.sock"
+        templar = MagicMock()
+        templar.template.side_effect = lambda value: value
+        return isam.ActionModule(task, connection, play_context, MagicMock(), templar, MagicMock())
+
+    def test_modules_routed_to_action_plugin(self):
+        modules_dir = os.path.join(COLLECTIONS_PATH, "ansible_collections", "isam", "isam", "plugins", "modules")
+        modules = sorted(name[:-3] for name in os.listdir(modules_dir) if name.startswith("isam_") and name.endswith(".py"))
+
+        output = subprocess.check_output([sys.executable, "-c", RESOLVE_ACTION, COLLECTIONS_PATH] + modules)
+
+        self.assertEqual(output.decode().split(), ["isam.isam.isam"] * len(modules))
+
+    def test_command_trace_added_to_result(self):
+        trace = [{"command": "info configure vlan id flat", "duration": 0.5}]
+        with patch.object(isam.ActionNetworkModule, "run", return_value={"changed": False}), \
+                patch.object(isam, "Connection") as connection:
+            connection.return_value.get_command_trace.return_value = trace
+            result = self.action_module().run(task_vars={"ansible_isam_command_trace": True})
+
+        connection.assert_called_once_with("/tmp/isam.sock")
+        self.assertEqual(result["command_trace"], trace)
+
+    def test_command_trace_off_by_default(self):
+        with patch.object(isam.ActionNetworkModule, "run", return_value={"changed": False}), \
+                patch.object(isam, "Connection") as connection:
+            result = self.action_module().run(task_vars={})
+
+        connection.assert_not_called()
+        self.assertNotIn("command_trace", result)
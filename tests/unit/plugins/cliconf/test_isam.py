@@ -0,0 +1,618 @@
+import json
+import shutil
+import socket
+import tempfile
+
+from ansible.errors import AnsibleConnectionFailure
+
+from ansible_collections.isam.isam.plugins.cliconf.isam import Cliconf, _extend_command_timeout
+from ansible_collections.isam.isam.plugins.terminal.isam import TerminalModule
+from ansible_collections.isam.isam.tests.unit.compat import unittest
+from ansible_collections.isam.isam.tests.unit.compat.mock import MagicMock, patch
+
+
+class FakeShell(object):
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+
+    def recv(self, size):
+        chunk = self._chunks.pop(0) if self._chunks else b""
+        if isinstance(chunk, Exception):
+            raise chunk
+        return chunk
+
+    def settimeout(self, timeout):
+        pass
+
+
+class FakeConnection(object):
+    ssh_type = "paramiko"
+
+    def __init__(self, chunks):
+        self._ssh_shell = FakeShell(chunks)
+        self._terminal = TerminalModule(self)
+        self.send = MagicMock(return_value=None)
+        self.close = MagicMock()
+        self.get_prompt = MagicMock(return_value=b"DS-LIN-TEST-01>#")
+
+    def get_option(self, option):
+        return {"host": "olt-1", "persistent_command_timeout": 30}[option]
+
+    def _get_terminal_std_re(self, option):
+        return getattr(self._terminal, option)
+
+    def _strip(self, data):
+        return data
+
+
+class ScriptedShell(object):
+    """A CLI session answering every command it is sent with its output"""
+
+    def __init__(self, respond, banner=b""):
+        self._respond = respond
+        self._pending = [banner + b"DS-LIN-TEST-01>#"] if banner else []
+        self.commands = []
+
+    def sendall(self, data):
+        for command in data.decode().split("\r"):
+            if command:
+                self.commands.append(command)
+                output = self._respond(command).replace(b"\n", b"\r\n")
+                self._pending.append(command.encode() + b"\r\n" + output + b"\r\nDS-LIN-TEST-01>#")
+
+    def recv(self, size):
+        return self._pending.pop(0) if self._pending else b""
+
+    def settimeout(self, timeout):
+        pass
+
+    def close(self):
+        pass
+
+
+class ScriptedConnection(FakeConnection):
+    """Answers commands sent through send_command and streamed ones alike
+
+    :param responses: the text output keyed by the command as bytes
+    """
+
+    def __init__(self, responses):
+        super(ScriptedConnection, self).__init__([])
+        self._ssh_shell = ScriptedShell(lambda command: responses.get(command.encode(), "").encode())
+        self.send.side_effect = self._send
+        self._responses = responses
+
+    def _send(self, command, sendonly=False, **kwargs):
+        if sendonly:
+            self._ssh_shell.sendall(command + b"\r")
+            return None
+        return self._responses.get(command, "")
+
+
+class TestIsamCliconf(unittest.TestCase):
+    def setUp(self):
+        self.options = {
+            "edit_config_batch_size": 1,
+            "config_cache_dir": None,
+            "config_cache_probe": None,
+            "config_run_cache": False,
+            "session_pool_size": 1,
+        }
+        self.mock_get_option = patch.object(Cliconf, "get_option", side_effect=self.options.get)
+        self.mock_get_option.start()
+
+    def tearDown(self):
+        self.mock_get_option.stop()
+
+    def test_iter_config_streams_lines(self):
+        connection = FakeConnection([
+            b"DS-LIN-TEST-01>#info configure bridge fl",
+            b"at\r\nconfigure bridge port 1/1/5/1/1/1/1 pvid 100\r\nconfigure bri",
+            b"dge port 1/1/5/1/1/1/1 max-unicast-mac 4\r\n",
+            b"DS-LIN-TEST-01>#",
+        ])
+        cliconf = Cliconf(connection)
+
+        lines = cliconf.iter_config(flags="bridge")
+
+        self.assertEqual(next(lines), "configure bridge port 1/1/5/1/1/1/1 pvid 100")
+        self.assertEqual(list(lines), ["configure bridge port 1/1/5/1/1/1/1 max-unicast-mac 4"])
+        self.assertEqual(connection.send.call_args[1]["command"], b"info configure bridge flat")
+
+    def test_iter_config_raises_device_error(self):
+        connection = FakeConnection([
+            b"DS-LIN-TEST-01>#info configure bogus flat\r\n",
+            b"                              ^\r\nError : invalid token\r\n",
+            b"DS-LIN-TEST-01>#",
+        ])
+        cliconf = Cliconf(connection)
+
+        with self.assertRaises(AnsibleConnectionFailure):
+            list(cliconf.iter_config(flags="bogus"))
+
+    def test_plan_config_fetch_resources(self):
+        cliconf = Cliconf(None)
+        self.assertEqual(
+            cliconf.plan_config_fetch(resources=["bridges", "interfaces", "ethernet_line", "vlans"]),
+            [
+                "info configure bridge flat",
+                "info configure interface port flat",
+                "info configure ethernet line",
+                "info configure vlan id flat",
+            ],
+        )
+
+    def test_plan_config_fetch_drops_nested_subtrees(self):
+        cliconf = Cliconf(None)
+        self.assertEqual(
+            cliconf.plan_config_fetch(resources=["interfaces", "bridges"], flags=["interface", "bridge"]),
+            ["info configure bridge flat", "info configure interface flat"],
+        )
+
+    def test_plan_config_fetch_full_dump(self):
+        cliconf = Cliconf(None)
+        self.assertEqual(cliconf.plan_config_fetch(), ["info configure flat"])
+        self.assertEqual(
+            cliconf.plan_config_fetch(resources=["bridges", "unknown"]),
+            ["info configure flat"],
+        )
+        self.assertEqual(
+            cliconf.plan_config_fetch(resources=["ethernet_line", "unknown"]),
+            ["info configure flat", "info configure ethernet line"],
+        )
+
+    def test_edit_config_batch(self):
+        connection = FakeConnection([
+            b"configure bridge port 1/1/5/1/1/1/1 pvid 100\r\nDS-LIN-TEST-01>#conf",
+            b"igure bridge port 1/1/5/1/1/1/1 max-unicast-mac 4\r\n",
+            b"DS-LIN-TEST-01>#configure bridge port 1/1/5/1/2/1/1 pvid 200\r\nDS-LIN-TEST-01>#",
+        ])
+        cliconf = Cliconf(connection)
+        candidate = [
+            "configure bridge port 1/1/5/1/1/1/1 pvid 100",
+            "configure bridge port 1/1/5/1/1/1/1 max-unicast-mac 4",
+            "configure bridge port 1/1/5/1/2/1/1 pvid 200",
+        ]
+
+        resp = cliconf.edit_config(candidate, batch_size=10)
+
+        self.assertEqual(resp["request"], candidate)
+        self.assertEqual(resp["response"], ["", "", ""])
+        connection.send.assert_called_once_with(
+            command=b"\r".join(line.encode() for line in candidate),
+            sendonly=True,
+            newline=True,
+            prompt_retry_check=False,
+            check_all=False,
+        )
+
+    def test_edit_config_batch_maps_errors_to_lines(self):
+        connection = FakeConnection([
+            b"configure bridge port 1/1/5/1/1/1/1 pvid 100\r\n",
+            b"DS-LIN-TEST-01>#configure bridge port 1/1/5/1/1/1/1 bogus 4\r\n",
+            b"                                                ^\r\nError : invalid token\r\nDS-LIN-TEST-01>#",
+            b"configure bridge port 1/1/5/1/2/1/1 pvid 200\r\nDS-LIN-TEST-01>#",
+        ])
+        cliconf = Cliconf(connection)
+        candidate = [
+            "configure bridge port 1/1/5/1/1/1/1 pvid 100",
+            "configure bridge port 1/1/5/1/1/1/1 bogus 4",
+            "configure bridge port 1/1/5/1/2/1/1 pvid 200",
+        ]
+
+        with self.assertRaises(AnsibleConnectionFailure) as exc:
+            cliconf.edit_config(candidate, batch_size=2)
+
+        self.assertIn("configure bridge port 1/1/5/1/1/1/1 bogus 4: ", str(exc.exception))
+        self.assertIn("Error : invalid token", str(exc.exception))
+        self.assertNotIn("pvid", str(exc.exception))
+        self.assertEqual(connection.send.call_count, 2)
+
+    def test_get_config_served_from_snapshot_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        self.options["config_cache_dir"] = cache_dir
+        self.options["config_cache_probe"] = "show config-change-counter"
+        responses = {
+            b"show config-change-counter": "counter : 41",
+            b"info configure bridge flat": "configure bridge port 1/1/5/1/1/1/1 pvid 100",
+        }
+        connection = ScriptedConnection(responses)
+        cliconf = Cliconf(connection)
+
+        self.assertEqual(cliconf.get_config(flags="bridge"), "configure bridge port 1/1/5/1/1/1/1 pvid 100")
+        self.assertEqual(connection.send.call_count, 2)
+
+        self.assertEqual(cliconf.get_config(flags="bridge"), "configure bridge port 1/1/5/1/1/1/1 pvid 100")
+        self.assertEqual(connection.send.call_count, 3)
+
+        responses[b"show config-change-counter"] = "counter : 42"
+        responses[b"info configure bridge flat"] = "configure bridge port 1/1/5/1/1/1/1 pvid 200"
+        self.assertEqual(cliconf.get_config(flags="bridge"), "configure bridge port 1/1/5/1/1/1/1 pvid 200")
+        self.assertEqual(connection.send.call_count, 5)
+
+    def test_get_info_configure_served_from_snapshot_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        self.options["config_cache_dir"] = cache_dir
+        self.options["config_cache_probe"] = "show config-change-counter"
+        responses = {
+            b"show config-change-counter": "counter : 41",
+            b"info configure vlan id flat": "configure vlan id 100 mode residential-bridge",
+        }
+        connection = ScriptedConnection(responses)
+        cliconf = Cliconf(connection)
+
+        self.assertEqual(cliconf.get("info configure vlan id flat"), "configure vlan id 100 mode residential-bridge")
+        self.assertEqual(connection.send.call_count, 2)
+
+        # a facts class reading through get() only runs the probe
+        self.assertEqual(cliconf.get("info  configure vlan id flat"), "configure vlan id 100 mode residential-bridge")
+        self.assertEqual(connection.send.call_count, 3)
+
+    def test_get_capabilities_cached_until_invalidated(self):
+        responses = {
+            b"show software-mngt version etsi detail": "isam-release : R6.2.04m",
+            b"show equipment shelf 1/1 detail": "actual-type : nfxs-f\nserial-no : AA1234567890",
+        }
+        connection = ScriptedConnection(responses)
+        cliconf = Cliconf(connection)
+
+        capabilities = json.loads(cliconf.get_capabilities())
+        self.assertEqual(capabilities["device_info"]["network_os_version"], "R6.2.04m")
+        self.assertEqual(capabilities["device_info"]["network_os_model"], "nfxs-f")
+        self.assertEqual(capabilities["device_info"]["network_os_serial"], "AA1234567890")
+        self.assertEqual(capabilities["device_info"]["network_os_hostname"], "DS-LIN-TEST-01")
+
+        cliconf.get_capabilities()
+        self.assertEqual(connection.send.call_count, 2)
+
+        cliconf.invalidate_device_info()
+        cliconf.get_capabilities()
+        self.assertEqual(connection.send.call_count, 4)
+
+    def test_get_device_info_without_prompt(self):
+        connection = ScriptedConnection({})
+        connection.get_prompt.return_value = None
+        cliconf = Cliconf(connection)
+
+        device_info = cliconf.get_device_info()
+        self.assertNotIn("network_os_hostname", device_info)
+        self.assertEqual(connection.send.call_count, 2)
+
+    def test_get_diff_flat_config(self):
+        cliconf = Cliconf(None)
+        running = "\n".join([
+            "#" + "-" * 40,
+            "echo \"bridge\"",
+            "configure bridge port 1/1/5/1/1/1/1 pvid 100",
+            "configure bridge port 1/1/5/1/1/1/1 max-unicast-mac 4",
+            "configure bridge port 1/1/5/1/2/1/1 pvid 100",
+        ])
+        candidate = "\n".join([
+            "configure bridge port 1/1/5/1/2/1/1  pvid 100",
+            "configure bridge port 1/1/5/1/2/1/1 max-unicast-mac 4",
+            "configure bridge port 1/1/5/1/3/1/1 pvid 100",
+        ])
+
+        diff = cliconf.get_diff(candidate=candidate, running=running, diff_match="line", diff_replace="line")
+        self.assertEqual(
+            diff["config_diff"].splitlines(),
+            ["configure bridge port 1/1/5/1/2/1/1 max-unicast-mac 4", "configure bridge port 1/1/5/1/3/1/1 pvid 100"],
+        )
+
+        diff = cliconf.get_diff(
+            candidate=candidate,
+            running=running,
+            diff_match="line",
+            diff_ignore_lines=[r"configure bridge port 1/1/5/1/3/"],
+            diff_replace="line",
+        )
+        self.assertEqual(diff["config_diff"], "configure bridge port 1/1/5/1/2/1/1 max-unicast-mac 4")
+
+        diff = cliconf.get_diff(candidate=candidate, running=running, diff_match="strict", diff_replace="line")
+        self.assertEqual(len(diff["config_diff"].splitlines()), 3)
+
+        diff = cliconf.get_diff(candidate=running, running=running, diff_match="exact", diff_replace="line")
+        self.assertEqual(diff["config_diff"], "")
+
+    def test_get_diff_ignore_lines_flat(self):
+        cliconf = Cliconf(None)
+        running = "configure bridge port 1/1/5/1/1/1/1 pvid 100\nconfigure system sntp enable"
+        candidate = "configure bridge port 1/1/5/1/1/1/1 pvid 200\nconfigure system sntp disable"
+
+        diff = cliconf.get_diff(
+            candidate=candidate,
+            running=running,
+            diff_match="line",
+            diff_ignore_lines=[r"configure system sntp"],
+            diff_replace="line",
+        )
+
+        self.assertEqual(diff["config_diff"], "configure bridge port 1/1/5/1/1/1/1 pvid 200")
+        self.assertTrue(cliconf.get_device_operations()["supports_diff_ignore_lines"])
+
+    def test_get_diff_ignore_lines_hierarchical(self):
+        cliconf = Cliconf(None)
+        running = "\n".join([
+            "configure ethernet",
+            "  line 1/1/8/1",
+            "    port-type uni",
+            "    admin-up",
+            "  exit",
+        ])
+        candidate = "\n".join([
+            "configure ethernet",
+            "  line 1/1/8/1",
+            "    port-type nni",
+            "    no admin-up",
+            "  exit",
+        ])
+
+        diff = cliconf.get_diff(
+            candidate=candidate,
+            running=running,
+            diff_match="line",
+            diff_ignore_lines=[r"(no )?admin-up"],
+            diff_replace="line",
+        )
+
+        self.assertEqual(
+            diff["config_diff"].splitlines(),
+            ["configure ethernet", "line 1/1/8/1", "port-type nni"],
+        )
+        # the patterns must not stick to later diffs
+        diff = cliconf.get_diff(candidate=candidate, running=running, diff_match="line", diff_replace="line")
+        self.assertIn("no admin-up", diff["config_diff"])
+
+    def test_get_ont_optics_split_by_lt(self):
+        xml = (
+            b"<runtime-data><hierarchy name=\"show\" type=\"static\"><instance>"
+            b"<res-id name=\"ont-idx\" short-name=\"ont-idx\" type=\"Gpon::OntIndex\">1/1/%d/1/1</res-id>"
+            b"<info name=\"rx-signal-level\" short-name=\"rx-signal-level\" type=\"Gpon::RxSignalLevel\">-19.600</info>"
+            b"<info name=\"tx-signal-level\" short-name=\"tx-signal-level\" type=\"Gpon::TxSignalLevel\">2.360</info>"
+            b"<info name=\"ont-voltage\" short-name=\"ont-voltage\" type=\"Gpon::OntVoltage\">3.280</info>"
+            b"<info name=\"olt-rx-sig-level\" short-name=\"olt-rx-sig-level\" type=\"Gpon::OltRxSigLevel\">unknown</info>"
+            b"<info name=\"ont-temperature\" short-name=\"ont-temperature\" type=\"Gpon::OntTemperature\">42.000</info>"
+            b"<info name=\"laser-bias-curr\" short-name=\"laser-bias-curr\" type=\"Gpon::LaserBiasCurr\">14000</info>"
+            b"</instance></hierarchy></runtime-data>\r\n"
+        )
+        connection = FakeConnection([
+            b"show equipment ont optics 1/1/5 xml\r\n" + xml % 5,
+            b"DS-LIN-TEST-01>#show equipment ont optics 1/1/6 xml\r\n" + xml % 6 + b"DS-LIN-TEST-01>#",
+        ])
+        slots = "lt:1/1/5   fglt-b  fglt-b  enabled  yes  no-error  available\nlt:1/1/6   fglt-b  fglt-b  enabled  yes  no-error  available"
+        connection.send.side_effect = lambda command, **kwargs: slots if command == b"show equipment slot" else None
+        cliconf = Cliconf(connection)
+
+        onts = cliconf.get_ont_optics(split_by_lt=True)
+
+        self.assertEqual([ont["ont_idx"] for ont in onts], ["1/1/5/1/1", "1/1/6/1/1"])
+        self.assertEqual(onts[0]["rx_power"], -19.6)
+        self.assertEqual(onts[0]["bias_current"], 14000.0)
+        self.assertIsNone(onts[0]["olt_rx_power"])
+        self.assertEqual(
+            connection.send.call_args[1]["command"],
+            b"show equipment ont optics 1/1/5 xml\rshow equipment ont optics 1/1/6 xml",
+        )
+
+    def test_get_ont_optics_text(self):
+        connection = FakeConnection([
+            b"show equipment ont optics 1/1/5/1\r\n",
+            b"ont-idx    |rx-signal-level |tx-signal-level |ont-voltage |olt-rx-sig-level |ont-temperature |laser-bias-curr\r\n",
+            b"1/1/5/1/1   -19.600          2.360            3.280        -21.500           42.000           14000\r\n",
+            b"1/1/5/1/2   unknown          unknown          unknown      unknown           unknown          unknown\r\n",
+            b"DS-LIN-TEST-01>#",
+        ])
+        cliconf = Cliconf(connection)
+
+        onts = cliconf.get_ont_optics(ont_idx="1/1/5/1", output="text")
+
+        self.assertEqual(onts[0]["olt_rx_power"], -21.5)
+        self.assertEqual(onts[1], {
+            "ont_idx": "1/1/5/1/2",
+            "rx_power": None,
+            "tx_power": None,
+            "olt_rx_power": None,
+            "temperature": None,
+            "bias_current": None,
+            "voltage": None,
+        })
+
+    def test_get_xml_output(self):
+        connection = FakeConnection([
+            b"DS-LIN-TEST-01>#show equipment slot xml\r\n<runtime-data><hierarchy name=\"show\" type=\"static\">",
+            b"<instance><res-id name=\"slot\" short-name=\"slot\" type=\"Equipm::SlotIndex\">lt:1/1/5</res-id>",
+            b"<info name=\"actual-type\" short-name=\"act-type\" type=\"Equipm::BoardName\">fglt-b</info>",
+            b"<info name=\"availability\" short-name=\"availability\" type=\"Equipm::Availability\">available</info>",
+            b"<info name=\"num-ports\" short-name=\"ports\" type=\"Sys::Integer\">16</info></ins",
+            b"tance></hierarchy></runtime-data>\r\nDS-LIN-TEST-01>#",
+        ])
+        cliconf = Cliconf(connection)
+
+        records = cliconf.get_xml_records("show equipment slot")
+
+        self.assertEqual(
+            records,
+            [{"slot": "lt:1/1/5", "actual-type": "fglt-b", "availability": "available", "num-ports": 16}],
+        )
+        self.assertEqual(connection.send.call_args[1]["command"], b"show equipment slot xml")
+
+    def test_get_xml_output_on_one_long_line(self):
+        instance = (
+            b"<instance><res-id name=\"slot\" short-name=\"slot\" type=\"Equipm::SlotIndex\">lt:1/1/%d</res-id>"
+            b"<info name=\"num-ports\" short-name=\"ports\" type=\"Sys::Integer\">16</info></instance>"
+        )
+        body = b"<runtime-data><hierarchy name=\"show\" type=\"static\">"
+        body += b"".join(instance % slot for slot in range(100)) + b"</hierarchy></runtime-data>"
+        chunks = [b"DS-LIN-TEST-01>#show equipment slot xml\r\n"]
+        chunks.extend(body[start:start + 500] for start in range(0, len(body), 500))
+        chunks.append(b"\r\nDS-LIN-TEST-01>#")
+        cliconf = Cliconf(FakeConnection(chunks))
+
+        records = cliconf.get_xml_records("show equipment slot xml")
+
+        self.assertEqual(len(records), 100)
+        self.assertEqual(records[-1], {"slot": "lt:1/1/99", "num-ports": 16})
+
+    def test_get_xml_output_is_text(self):
+        response = "<runtime-data><hierarchy name=\"show\" type=\"static\"></hierarchy></runtime-data>"
+        connection = ScriptedConnection({b"show equipment slot xml": response})
+        cliconf = Cliconf(connection)
+
+        self.assertEqual(cliconf.get("show equipment slot", output="xml"), response)
+        self.assertEqual(
+            cliconf.get("show equipment slot", prompt="sure?", answer="y", output="xml"), response
+        )
+        self.assertEqual(connection.send.call_args[1]["command"], b"show equipment slot xml")
+        with self.assertRaises(ValueError):
+            cliconf.get_xml_records(None)
+
+    def test_get_bridge_port_fdb(self):
+        output = "\n".join([
+            "port fdb table",
+            "port              |vlan-id |mac                |status",
+            "------------------+--------+-------------------+-------",
+            "1/1/5/1/1/1/1      100      00:1B:2C:00:00:01   learned",
+            "1/1/5/1/1/1/1      200      00:1b:2c:00:00:02   learned",
+        ])
+        connection = FakeConnection([])
+        connection.send.return_value = output
+        cliconf = Cliconf(connection)
+
+        self.assertEqual(
+            cliconf.get_bridge_port_fdb(port="1/1/5/1/1/1/1", vlan_id="200"),
+            [{"port": "1/1/5/1/1/1/1", "vlan_id": 200, "mac": "00:1b:2c:00:00:02", "status": "learned"}],
+        )
+        self.assertEqual(connection.send.call_args[1]["command"], b"show vlan bridge-port-fdb 1/1/5/1/1/1/1")
+        self.assertEqual(len(cliconf.get_bridge_port_fdb(mac="00:1b:2c:00:00:01")), 1)
+
+    def test_run_cache_invalidated_by_edit_config(self):
+        self.options["config_run_cache"] = True
+        responses = {
+            b"info configure bridge flat": "configure bridge port 1/1/5/1/1/1/1 pvid 100",
+            b"info configure vlan id flat": "configure vlan id 100 mode residential-bridge",
+            b"info configure ethernet line": "configure ethernet\nline 1/1/8/1\n  admin-up\nexit",
+        }
+        connection = ScriptedConnection(responses)
+        cliconf = Cliconf(connection)
+
+        for _ in range(2):
+            cliconf.get("info configure bridge flat")
+            cliconf.get_config(resources=["vlans", "ethernet_line"])
+        self.assertEqual(connection.send.call_count, 3)
+
+        cliconf.edit_config(["configure bridge port 1/1/5/1/1/1/1 pvid 200"])
+        responses[b"info configure bridge flat"] = "configure bridge port 1/1/5/1/1/1/1 pvid 200"
+        self.assertEqual(cliconf.get("info configure bridge flat"), "configure bridge port 1/1/5/1/1/1/1 pvid 200")
+        cliconf.get_config(resources=["vlans", "ethernet_line"])
+        self.assertEqual(connection.send.call_count, 5)
+
+        cliconf.get("admin save")
+        cliconf.get_config(resources=["vlans"])
+        self.assertEqual(connection.send.call_count, 7)
+
+    def test_get_config_spread_over_session_pool(self):
+        outputs = {
+            "info configure bridge flat": b"configure bridge port 1/1/5/1/1/1/1 pvid 100",
+            "info configure interface flat": b"configure interface port ont:1/1/5/1/1 admin-up",
+            "info configure vlan flat": b"configure vlan id 100 mode residential-bridge",
+        }
+        connection = FakeConnection([])
+        connection._ssh_shell = ScriptedShell(outputs.get)
+        extra = ScriptedShell(outputs.get, banner=b"Welcome to the ISAM\r\n")
+        connection.ssh_type_conn = MagicMock()
+        connection.ssh_type_conn.ssh.invoke_shell.return_value = extra
+        connection._terminal.setup_session = MagicMock()
+        self.options["session_pool_size"] = 2
+        cliconf = Cliconf(connection)
+
+        config = cliconf.get_config(flags=["bridge", "interface", "vlan"])
+
+        self.assertEqual(config, "\n".join(output.decode() for output in outputs.values()))
+        connection._terminal.setup_session.assert_called_once_with(extra)
+        self.assertEqual(
+            sorted(connection._ssh_shell.commands + extra.commands),
+            sorted(outputs),
+        )
+
+    def test_stalled_primary_of_session_pool_is_reset(self):
+        class StalledShell(ScriptedShell):
+            def recv(self, size):
+                if self._pending:
+                    return self._pending.pop(0)
+                raise socket.timeout()
+
+        connection = FakeConnection([])
+        connection._ssh_shell = StalledShell(lambda command: b"")
+        extra = ScriptedShell(lambda command: b"configure vlan id 100", banner=b"Welcome to the ISAM\r\n")
+        connection.ssh_type_conn = MagicMock()
+        connection.ssh_type_conn.ssh.invoke_shell.return_value = extra
+        connection._terminal.setup_session = MagicMock()
+        # the stalled echo is what the next command would read
+        connection._ssh_shell.sendall = lambda data: connection._ssh_shell._pending.append(data[:-1] + b"\r\n")
+        self.options["session_pool_size"] = 2
+        cliconf = Cliconf(connection)
+
+        with self.assertRaises(AnsibleConnectionFailure):
+            cliconf.get_config(flags=["bridge", "interface", "vlan"])
+
+        connection.close.assert_called_once_with()
+        self.assertIsNone(cliconf._session_pool)
+
+    def test_stalled_stream_reports_progress_and_history(self):
+        connection = FakeConnection([
+            b"DS-LIN-TEST-01>#info configure bridge flat\r\n",
+            b"configure bridge port 1/1/5/1/1/1/1 pvid 100\r\nDS-LIN-TEST-01>#",
+            b"DS-LIN-TEST-01>#info configure bridge flat\r\n",
+            b"configure bridge port 1/1/5/1/1/1/1 pvid 100\r\n",
+            socket.timeout(),
+        ])
+        cliconf = Cliconf(connection)
+
+        self.assertEqual(list(cliconf.iter_config(flags="bridge")), ["configure bridge port 1/1/5/1/1/1/1 pvid 100"])
+        connection.close.assert_not_called()
+        history = cliconf.get_command_history("info  configure bridge flat")
+        self.assertEqual(history["runs"], 1)
+        self.assertEqual(history["last_bytes"], 106)
+
+        with self.assertRaises(AnsibleConnectionFailure) as exc:
+            list(cliconf.iter_config(flags="bridge"))
+        self.assertIn("no data received for 30 seconds", str(exc.exception))
+        self.assertIn("(90 bytes in", str(exc.exception))
+        self.assertIn("for 106 bytes", str(exc.exception))
+        self.assertEqual(cliconf.get_command_history("info configure bridge flat")["runs"], 1)
+        # the rest of the response must not be read by the next command
+        connection.close.assert_called_once_with()
+
+    def test_progress_extends_request_timeout(self):
+        with patch("ansible_collections.isam.isam.plugins.cliconf.isam.signal.alarm", return_value=5) as alarm:
+            _extend_command_timeout(30)
+        self.assertEqual([call[0] for call in alarm.call_args_list], [(0,), (30,)])
+
+        with patch("ansible_collections.isam.isam.plugins.cliconf.isam.signal.alarm", return_value=0) as alarm:
+            _extend_command_timeout(30)
+        alarm.assert_called_once_with(0)
+
+    def test_command_trace(self):
+        self.options["command_trace"] = True
+        connection = ScriptedConnection({
+            b"info configure bridge flat": "configure bridge port 1/1/5/1/1/1/1 pvid 100",
+            b"show equipment slot": "slot table",
+        })
+        cliconf = Cliconf(connection)
+
+        cliconf.get_config(flags="bridge")
+        cliconf.get("show equipment slot")
+        streamed, sent = cliconf.get_command_trace()
+
+        self.assertEqual(streamed["command"], "info configure bridge flat")
+        self.assertEqual(streamed["bytes"], 90)
+        self.assertEqual(streamed["lines"], 2)
+        self.assertFalse(streamed["failed"])
+        for timing in ("send", "first_byte", "duration", "prompt_match"):
+            self.assertGreaterEqual(streamed[timing], 0)
+        self.assertEqual(sent["command"], "show equipment slot")
+        self.assertEqual((sent["bytes"], sent["lines"]), (10, 1))
+        self.assertIsNone(sent["first_byte"])
+        self.assertEqual(cliconf.get_command_trace(), [])
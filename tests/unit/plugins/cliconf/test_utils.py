@@ -0,0 +1,238 @@
+import json
+import os
+import shutil
+import tempfile
+
+from ansible_collections.isam.isam.plugins.cliconf.utils import parse_output_to_dict
+from ansible_collections.isam.isam.plugins.cliconf.utils.command_history import CommandHistory
+from ansible_collections.isam.isam.plugins.cliconf.utils.command_trace import CommandTrace
+from ansible_collections.isam.isam.plugins.cliconf.utils.parse_output_to_dict import TextFSMRegistry
+from ansible_collections.isam.isam.plugins.cliconf.utils.session_pool import CliSessionPool
+from ansible_collections.isam.isam.plugins.cliconf.utils.utils import (
+    iterScrubbedChunks,
+    iterXMLInstances,
+    removeAlarms,
+    removeCtrlChars,
+    scrubOutput,
+)
+from ansible_collections.isam.isam.tests.unit.compat import unittest
+from ansible_collections.isam.isam.tests.unit.compat.mock import MagicMock, patch
+
+
+OUTPUT = (
+    "configure bridge port 1/1/5/1/1/1/1 pvid 100\r\n"
+    "18/10/26 12:00:01 minor alarm set: equipment slot 1/1/5\r\n"
+    "configure bridge\x07 port 1/1/5/1/1/1/1 max-unicast-mac 4\r\n"
+    "18/10/26 12:00:02 minor alarm cleared: equipment slot 1/1/5"
+)
+
+SCRUBBED = (
+    "configure bridge port 1/1/5/1/1/1/1 pvid 100\n"
+    "configure bridge port 1/1/5/1/1/1/1 max-unicast-mac 4\n"
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "..", "..", "..", "parser_templates", "cli")
+
+TEMPLATE = """Value Slot (\\S+)
+Value Type (\\S+)
+Value Oper (\\S+)
+
+Start
+  ^${Slot}\\s+${Type}\\s+${Oper} -> Record
+"""
+
+SLOTS = "lt:1/1/5 fglt-b enabled\nlt:1/1/6 fwlt-c disabled\n"
+
+
+class TestIsamCliconfUtils(unittest.TestCase):
+    def test_remove_ctrl_chars(self):
+        self.assertEqual(removeCtrlChars("a\x00b\x1bc\x85d\n"), "abcd")
+
+    def test_remove_alarms(self):
+        self.assertEqual(
+            removeAlarms("line 1\n18/10/26 12:00:01 alarm\nline 2\n"),
+            "line 1\nline 2\n",
+        )
+
+    def test_scrub_output(self):
+        self.assertEqual(scrubOutput(OUTPUT), SCRUBBED)
+        self.assertEqual(scrubOutput(OUTPUT.encode()), SCRUBBED.encode())
+        # the C1 range is left to the UTF-8 decoder in bytes
+        self.assertEqual(scrubOutput(u"Å\r\n".encode("utf-8")), u"Å\n".encode("utf-8"))
+
+    def test_iter_scrubbed_chunks(self):
+        data = OUTPUT.encode()
+        chunks = [data[i:i + 7] for i in range(0, len(data), 7)]
+        self.assertEqual(b"".join(iterScrubbedChunks(chunks)), SCRUBBED.encode())
+
+    def test_iter_xml_instances(self):
+        instance = (
+            "<instance><res-id name=\"ont-idx\">1/1/5/1/%d</res-id>"
+            "<info name=\"rx-signal-level\">-19.600</info>"
+            "<info name=\"ont-temperature\">42</info>"
+            "<info name=\"olt-rx-sig-level\">unknown</info></instance>"
+        )
+        response = "show equipment ont optics xml\n<runtime-data><hierarchy name=\"optics\">%s</hierarchy></runtime-data>" % (
+            "".join(instance % ont for ont in range(1, 4))
+        )
+        chunks = [response[i:i + 10] for i in range(0, len(response), 10)]
+
+        records = list(iterXMLInstances(chunks))
+
+        self.assertEqual(len(records), 3)
+        self.assertEqual(
+            records[2],
+            {"ont-idx": "1/1/5/1/3", "rx-signal-level": -19.6, "ont-temperature": 42, "olt-rx-sig-level": "unknown"},
+        )
+        self.assertEqual(list(iterXMLInstances(response, typed=False))[0]["ont-temperature"], "42")
+
+
+class TestTextFSMRegistry(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        with open(os.path.join(self.directory, "slots.tpl"), "w") as template:
+            template.write(TEMPLATE)
+        self.registry = TextFSMRegistry(self.directory)
+        patcher = patch.object(parse_output_to_dict, "REGISTRY", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parse_with_textfsm(self):
+        expected = [
+            {"Slot": "lt:1/1/5", "Type": "fglt-b", "Oper": "enabled"},
+            {"Slot": "lt:1/1/6", "Type": "fwlt-c", "Oper": "disabled"},
+        ]
+        self.assertEqual(parse_output_to_dict.parse_with_textfsm("slots.tpl", SLOTS), expected)
+        # a second parse starts from a reset FSM
+        self.assertEqual(parse_output_to_dict.parse_with_textfsm("slots.tpl", SLOTS), expected)
+
+    def test_parse_with_textfsm_by_first_value(self):
+        self.assertEqual(
+            parse_output_to_dict.parse_with_textfsm_by_first_value("slots.tpl", SLOTS),
+            {
+                "lt:1/1/5": {"Type": "fglt-b", "Oper": "enabled"},
+                "lt:1/1/6": {"Type": "fwlt-c", "Oper": "disabled"},
+            },
+        )
+
+    def test_template_compiled_once(self):
+        with patch.object(parse_output_to_dict.textfsm, "TextFSM", wraps=parse_output_to_dict.textfsm.TextFSM) as fsm:
+            for _ in range(5):
+                parse_output_to_dict.parse_with_textfsm("slots.tpl", SLOTS)
+        self.assertEqual(fsm.call_count, 1)
+        with self.registry.fsm("slots.tpl") as first:
+            with self.registry.fsm("slots.tpl") as second:
+                self.assertIsNot(first, second)
+
+    def test_textfsm_missing(self):
+        with patch.object(parse_output_to_dict, "HAS_TEXTFSM", False):
+            with self.assertRaisesRegex(ValueError, "textfsm is required"):
+                parse_output_to_dict.parse_with_textfsm("slots.tpl", SLOTS)
+
+
+class TestIsamShowTemplates(unittest.TestCase):
+    def test_show_templates_golden(self):
+        fixtures = [name for name in sorted(os.listdir(FIXTURES)) if name.startswith("show_")]
+        self.assertEqual(len(fixtures), len(parse_output_to_dict.SHOW_TEMPLATES))
+        for name in fixtures:
+            with open(os.path.join(FIXTURES, name, "output.txt")) as output:
+                command_output = output.read()
+            with open(os.path.join(FIXTURES, name, "parsed.json")) as parsed:
+                golden = json.load(parsed)
+            self.assertEqual(
+                parse_output_to_dict.parse_show_output(golden["command"], command_output),
+                golden["parsed"],
+                name,
+            )
+
+    def test_parse_show_output_unknown_command(self):
+        self.assertIsNone(parse_output_to_dict.get_show_template("show equipment slot"))
+        with self.assertRaises(ValueError):
+            parse_output_to_dict.parse_show_output("show equipment slot", "")
+
+
+class TestCliSessionPool(unittest.TestCase):
+    def test_map_keeps_command_order(self):
+        sessions = iter(["extra-1", "extra-2"])
+        pool = CliSessionPool(lambda: next(sessions), 3)
+
+        results = pool.map(lambda session, command: command.upper(), ["a", "b", "c", "d"], primary="main")
+
+        self.assertEqual(results, ["A", "B", "C", "D"])
+        self.assertEqual(len(pool), 2)
+
+    def test_refused_session_caps_the_pool(self):
+        open_session = MagicMock(side_effect=[MagicMock(), IOError("too many sessions")])
+        pool = CliSessionPool(open_session, 4)
+
+        self.assertEqual(pool.map(lambda session, command: command, ["a", "b", "c"], primary="main"), ["a", "b", "c"])
+        self.assertEqual(len(pool), 1)
+        pool.map(lambda session, command: command, ["a", "b", "c"], primary="main")
+        self.assertEqual(open_session.call_count, 2)
+
+    def test_failed_session_is_closed(self):
+        session = MagicMock()
+        pool = CliSessionPool(lambda: session, 1)
+
+        def execute(shell, command):
+            raise IOError("channel closed")
+
+        with self.assertRaises(IOError):
+            pool.map(execute, ["a", "b"])
+        session.close.assert_called_once_with()
+        self.assertEqual(len(pool), 0)
+
+    def test_failed_primary_is_reset(self):
+        session = MagicMock()
+        pool = CliSessionPool(lambda: session, 2)
+        reset_primary = MagicMock()
+
+        def execute(shell, command):
+            if shell == "main":
+                raise IOError("timed out")
+            return command
+
+        with self.assertRaises(IOError):
+            pool.map(execute, ["a", "b", "c"], primary="main", reset_primary=reset_primary)
+        reset_primary.assert_called_once_with("main")
+        session.close.assert_not_called()
+
+        reset_primary.reset_mock()
+        pool.map(lambda shell, command: command, ["a", "b"], primary="main", reset_primary=reset_primary)
+        reset_primary.assert_not_called()
+
+
+class TestCommandHistory(unittest.TestCase):
+    def test_record_and_reload(self):
+        history_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, history_dir)
+        history = CommandHistory("olt-1", history_dir)
+        self.assertIsNone(history.expected("info configure flat"))
+
+        history.record("info configure flat", 100.0, 1000)
+        history.record("info  configure flat", 200.0, 2000)
+
+        self.assertEqual(history.expected("info configure flat"), {"seconds": 130.0, "bytes": 1300.0})
+        reloaded = CommandHistory("olt-1", history_dir).as_dict()["info configure flat"]
+        self.assertEqual(reloaded["runs"], 2)
+        self.assertEqual(reloaded["last_seconds"], 200.0)
+        self.assertEqual(CommandHistory("olt-2", history_dir).as_dict(), {})
+
+
+class TestCommandTrace(unittest.TestCase):
+    def test_trace_file_per_host(self):
+        trace_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, trace_dir)
+        trace = CommandTrace("olt/1", trace_dir)
+        self.assertTrue(trace)
+
+        trace.add("info configure flat", 1000.0, 2.5, received=100, lines=3)
+
+        self.assertEqual(trace.drain(), [])
+        with open(os.path.join(trace_dir, "olt_1.jsonl")) as trace_file:
+            records = [json.loads(line) for line in trace_file]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["duration"], 2.5)
+        self.assertEqual(records[0]["host"], "olt/1")
+        self.assertFalse(CommandTrace("olt-1"))
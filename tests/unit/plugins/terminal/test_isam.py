@@ -0,0 +1,115 @@
+import re
+
+from ansible.errors import AnsibleConnectionFailure
+
+from ansible_collections.isam.isam.plugins.terminal.isam import TailWindowRegex, TerminalModule
+from ansible_collections.isam.isam.tests.unit.compat import unittest
+from ansible_collections.isam.isam.tests.unit.compat.mock import MagicMock
+
+
+class TestIsamTerminal(unittest.TestCase):
+    def test_prompt_ends_the_buffer(self):
+        def find_prompt(response):
+            return any(regex.search(response) for regex in TerminalModule.terminal_stdout_re)
+
+        self.assertTrue(find_prompt(b"configure bridge port 1/1/5/1/1/1/1\r\nDS-LIN-TEST-01>#"))
+        self.assertTrue(find_prompt(b"DS-LIN-TEST-01>#info configure bridge flat"))
+        self.assertFalse(find_prompt(b"DS-LIN-TEST-01>#info configure\r\nconfigure bridge\r\n"))
+        self.assertFalse(find_prompt(b"<runtime-data><hierarchy name=\"show\">"))
+        self.assertFalse(find_prompt(b"x" * 8192 + b"\r\nDS-LIN-TEST-01>#" + b"y" * 8192))
+
+    def test_prompts_of_the_previous_patterns_still_match(self):
+        previous_re = [re.compile(rb"[\w-]+>.*#"), re.compile(rb"[\w-]+>.*$")]
+        prompts = [
+            b"DS-LIN-TEST-01>#",
+            b"DS-LIN-TEST-01>#  ",
+            b"typ:isadmin>#",
+            b"leg:isadmin>#",
+            b"typ:isadmin>configure>bridge#",
+            b"typ:DS-LIN-TEST-01>configure>vlan>id>10$ ",
+            b"isadmin>",
+        ]
+        for prompt in prompts:
+            response = b"show equipment slot\r\n" + prompt
+            self.assertTrue(any(regex.search(response) for regex in previous_re), prompt)
+            self.assertTrue(
+                any(regex.search(response) for regex in TerminalModule.terminal_stdout_re), prompt
+            )
+
+    def test_errors_are_searched_once(self):
+        terminal = TerminalModule(MagicMock())
+        stderr_re = terminal.terminal_stderr_re[0]
+        self.assertIsNot(stderr_re, TerminalModule(MagicMock()).terminal_stderr_re[0])
+
+        response = b"DS-LIN-TEST-01>#configure bridge port 1/1/5/1/1/1/1 bogus 4\r\n" + b" " * 48
+        self.assertIsNone(stderr_re.search(response))
+        response += b"^\r\nError : invalid token\r\n"
+        self.assertIsNotNone(stderr_re.search(response))
+
+        # a growing buffer is searched from where the last search ended
+        response = b"configure vlan id 10\r\n" * 1000
+        self.assertIsNone(stderr_re.search(response))
+        self.assertIsNone(stderr_re.search(response + b"configure vlan id 20\r\n"))
+        stderr_re._regex = MagicMock()
+        stderr_re.search(response + b"configure vlan id 30\r\n")
+        stderr_re._regex.search.assert_called_once_with(
+            response + b"configure vlan id 30\r\n", len(response) + 22 - 4096
+        )
+
+    def test_new_buffer_is_searched_from_the_start(self):
+        stderr_re = TailWindowRegex(rb"Error :", window=16, incremental=True)
+        self.assertIsNone(stderr_re.search(b"configure vlan id 10\r\n" * 10))
+        self.assertIsNotNone(stderr_re.search(b"Error : invalid\r\n" + b"configure vlan id 10\r\n" * 10))
+
+    def test_same_failing_command_twice(self):
+        terminal = TerminalModule(MagicMock())
+        response = (
+            b"DS-LIN-TEST-01>#info configure bogus\r\n"
+            b"                      ^\r\nError : invalid token\r\n"
+            + b"x" * 8000 + b"\r\nDS-LIN-TEST-01>#"
+        )
+
+        def receive(chunks):
+            # network_cli fetches the patterns once per response, then
+            # searches the growing buffer after every read
+            stderr_re = terminal.terminal_stderr_re
+            buffered = b""
+            errors = False
+            for chunk in chunks:
+                buffered += chunk
+                errors = any(regex.search(buffered) for regex in stderr_re) or errors
+            return errors
+
+        # the first response arrives in pieces, the second in one read
+        self.assertTrue(receive([response[i:i + 1024] for i in range(0, len(response), 1024)]))
+        self.assertTrue(receive([response]))
+
+    def test_on_open_shell_sends_one_batch(self):
+        connection = MagicMock()
+        connection.cliconf.get_option.return_value = ["environment terminal-timeout timeout:360"]
+        connection.cliconf._send_batch.return_value = [("", False)] * 4
+
+        TerminalModule(connection).on_open_shell()
+
+        connection._ssh_shell.resize_pty.assert_called_once_with(width=1024, height=1024)
+        connection.cliconf.get_option.assert_called_once_with("session_commands")
+        connection.cliconf._send_batch.assert_called_once_with([
+            "environment mode batch",
+            "environment inhibit-alarms",
+            "environment terminal-timeout timeout:360",
+            "exit",
+        ], shell=connection._ssh_shell)
+
+    def test_on_open_shell_reports_failed_commands(self):
+        connection = MagicMock()
+        connection.cliconf.get_option.return_value = ["environment bogus"]
+        connection.cliconf._send_batch.return_value = [
+            ("", False),
+            ("", False),
+            ("^\nError : invalid token", True),
+            ("", False),
+        ]
+
+        with self.assertRaises(AnsibleConnectionFailure) as context:
+            TerminalModule(connection).on_open_shell()
+        self.assertIn("environment bogus: ^\nError : invalid token", str(context.exception))